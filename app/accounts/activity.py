@@ -0,0 +1,143 @@
+"""
+Write-behind tracking of users' last activity (``User.last_seen_at``).
+
+Authenticated requests only record the time in a per-process buffer; a
+background thread writes the buffer every ACTIVITY_TRACKING
+["FLUSH_INTERVAL"] seconds with one batched ``bulk_update`` (an
+``UPDATE ... SET last_seen_at = CASE ...`` per BATCH_SIZE users). Repeat
+hits of a user are merged until the flush, and a user whose time was
+written less than MIN_INTERVAL seconds ago is not written again. The
+buffer is flushed when the process exits.
+"""
+
+import atexit
+import datetime
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityTracker:
+    """In-process buffer of last-seen times, flushed in batches."""
+
+    def __init__(self):
+        self._pending: dict = {}  # user id -> last seen
+        self._written: dict = {}  # user id -> last seen, as last written
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def record(self, user_id, seen_at: datetime.datetime | None = None):
+        """Buffer a hit of `user_id`; cheap enough to call on every request."""
+        config = settings.ACTIVITY_TRACKING
+        if not config["ENABLED"]:
+            return
+        seen_at = seen_at or timezone.now()
+
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is not None:
+                self._pending[user_id] = max(pending, seen_at)
+                return
+            written = self._written.get(user_id)
+            min_interval = datetime.timedelta(seconds=config["MIN_INTERVAL"])
+            if written is not None and seen_at - written < min_interval:
+                return
+            self._pending[user_id] = seen_at
+
+        self._ensure_started()
+
+    def flush(self) -> int:
+        """Write the buffered times; returns the number of users written."""
+        from .models import User
+
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            # Hits that come in during the write must not queue these again
+            self._written.update(batch)
+        if not batch:
+            return 0
+
+        users = [User(id=user_id, last_seen_at=seen) for user_id, seen in batch.items()]
+        try:
+            User.objects.bulk_update(
+                users,
+                ["last_seen_at"],
+                batch_size=settings.ACTIVITY_TRACKING["BATCH_SIZE"],
+            )
+        except Exception:
+            logger.exception("Could not write the activity of %d user(s).", len(batch))
+            with self._lock:
+                # Retried on the next flush, merged with newer hits
+                for user_id, seen in batch.items():
+                    if self._written.get(user_id) == seen:
+                        del self._written[user_id]
+                    self._pending[user_id] = max(seen, self._pending.get(user_id, seen))
+            return 0
+
+        with self._lock:
+            self._forget_written_before(
+                timezone.now()
+                - datetime.timedelta(seconds=settings.ACTIVITY_TRACKING["MIN_INTERVAL"])
+            )
+        return len(batch)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread and write what is left."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _forget_written_before(self, cutoff: datetime.datetime):
+        # Bounds memory to the users seen within MIN_INTERVAL
+        self._written = {
+            user_id: seen for user_id, seen in self._written.items() if seen >= cutoff
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(settings.ACTIVITY_TRACKING["FLUSH_INTERVAL"]):
+                close_old_connections()
+                self.flush()
+        finally:
+            connection.close()
+
+    def _after_fork_in_child(self):
+        # The flush thread does not survive fork, and the locks may have
+        # been held: start fresh (hits buffered before the fork are the
+        # parent's to write).
+        self.__init__()
+
+
+tracker = ActivityTracker()
+record = tracker.record
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=tracker._after_fork_in_child)
+
+
+@atexit.register
+def _flush_on_exit():
+    tracker.stop()
@@ -1,16 +1,48 @@
 # app/accounts/admin.py
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from app.core.paginators import EstimatedCountPaginator
+
 from .models import User
 
 
+class UserChangeList(ChangeList):
+    """Changelist that only loads the columns it displays."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.only(*UserAdmin.list_only_fields)
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
+    """
+    Admin for users, tuned for tables with millions of rows.
+
+    - Ordering is served by the ``date_joined`` index.
+    - Only one (estimated) count runs per changelist page.
+    - Search is limited to index-friendly email lookups.
+    """
+
     ordering = ["-date_joined"]
     list_display = ["email", "full_name", "is_staff", "is_active"]
-    search_fields = ["email", "first_name", "last_name"]
-    readonly_fields = ("auth_id",)
+    list_select_related = False
+    list_only_fields = (
+        "id",
+        "email",
+        "first_name",
+        "last_name",
+        "is_staff",
+        "is_active",
+        "date_joined",
+    )
+    search_fields = ["email"]
+    search_help_text = "Exact email, or the beginning of an email address."
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    readonly_fields = ("auth_id", "last_seen_at")
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -35,7 +67,10 @@ class UserAdmin(BaseUserAdmin):
                 )
             },
         ),
-        ("Important dates", {"fields": ("last_login", "date_joined")}),
+        (
+            "Important dates",
+            {"fields": ("last_login", "last_seen_at", "date_joined")},
+        ),
         ("Auth API", {"fields": ("auth_id",)}),
     )
 
@@ -48,3 +83,18 @@ class UserAdmin(BaseUserAdmin):
             },
         ),
     )
+
+    def get_changelist(self, request, **kwargs):
+        return UserChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search by exact email when the term looks like one, otherwise by
+        email prefix. Both lookups are served by an email index.
+        """
+        search_term = User.objects.normalize_email(search_term)
+        if not search_term:
+            return queryset, False
+        if "@" in search_term:
+            return queryset.filter(email__lower=search_term), False
+        return queryset.filter(email__startswith=search_term), False
@@ -4,3 +4,25 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.accounts"
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group, Permission
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from . import backends, changes
+
+        # Keep the cached permission sets of staff users current
+        User = get_user_model()
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(backends.permissions_changed, sender=through)
+        post_delete.connect(backends.permission_objects_changed, sender=Group)
+        post_save.connect(backends.permission_objects_changed, sender=Permission)
+        post_delete.connect(backends.permission_objects_changed, sender=Permission)
+
+        # Deleted users stay visible to the change feed as tombstones
+        post_delete.connect(changes.record_tombstone, sender=User)
@@ -0,0 +1,94 @@
+"""
+Authentication backend caching the permission sets of staff users.
+
+``ModelBackend`` runs two queries (user and group permissions) the first
+time a user instance is checked, i.e. on every admin or API request of a
+staff user. Here both sets are kept in PERMISSION_CACHE["CACHE"] across
+requests, so a request reads them with one cache round trip.
+
+Entries are tagged with a global version, bumped (on commit) whenever group
+memberships, user or group permissions, groups or permissions change; an
+entry of an older version is ignored. Staff permission changes are rare, so
+invalidating every entry at once costs little.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+from app.core import metrics
+
+VERSION_KEY = "perms:version"
+ENTRY_KEY = "perms:user:{pk}"
+
+
+def _cache():
+    return caches[settings.PERMISSION_CACHE["CACHE"]]
+
+
+class CachedPermissionBackend(ModelBackend):
+    def _get_permissions(self, user_obj, obj, from_name):
+        if (
+            settings.PERMISSION_CACHE["ENABLED"]
+            and obj is None
+            and user_obj.is_active
+            and user_obj.is_staff
+            and not hasattr(user_obj, f"_{from_name}_perm_cache")
+        ):
+            self._load_cached_permissions(user_obj)
+        return super()._get_permissions(user_obj, obj, from_name)
+
+    def _load_cached_permissions(self, user_obj):
+        """Set the user's permission caches from the cache, or the DB."""
+        cache = _cache()
+        key = ENTRY_KEY.format(pk=user_obj.pk)
+        values = cache.get_many([VERSION_KEY, key])
+        version = values.get(VERSION_KEY)
+        if version is None:
+            # Never restart from a version older entries may still carry
+            cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(VERSION_KEY)
+
+        entry = values.get(key)
+        # The superuser flag is part of the entry: superusers get every permission
+        hit = entry is not None and entry[:2] == (version, user_obj.is_superuser)
+        metrics.record_cache_lookup("permissions", hit)
+        if hit:
+            user_perms, group_perms = entry[2:]
+        else:
+            user_perms = super()._get_permissions(user_obj, None, "user")
+            group_perms = super()._get_permissions(user_obj, None, "group")
+            cache.set(
+                key,
+                (version, user_obj.is_superuser, user_perms, group_perms),
+                timeout=settings.PERMISSION_CACHE["TIMEOUT"],
+            )
+        user_obj._user_perm_cache = user_perms
+        user_obj._group_perm_cache = group_perms
+
+
+def invalidate_permissions():
+    """Make every cached permission set stale, once the transaction commits."""
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def permissions_changed(sender, action, **kwargs):
+    """`m2m_changed` receiver for group memberships and permission grants."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_permissions()
+
+
+def permission_objects_changed(sender, **kwargs):
+    """`post_save`/`post_delete` receiver for Group and Permission."""
+    invalidate_permissions()
@@ -0,0 +1,156 @@
+"""
+Change feed of users, for services mirroring the user table.
+
+Every user row, and every tombstone of a deleted one, has a position: its
+``(updated_at, id)``. A token encodes the position of the last change a
+client received; the feed returns the changes after it, in order. Changes
+younger than ACCOUNT_CHANGES["SETTLE_SECONDS"] are held back, so that a
+transaction that set an earlier ``updated_at`` but committed later is not
+skipped.
+
+A token also carries the time since which the client needs every
+tombstone: the start of the sync it is paging through, or the time it last
+caught up. Tokens issued more than ACCOUNT_CHANGES["TOMBSTONE_DAYS"] ago
+are refused, whatever the age of the rows: deletions after them may have
+lost their tombstones, and the client must resync in full (by following
+the feed without a token).
+"""
+
+import base64
+import binascii
+import datetime
+import uuid
+from typing import NamedTuple, Self
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import User, UserTombstone
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The token has expired; resync from the start of the feed."
+    default_code = "resync_required"
+
+
+class Position(NamedTuple):
+    updated_at: datetime.datetime
+    id: uuid.UUID
+
+
+START = Position(EPOCH, uuid.UUID(int=0))
+
+
+class Token(NamedTuple):
+    position: Position
+    # Tombstones from then on are needed to follow the feed from `position`
+    issued: datetime.datetime
+
+    def encode(self) -> str:
+        raw = ".".join(
+            [
+                _micros(self.position.updated_at),
+                self.position.id.hex,
+                _micros(self.issued),
+            ]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> Self:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            updated_at, hex_id, issued = raw.decode().split(".")
+            position = Position(_from_micros(updated_at), uuid.UUID(hex=hex_id))
+            return cls(position, _from_micros(issued))
+        except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError) as exc:
+            raise ValidationError({"since": "Invalid token."}) from exc
+
+
+def _micros(moment: datetime.datetime) -> str:
+    return str((moment - EPOCH) // datetime.timedelta(microseconds=1))
+
+
+def _from_micros(micros: str) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=int(micros))
+
+
+class Page(NamedTuple):
+    # Users (live or soft-deleted) and tombstones, in feed order
+    changes: list[User | UserTombstone]
+    next: Token
+    has_more: bool
+
+
+def after(queryset, position: Position):
+    """Rows of `queryset` after `position`, as an index range on updated_at."""
+    return (
+        queryset.filter(updated_at__gte=position.updated_at)
+        .exclude(updated_at=position.updated_at, id__lte=position.id)
+        .order_by("updated_at", "id")
+    )
+
+
+def changes_since(token: Token | None, limit: int) -> Page:
+    """The first `limit` changes after `token` (from the start without one)."""
+    config = settings.ACCOUNT_CHANGES
+    now = timezone.now()
+    if token is None:
+        # A full sync needs the tombstones of deletions from now on
+        token = Token(START, now)
+    elif token.issued < now - datetime.timedelta(days=config["TOMBSTONE_DAYS"]):
+        raise ResyncRequired()
+    position = token.position
+
+    settled = now - datetime.timedelta(seconds=config["SETTLE_SECONDS"])
+    # One more row than asked tells whether there are more
+    users = list(
+        after(User.all_objects.filter(updated_at__lt=settled), position)[: limit + 1]
+    )
+    tombstones = list(
+        after(UserTombstone.objects.filter(updated_at__lt=settled), position)[
+            : limit + 1
+        ]
+    )
+    merged = sorted(users + tombstones, key=lambda row: (row.updated_at, row.id))
+    changes = merged[:limit]
+    if len(merged) > limit:
+        last = Position(changes[-1].updated_at, changes[-1].id)
+        return Page(changes, Token(last, token.issued), True)
+    # Caught up: every change settled by now was returned, so the token can
+    # move on to `settled` (and stays fresh while nothing changes)
+    return Page(
+        changes, Token(max(position, Position(settled, START.id)), settled), False
+    )
+
+
+def purge_tombstones() -> int:
+    """Delete the tombstones no valid token can still need."""
+    cutoff = timezone.now() - datetime.timedelta(
+        days=settings.ACCOUNT_CHANGES["TOMBSTONE_DAYS"]
+    )
+    deleted, _ = UserTombstone.objects.filter(updated_at__lt=cutoff).delete()
+    return deleted
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """
+    `post_delete` receiver for users. A soft-deleted user keeps its feed
+    position (clients following the feed have seen the deletion already).
+    One upsert, as purges delete users by the thousand.
+    """
+    tombstone = UserTombstone(
+        id=instance.pk,
+        updated_at=instance.updated_at if instance.deleted_at else timezone.now(),
+    )
+    UserTombstone.objects.bulk_create(
+        [tombstone],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["updated_at"],
+    )
@@ -0,0 +1,69 @@
+"""
+Background jobs for account operations too heavy for a request.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from rest_framework import serializers
+
+from app.jobs.registry import job
+
+from .models import User
+
+EXPORT_FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "auth_id",
+    "is_active",
+    "is_staff",
+    "date_joined",
+    "last_seen_at",
+]
+BATCH_SIZE = 2000
+
+
+@job("accounts.export")
+def export_accounts(job):
+    """Write every user to a gzipped JSON lines file, streamed from the DB."""
+    files_dir = Path(settings.JOBS["FILES_DIR"])
+    files_dir.mkdir(parents=True, exist_ok=True)
+    name = f"accounts-{job.pk}.jsonl.gz"
+
+    count = 0
+    fd, tmp_name = tempfile.mkstemp(dir=files_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as out:
+        users = User.objects.order_by("date_joined").values(*EXPORT_FIELDS)
+        for user in users.iterator(chunk_size=BATCH_SIZE):
+            out.write(json.dumps(user, cls=DjangoJSONEncoder) + "\n")
+            count += 1
+    # Retries overwrite the file of a failed attempt
+    os.replace(tmp_name, files_dir / name)
+    return {"count": count, "file": name}
+
+
+class DeactivatePayload(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=100_000
+    )
+
+
+@job("accounts.deactivate", payload_serializer=DeactivatePayload)
+def deactivate_accounts(job):
+    """Deactivate the given non-staff users, a batch per UPDATE."""
+    ids = iter(job.payload["ids"])
+    count = 0
+    while batch := list(islice(ids, BATCH_SIZE)):
+        count += User.objects.filter(
+            pk__in=batch, is_active=True, is_staff=False
+        ).update(is_active=False, updated_at=timezone.now())
+    return {"deactivated": count}
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_email_conflicts(apps, schema_editor):
+    """
+    Abort with a report of every group of users whose emails only differ
+    by case, since the case-insensitive unique constraint cannot be added
+    while they exist.
+    """
+    User = apps.get_model("accounts", "User")
+    users = User.objects.using(schema_editor.connection.alias)
+
+    conflicts = (
+        users.annotate(canonical=Lower("email"))
+        .values("canonical")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by("canonical")
+    )
+    if not conflicts:
+        return
+
+    lines = []
+    for conflict in conflicts:
+        rows = users.annotate(canonical=Lower("email")).filter(
+            canonical=conflict["canonical"]
+        )
+        details = ", ".join(f"{row.email} (id={row.id})" for row in rows)
+        lines.append(f"  {conflict['canonical']}: {details}")
+
+    raise RuntimeError(
+        "Cannot enforce case-insensitive unique emails. "
+        "Merge or rename these conflicting users first:\n" + "\n".join(lines)
+    )
+
+
+def canonicalize_emails(apps, schema_editor):
+    """Store every email in its canonical (lowercase) form."""
+    User = apps.get_model("accounts", "User")
+    User.objects.using(schema_editor.connection.alias).exclude(
+        email=Lower("email")
+    ).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_user_date_joined_index"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_email_conflicts, migrations.RunPython.noop),
+        migrations.RunPython(canonicalize_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="accounts_user_email_ci_uniq",
+                violation_error_message="A user with that email already exists.",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_user_email_ci_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="last_seen_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
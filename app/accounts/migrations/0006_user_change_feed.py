@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_user_soft_delete"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTombstone",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["updated_at", "id"], name="accounts_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usertombstone",
+            index=models.Index(
+                fields=["updated_at", "id"], name="accounts_tombstone_updated_idx"
+            ),
+        ),
+    ]
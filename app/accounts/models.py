@@ -2,10 +2,40 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager["User"]):
-    """Manager for users using email instead of username."""
+    """
+    Manager for users using email instead of username. Soft-deleted users
+    are hidden unless `include_deleted` is set (``User.all_objects``).
+    """
+
+    def __init__(self, *, include_deleted: bool = False):
+        super().__init__()
+        self.include_deleted = include_deleted
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.include_deleted:
+            return queryset
+        return queryset.filter(deleted_at__isnull=True)
+
+    @classmethod
+    def normalize_email(cls, email: str | None) -> str:
+        """Canonical form of an email: stripped and fully lowercased."""
+        return (email or "").strip().lower()
+
+    def filter_by_email(self, email: str):
+        """Case-insensitive email lookup that uses the Lower(email) index."""
+        return self.filter(email__lower=self.normalize_email(email))
+
+    def get_by_email(self, email: str):
+        return self.filter_by_email(email).get()
+
+    def get_by_natural_key(self, username):
+        return self.get_by_email(username)
 
     def create_user(self, email: str, password: str | None = None, **extra_fields):
         if not email:
@@ -35,15 +65,83 @@ class User(AbstractUser):
     first_name = models.CharField(max_length=255, blank=True, default="")
     last_name = models.CharField(max_length=255, blank=True, default="")
     auth_id = models.UUIDField(unique=True, blank=True, null=True)
+    # Last authenticated API request, written behind (app.accounts.activity)
+    last_seen_at = models.DateTimeField(blank=True, null=True, editable=False)
+    # Set by soft deletion; the row is removed later by `purge_deleted_users`
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+    # Position in the change feed (app.accounts.changes); queryset updates
+    # of synced fields must set it too
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = UserManager()
+    all_objects = UserManager(include_deleted=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="accounts_user_email_ci_uniq",
+                violation_error_message="A user with that email already exists.",
+            ),
+        ]
+        indexes = [
+            # Serves the admin changelist ordering (-date_joined, -pk)
+            models.Index(
+                fields=["-date_joined", "-id"], name="accounts_user_joined_idx"
+            ),
+            # Serves the change feed, in (updated_at, id) order
+            models.Index(fields=["updated_at", "id"], name="accounts_user_updated_idx"),
+            # Serves the purge of soft-deleted users; other rows stay out of it
+            models.Index(
+                fields=["deleted_at"],
+                name="accounts_user_deleted_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
+
     @property
     def full_name(self):
         return f"{self.first_name}, {self.last_name}".strip()
 
+    def soft_delete(self):
+        """
+        Hide the user and block their access in one UPDATE; related rows
+        are only deleted when the user is purged.
+        """
+        self.deleted_at = self.updated_at = timezone.now()
+        self.is_active = False
+        User.all_objects.filter(pk=self.pk).update(
+            deleted_at=self.deleted_at, updated_at=self.updated_at, is_active=False
+        )
+
     def __str__(self):
         return self.email
+
+
+# Enables `email__lower=...` on User.email only, which matches the
+# functional unique index above
+User._meta.get_field("email").register_lookup(Lower)
+
+
+class UserTombstone(models.Model):
+    """
+    A deleted user, kept for the change feed so that mirrors learn about
+    the deletion; removed after ACCOUNT_CHANGES["TOMBSTONE_DAYS"].
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    # The user's position in the change feed
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["updated_at", "id"], name="accounts_tombstone_updated_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.id)
@@ -1,11 +1,49 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from app.core.serializers import NativeTypesMixin
+from app.core.timing import TimedDataMixin
 
 from .models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CanonicalEmailField(serializers.EmailField):
+    """Email field that stores and validates the canonical (lowercase) form."""
+
+    def to_internal_value(self, data):
+        return User.objects.normalize_email(super().to_internal_value(data))
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
+class UserSerializer(NativeTypesMixin, TimedDataMixin, serializers.ModelSerializer):
+    email = CanonicalEmailField(
+        max_length=254,
+        validators=[
+            UniqueValidator(
+                # Soft-deleted users keep their email until they are purged
+                queryset=User.all_objects.all(),
+                lookup="lower",
+                message="A user with that email already exists.",
+            )
+        ],
+    )
+    auth_id = serializers.UUIDField(
+        required=False,
+        allow_null=True,
+        validators=[
+            UniqueValidator(
+                queryset=User.all_objects.all(),
+                message="A user with that auth id already exists.",
+            )
+        ],
+    )
+
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "email",
@@ -1,8 +1,20 @@
+from django.conf import settings
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from app.core import profiling, timing
+from app.core.parsers import MessagePackParser
+from app.core.renderers import MessagePackRenderer
+from app.core.serializers import renders_native_types
+from app.core.throttling import (
+    JWTSubjectRateThrottle,
+    ThrottleBeforeAuthenticationMixin,
+)
+
+from . import changes
 from .models import User
 from .serializers import UserSerializer
 
@@ -17,7 +29,7 @@ class IsSelfOrStaff(permissions.BasePermission):
         return request.user.is_staff or obj.id == request.user.id
 
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ThrottleBeforeAuthenticationMixin, viewsets.ModelViewSet):
     """
     API endpoints for managing user accounts.
 
@@ -29,10 +41,21 @@ class AccountViewSet(viewsets.ModelViewSet):
     - PATCH  /accounts/{id}/      → Partially update the current user
     - DELETE /accounts/{id}/      → Delete the current user
     - GET    /accounts/me/        → Get the current authenticated user's profile
+    - GET    /accounts/changes/   → Users changed since a token (staff only)
+
+    Internal clients may use MessagePack instead of JSON, through
+    `Accept: application/msgpack` and `Content-Type: application/msgpack`.
+
+    Requests are rate limited per JWT subject and action (THROTTLING
+    setting), before the user is loaded.
     """
 
     serializer_class = UserSerializer
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
     permission_classes = [permissions.IsAuthenticated, IsSelfOrStaff]
+    throttle_classes = [JWTSubjectRateThrottle]
+    throttle_scope = "accounts"
 
     def get_queryset(self):
         """Staff users can see all; regular users only see themselves."""
@@ -44,7 +67,8 @@ class AccountViewSet(viewsets.ModelViewSet):
         user = self.request.user
         email = serializer.validated_data.get("email")
 
-        if not user.is_staff and email != user.email:
+        # Emails are compared in canonical form, so case never matters
+        if not user.is_staff and email != User.objects.normalize_email(user.email):
             raise PermissionDenied(
                 "You can only create an account with your own email."
             )
@@ -61,10 +85,80 @@ class AccountViewSet(viewsets.ModelViewSet):
         """Allow users to delete only their own account."""
         if not self.request.user.is_staff and instance != self.request.user:
             raise PermissionDenied("You can only delete your own account.")
-        instance.delete()
+        # Soft deletion answers at once; `purge_deleted_users` removes the rows
+        if settings.ACCOUNT_DELETION["SOFT"]:
+            instance.soft_delete()
+        else:
+            instance.delete()
+
+    def dispatch(self, request, *args, **kwargs):
+        """Profiled as the phase ``accounts.<action>`` (see app.core.profiling)."""
+        method = request.method.lower()
+        action_name = self.action_map.get(method, method)
+        with profiling.phase(f"accounts.{action_name}"):
+            return super().dispatch(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Render eagerly while timing or profiling is active, so rendering is
+        timed and profiled with the action.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            timing.current() is not None or profiling.current() is not None
+        ) and hasattr(response, "render"):
+            with timing.phase("render"):
+                response.render()
+        return response
 
     @action(detail=False, methods=["get"], url_path="me")
     def me(self, request):
         """Return the current authenticated user's profile."""
         serializer = self.get_serializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def changes(self, request):
+        """
+        Users created, updated or deleted after the `since` token, oldest
+        first, at most `limit` (ACCOUNT_CHANGES) per page. Deleted users
+        come as ``{"id", "deleted": true}``. Clients keep `next` for their
+        next call, at once while `has_more`.
+        """
+        config = settings.ACCOUNT_CHANGES
+        since = request.query_params.get("since")
+        token = changes.Token.decode(since) if since else None
+        try:
+            limit = int(request.query_params.get("limit", config["PAGE_SIZE"]))
+        except ValueError:
+            limit = config["PAGE_SIZE"]
+        limit = min(max(limit, 1), config["MAX_PAGE_SIZE"])
+
+        page = changes.changes_since(token, limit)
+        live = [
+            row
+            for row in page.changes
+            if isinstance(row, User) and row.deleted_at is None
+        ]
+        serialized = dict(
+            zip(
+                [user.pk for user in live],
+                self.get_serializer(live, many=True).data,
+                strict=True,
+            )
+        )
+        native = renders_native_types(self.get_serializer_context())
+        results = []
+        for row in page.changes:
+            if row.pk in serialized:
+                results.append({**serialized[row.pk], "deleted": False})
+            else:
+                row_id = row.pk if native else str(row.pk)
+                results.append({"id": row_id, "deleted": True})
+        return Response(
+            {
+                "results": results,
+                "next": page.next.encode(),
+                "has_more": page.has_more,
+            }
+        )
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
+from app.core.warmup import warm_up
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.core.settings.prod")
 
 application = get_asgi_application()
+
+# Pay first-request costs at boot (once in the master with --preload)
+if settings.WARMUP["ENABLED"]:
+    warm_up()
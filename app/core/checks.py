@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.core.checks.security import base as security
+from django.core.checks.security import csrf
+from django.test.utils import override_settings
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+
+# Hooks that MiddlewareMixin.__acall__ runs through sync_to_async
+SYNC_HOOKS = ("process_request", "process_response")
+
+# Django's deploy checks of its middleware, which find it by dotted path:
+# the check that it is missing, then the checks of its settings (skipped
+# when it is not listed)
+STANDARD_MIDDLEWARE_CHECKS = {
+    "django.middleware.security.SecurityMiddleware": (
+        security.check_security_middleware,
+        [
+            security.check_sts,
+            security.check_sts_include_subdomains,
+            security.check_sts_preload,
+            security.check_content_type_nosniff,
+            security.check_ssl_redirect,
+            security.check_referrer_policy,
+            security.check_cross_origin_opener_policy,
+        ],
+    ),
+    "django.middleware.clickjacking.XFrameOptionsMiddleware": (
+        security.check_xframe_options_middleware,
+        [security.check_xframe_deny],
+    ),
+    "django.middleware.csrf.CsrfViewMiddleware": (
+        csrf.check_csrf_middleware,
+        [csrf.check_csrf_cookie_secure],
+    ),
+}
+
+
+@register(Tags.compatibility)
+def check_async_capable_middleware(app_configs, **kwargs):
+    """
+    Warn about middleware that is not async-capable, or only through the
+    thread hops of MiddlewareMixin.
+
+    Under ASGI a single sync-only middleware makes Django adapt the whole
+    chain around it with sync_to_async/async_to_sync thread hops.
+    MiddlewareMixin is async-capable, but runs process_request and
+    process_response through sync_to_async on every request.
+    """
+    warnings = []
+    for path in settings.MIDDLEWARE:
+        middleware = import_string(path)
+        if not getattr(middleware, "async_capable", False):
+            warnings.append(
+                Warning(
+                    f"Middleware {path} is not async-capable.",
+                    hint="Set async_capable = True and implement __acall__.",
+                    obj=path,
+                    id="core.W001",
+                )
+            )
+        elif hooks := _sync_hooks(middleware):
+            warnings.append(
+                Warning(
+                    f"Middleware {path} runs {' and '.join(hooks)} through "
+                    "sync_to_async under ASGI.",
+                    hint=(
+                        "Implement a native __acall__, e.g. with "
+                        "app.core.middleware.native_async.InlineHooksMixin "
+                        "for hooks that never block."
+                    ),
+                    obj=path,
+                    id="core.W002",
+                )
+            )
+    return warnings
+
+
+@register(Tags.security, deploy=True)
+def check_standard_middleware_subclasses(app_configs, **kwargs):
+    """
+    Run Django's deploy checks of its middleware with the subclasses
+    listed in MIDDLEWARE (see app.core.middleware.native_async and
+    api_fast_path) standing for the originals.
+
+    Django's own run reports the originals missing (silenced, see
+    SILENCED_SYSTEM_CHECKS) and skips the checks of their settings. Here
+    they are only reported missing, as core.W003, when no subclass is
+    listed either.
+    """
+    listed = set(settings.MIDDLEWARE)
+    messages = []
+    middleware = [_standard_path(path) for path in settings.MIDDLEWARE]
+    with override_settings(MIDDLEWARE=middleware):
+        for original, (missing_check, checks) in STANDARD_MIDDLEWARE_CHECKS.items():
+            messages += [
+                Warning(message.msg, hint=message.hint, id="core.W003")
+                for message in missing_check(app_configs)
+            ]
+            if original not in listed:
+                for check in checks:
+                    messages += check(app_configs)
+    return messages
+
+
+def _sync_hooks(middleware) -> list[str]:
+    """The hooks MiddlewareMixin's own __acall__ runs in a thread."""
+    if (
+        not issubclass(middleware, MiddlewareMixin)
+        or middleware.__acall__ is not MiddlewareMixin.__acall__
+    ):
+        return []
+    return [hook for hook in SYNC_HOOKS if hasattr(middleware, hook)]
+
+
+def _standard_path(path: str) -> str:
+    """The path of the Django middleware that `path` subclasses, if any."""
+    middleware = import_string(path)
+    for original in STANDARD_MIDDLEWARE_CHECKS:
+        if issubclass(middleware, import_string(original)):
+            return original
+    return path
@@ -0,0 +1,94 @@
+"""
+Content codings for response compression: gzip (always), brotli and zstd
+(when their packages are installed), and Accept-Encoding negotiation.
+
+Every coding exposes the same incremental interface, so whole bodies and
+streamed chunks go through the same code::
+
+    compressor = CODINGS["gzip"](level=6)
+    data = compressor.compress(chunk) + ... + compressor.flush()
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: deflate with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+CODINGS = {"gzip": GzipCompressor}
+if brotli is not None:
+    CODINGS["br"] = BrotliCompressor
+if zstandard is not None:
+    CODINGS["zstd"] = ZstdCompressor
+
+
+def negotiate(accept_encoding: str, preferred: list[str]) -> str | None:
+    """
+    The coding to use for an ``Accept-Encoding`` header: the available one
+    with the highest q-value, ties going to the first in `preferred`.
+    """
+    qvalues = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in preferred:
+        if coding not in CODINGS:
+            continue
+        q = qvalues.get(coding, qvalues.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
@@ -0,0 +1,103 @@
+"""
+Readiness checks for the ``/readyz`` probe: the database answers, the
+cache answers and the JWT verification key is loaded.
+
+The report is computed at most once per HEALTH["CACHE_TTL"] seconds per
+worker, by one thread at a time, so a flood of probes costs a handful of
+queries, not one per probe.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from app.core import metrics
+from app.jwt_auth.authentication import get_es256_public_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "health:readyz"
+
+
+def check_database():
+    for alias in connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+
+def check_cache():
+    cache = caches[settings.HEALTH["CACHE"]]
+    cache.set(CACHE_KEY, 1, timeout=60)
+    if cache.get(CACHE_KEY) != 1:
+        raise RuntimeError("Cache read back a different value.")
+
+
+def check_jwt_key():
+    get_es256_public_key()
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "jwt_key": check_jwt_key,
+}
+
+
+@dataclass(frozen=True)
+class Report:
+    ready: bool
+    checks: dict[str, dict]
+    checked_at: float
+
+    def as_dict(self) -> dict:
+        return {"status": "ok" if self.ready else "unavailable", "checks": self.checks}
+
+
+def run_checks() -> Report:
+    """Run every check; a failing check is reported, never raised."""
+    results = {}
+    for name, check in CHECKS.items():
+        start = time.perf_counter()
+        try:
+            check()
+        except Exception as exc:
+            # Only the exception type: the report is served unauthenticated
+            logger.warning("Readiness check %r failed: %s", name, exc)
+            results[name] = {"ok": False, "error": type(exc).__name__}
+        else:
+            results[name] = {"ok": True}
+        results[name]["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    ready = all(result["ok"] for result in results.values())
+    return Report(ready, results, time.monotonic())
+
+
+_lock = threading.Lock()
+_report: Report | None = None
+
+
+def readiness() -> Report:
+    """The latest report, re-computed when older than HEALTH["CACHE_TTL"]."""
+    global _report
+    ttl = settings.HEALTH["CACHE_TTL"]
+    report = _report
+    if report is not None and time.monotonic() - report.checked_at < ttl:
+        metrics.record_cache_lookup("readiness", hit=True)
+        return report
+    with _lock:
+        # Another thread may have refreshed it while this one waited
+        report = _report
+        stale = report is None or time.monotonic() - report.checked_at >= ttl
+        metrics.record_cache_lookup("readiness", hit=not stale)
+        if stale:
+            report = _report = run_checks()
+    return report
+
+
+def clear():
+    global _report
+    _report = None
@@ -0,0 +1,182 @@
+"""
+Minimal asyncio HTTP/1.1 load generator.
+
+Each of ``concurrency`` clients keeps one keep-alive connection open and
+sends requests back to back until the deadline, so the load is a fixed
+number of in-flight requests. Used by the ``loadtest`` management command
+and the benchmarks; it needs no third-party HTTP client.
+"""
+
+import asyncio
+import ssl
+import statistics
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import NamedTuple, Self
+from urllib.parse import urlsplit
+
+
+class RequestSpec(NamedTuple):
+    name: str  # label used to group results, e.g. "me" or "list"
+    method: str
+    path: str
+    headers: dict[str, str] = {}
+    body: bytes = b""
+
+
+class Target(NamedTuple):
+    host: str
+    port: int
+    ssl: ssl.SSLContext | None
+
+    @classmethod
+    def from_url(cls, url: str) -> Self:
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        context = ssl.create_default_context() if secure else None
+        return cls(parts.hostname or "127.0.0.1", port, context)
+
+
+class LoadResult:
+    """Latencies, status codes and errors collected during a run."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.exceptions: Counter[str] = Counter()
+        self.elapsed = 0.0
+
+    def record(self, name: str, status: int, latency: float):
+        self.latencies[name].append(latency)
+        self.statuses[name][status] += 1
+
+    def summary(self) -> dict:
+        """JSON-serializable report, overall and per request name."""
+        all_latencies = [lat for lats in self.latencies.values() for lat in lats]
+        all_errors: Counter[str] = Counter()
+        by_name = {}
+        for name, latencies in sorted(self.latencies.items()):
+            errors = _errors(self.statuses[name])
+            all_errors.update(errors)
+            by_name[name] = {**summarize(latencies, self.elapsed), "errors": errors}
+
+        report = summarize(all_latencies, self.elapsed)
+        report["errors"] = dict(all_errors)
+        report["exceptions"] = dict(self.exceptions)
+        report["by_request"] = by_name
+        return report
+
+
+def _errors(statuses: Counter) -> dict[str, int]:
+    return {str(code): count for code, count in statuses.items() if code >= 400}
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    """Request count, throughput and latency percentiles (milliseconds)."""
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(len(ordered) * p))
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2) if ordered else None,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+async def run_load(
+    target: Target,
+    next_request: Callable[[], RequestSpec],
+    concurrency: int,
+    duration: float,
+) -> LoadResult:
+    """Send requests from `concurrency` connections for `duration` seconds."""
+    result = LoadResult()
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_client(target, next_request, deadline, result) for _ in range(concurrency))
+    )
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def _client(target, next_request, deadline, result):
+    connection = None
+    while time.monotonic() < deadline:
+        spec = next_request()
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(
+                    target.host, target.port, ssl=target.ssl
+                )
+            reader, writer = connection
+            writer.write(_encode(spec, target))
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            result.exceptions[type(exc).__name__] += 1
+            connection = _close(connection)
+            continue
+
+        result.record(spec.name, status, time.perf_counter() - start)
+        if not keep_alive:
+            connection = _close(connection)
+    _close(connection)
+
+
+def _close(connection):
+    if connection is not None:
+        connection[1].close()
+    return None
+
+
+def _encode(spec: RequestSpec, target: Target) -> bytes:
+    headers = {
+        "Host": f"{target.host}:{target.port}",
+        "Content-Length": str(len(spec.body)),
+        **spec.headers,
+    }
+    head = f"{spec.method} {spec.path} HTTP/1.1\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode("latin-1") + b"\r\n" + spec.body
+
+
+async def _read_response(reader) -> tuple[int, bool]:
+    """Read one response; returns (status, connection can be reused)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip().lower()
+
+    keep_alive = headers.get("connection") != "close"
+    if "chunked" in headers.get("transfer-encoding", ""):
+        await _read_chunked(reader)
+    elif "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif status not in (204, 304):
+        await reader.read()  # body delimited by connection close
+        keep_alive = False
+    return status, keep_alive
+
+
+async def _read_chunked(reader):
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        await reader.readexactly(size + 2)  # chunk data + CRLF
+        if size == 0:
+            return
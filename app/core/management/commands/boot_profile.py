@@ -0,0 +1,210 @@
+"""
+Management command to measure worker boot: import time per module and the
+time to the first request
+"""
+
+import json
+import os
+import re
+import subprocess  # nosec B404
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter (``python -X importtime``), booting the WSGI
+# application like app.core.wsgi does and timing each stage.
+PROBE = """
+import json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+
+options = json.loads(sys.argv[1])
+start = time.perf_counter()
+
+from django.core.wsgi import get_wsgi_application
+
+application = get_wsgi_application()
+report = {"setup_ms": (time.perf_counter() - start) * 1000}
+
+from django.conf import settings
+
+# Like the test client's "testserver": the probe's own host is allowed,
+# whatever ALLOWED_HOSTS the settings have (e.g. none with DEBUG off)
+settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, options["host"]]
+
+if options["warmup"]:
+    from app.core.warmup import warm_up
+
+    mark = time.perf_counter()
+    report["warmup_steps_ms"] = warm_up()
+    report["warmup_ms"] = (time.perf_counter() - mark) * 1000
+
+
+def request():
+    environ = {"PATH_INFO": options["path"], "HTTP_HOST": options["host"]}
+    environ.update(options["headers"])
+    setup_testing_defaults(environ)
+    status = []
+    mark = time.perf_counter()
+    response = application(environ, lambda s, h, exc_info=None: status.append(s))
+    for _ in response:
+        pass
+    response.close()
+    return int(status[0].split()[0]), (time.perf_counter() - mark) * 1000
+
+
+def serve():
+    report["status"], report["first_request_ms"] = request()
+    report["second_request_ms"] = request()[1]
+    report["boot_to_first_response_ms"] = (time.perf_counter() - start) * 1000
+    return "BOOT_PROFILE " + json.dumps(report) + "\\n"
+
+
+if options["preload"]:
+    # Like gunicorn --preload: boot in the parent, serve from a forked child
+    read_end, write_end = os.pipe()
+    if os.fork() == 0:
+        os.write(write_end, serve().encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        sys.stdout.write(pipe.read())
+else:
+    sys.stdout.write(serve())
+"""
+
+REPORT = re.compile(r"^BOOT_PROFILE (.*)$", re.MULTILINE)
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the WSGI application in a fresh interpreter and report import time "
+        "per package and module, warm-up steps, and the time to the first "
+        "request, as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", default="/api/accounts/me/", help="Path of the first request"
+        )
+        parser.add_argument(
+            "--host", help="Host header (default: first entry of ALLOWED_HOSTS)"
+        )
+        parser.add_argument(
+            "--header",
+            action="append",
+            default=[],
+            metavar="'NAME: VALUE'",
+            help="Request header, e.g. 'Authorization: Bearer <token>' (repeatable)",
+        )
+        parser.add_argument(
+            "--no-warmup",
+            action="store_true",
+            help="Skip app.core.warmup, to compare first-request times",
+        )
+        parser.add_argument(
+            "--preload",
+            action="store_true",
+            help="Boot in a parent process and serve from a forked child",
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of modules/packages listed"
+        )
+
+    def handle(self, *args, **options):
+        if options["preload"] and not hasattr(os, "fork"):
+            raise CommandError("--preload requires os.fork")
+
+        probe_options = {
+            "path": options["path"],
+            "host": options["host"]
+            or next(
+                (host for host in settings.ALLOWED_HOSTS if "*" not in host),
+                "localhost",
+            ),
+            "headers": self._parse_headers(options["header"]),
+            "warmup": not options["no_warmup"],
+            "preload": options["preload"],
+        }
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "WARMUP_ENABLED": "0",  # the probe runs the warm-up itself
+        }
+        completed = subprocess.run(  # nosec B603
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                PROBE,
+                json.dumps(probe_options),
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        # stdout also carries the probe's own log lines
+        match = REPORT.search(completed.stdout)
+        if completed.returncode != 0 or not match:
+            raise CommandError(f"Boot probe failed:\n{completed.stderr[-3000:]}")
+
+        report = {
+            "settings": settings.SETTINGS_MODULE,
+            "warmup": probe_options["warmup"],
+            "preload": options["preload"],
+            **_rounded(json.loads(match.group(1))),
+            "imports": summarize_import_times(completed.stderr, options["top"]),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _parse_headers(self, raw_headers: list[str]) -> dict[str, str]:
+        headers = {}
+        for raw in raw_headers:
+            name, sep, value = raw.partition(":")
+            if not sep or not name.strip():
+                raise CommandError(f"Invalid --header: {raw!r}")
+            key = "HTTP_" + name.strip().upper().replace("-", "_")
+            headers[key] = value.strip()
+        return headers
+
+
+def summarize_import_times(output: str, top: int) -> dict:
+    """
+    Aggregate ``-X importtime`` output: total time, time per top-level
+    package (sum of self times) and the slowest modules (cumulative time of
+    imports that were not nested in another import).
+    """
+    by_package: dict[str, int] = defaultdict(int)
+    slowest = []
+    total = count = 0
+    for match in IMPORT_TIME.finditer(output):
+        self_us, cumulative_us, indent, module = match.groups()
+        by_package[module.split(".")[0]] += int(self_us)
+        total += int(self_us)
+        count += 1
+        if len(indent) <= 1:  # not nested in another import
+            slowest.append((int(cumulative_us), module))
+
+    slowest.sort(reverse=True)
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "modules": count,
+        "total_ms": _ms(total),
+        "by_package_ms": {name: _ms(us) for name, us in packages[:top]},
+        "slowest_modules_ms": {name: _ms(us) for us, name in slowest[:top]},
+    }
+
+
+def _ms(microseconds: int) -> float:
+    return round(microseconds / 1000, 2)
+
+
+def _rounded(report: dict) -> dict:
+    return {
+        key: round(value, 2) if isinstance(value, float) else value
+        for key, value in report.items()
+    }
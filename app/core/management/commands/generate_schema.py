@@ -0,0 +1,27 @@
+"""
+Management command to precompute the OpenAPI schema served at /api/schema/
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.core import openapi
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema for the current code version into "
+        "OPENAPI_SCHEMA['CACHE_DIR'], so no server process has to introspect "
+        "the API at runtime (run at build time)."
+    )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "OPENAPI_SCHEMA", {}).get("CACHE_DIR"):
+            raise CommandError("OPENAPI_SCHEMA['CACHE_DIR'] is not configured.")
+
+        version = openapi.code_version()
+        path = openapi.schema_path(version)
+        openapi.write_schema(path, openapi.generate_schema())
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Schema for version {version} written to {path}")
+        )
@@ -0,0 +1,202 @@
+"""
+Management command to load test the accounts API of a running server
+"""
+
+import asyncio
+import itertools
+import json
+import random
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from jwt.algorithms import ECAlgorithm
+
+from app.core.loadgen import RequestSpec, Target, run_load
+
+User = get_user_model()
+
+ENDPOINT = "/api/accounts/"
+ACTIONS = ("me", "retrieve", "list", "update")
+DEFAULT_MIX = "me=60,retrieve=25,list=10,update=5"
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a mix of accounts API requests at a fixed concurrency against a "
+        "running server, authenticating seeded users with locally minted ES256 "
+        "tokens, and report throughput, latency percentiles and errors as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--init-key",
+            metavar="PATH",
+            help=(
+                "Write a new ES256 private key to PATH and print the public JWK "
+                "to set as SUPABASE_ES256_PUBLIC_JWK on the target server"
+            ),
+        )
+        parser.add_argument(
+            "--key",
+            metavar="PATH",
+            default=".loadtest-key.pem",
+            help="ES256 private key (PEM) used to sign tokens",
+        )
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000", help="Server base URL"
+        )
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help=f"Request weights, e.g. '{DEFAULT_MIX}' (actions: {ACTIONS})",
+        )
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+        parser.add_argument(
+            "--warmup", type=float, default=2.0, help="Unmeasured seconds first"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1000,
+            help="Number of seeded users (with an auth_id) to send requests as",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed for the mix")
+
+    def handle(self, *args, **options):
+        if options["init_key"]:
+            self._init_key(Path(options["init_key"]))
+            return
+
+        self._validate_arguments(options)
+        mix = self._parse_mix(options["mix"])
+        private_key = self._load_key(Path(options["key"]))
+        tokens = self._mint_tokens(private_key, options["users"])
+
+        rng = random.Random(options["seed"])
+        next_request = _request_factory(tokens, mix, rng)
+        target = Target.from_url(options["url"])
+
+        if options["warmup"]:
+            asyncio.run(
+                run_load(
+                    target, next_request, options["concurrency"], options["warmup"]
+                )
+            )
+        result = asyncio.run(
+            run_load(target, next_request, options["concurrency"], options["duration"])
+        )
+
+        report = {
+            "url": options["url"],
+            "concurrency": options["concurrency"],
+            "duration_s": options["duration"],
+            "users": len(tokens),
+            "mix": mix,
+            **result.summary(),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _validate_arguments(self, options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be a positive number")
+        if options["duration"] <= 0:
+            raise CommandError("--duration must be a positive number")
+        if options["users"] < 1:
+            raise CommandError("--users must be a positive number")
+
+    def _parse_mix(self, raw: str) -> dict[str, int]:
+        mix = {}
+        for item in raw.split(","):
+            action, _, weight = item.partition("=")
+            action = action.strip()
+            if action not in ACTIONS or not weight.strip().isdigit():
+                raise CommandError(f"Invalid --mix entry: {item!r}")
+            mix[action] = int(weight)
+        if not any(mix.values()):
+            raise CommandError("--mix needs at least one positive weight")
+        return mix
+
+    def _init_key(self, path: Path):
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        path.write_bytes(
+            private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        )
+        path.chmod(0o600)
+        jwk = ECAlgorithm.to_jwk(private_key.public_key())
+        self.stdout.write(self.style.SUCCESS(f"✓ Private key written to {path}"))
+        self.stdout.write("Start the server with:")
+        self.stdout.write(f"SUPABASE_ES256_PUBLIC_JWK='{jwk}'")
+
+    def _load_key(self, path: Path):
+        if not path.exists():
+            raise CommandError(
+                f"Key {path} not found. Create one with --init-key {path} and "
+                "configure the server with the printed JWK."
+            )
+        return serialization.load_pem_private_key(path.read_bytes(), password=None)
+
+    def _mint_tokens(self, private_key, limit: int) -> list[tuple[str, str]]:
+        """(user id, bearer token) for up to `limit` users with an auth_id."""
+        users = (
+            User.objects.filter(auth_id__isnull=False, is_active=True)
+            .order_by("-date_joined")
+            .values_list("id", "email", "auth_id")[:limit]
+        )
+        expires = datetime.now(UTC) + timedelta(hours=2)
+        tokens = [
+            (
+                str(user_id),
+                jwt.encode(
+                    {
+                        "sub": str(auth_id),
+                        "email": email,
+                        "aud": "authenticated",
+                        "exp": expires,
+                    },
+                    private_key,
+                    algorithm="ES256",
+                ),
+            )
+            for user_id, email, auth_id in users
+        ]
+        if not tokens:
+            raise CommandError(
+                "No users with an auth_id found. Seed some with "
+                "'python manage.py seed_database --users 1000'."
+            )
+        return tokens
+
+
+def _request_factory(tokens, mix, rng):
+    """Callable returning the next request: a weighted action as a random user."""
+    actions = list(mix)
+    weights = [mix[action] for action in actions]
+    counter = itertools.count()
+
+    def next_request() -> RequestSpec:
+        user_id, token = rng.choice(tokens)
+        action = rng.choices(actions, weights)[0]
+        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+
+        if action == "me":
+            return RequestSpec(action, "GET", f"{ENDPOINT}me/", headers)
+        if action == "retrieve":
+            return RequestSpec(action, "GET", f"{ENDPOINT}{user_id}/", headers)
+        if action == "list":
+            return RequestSpec(action, "GET", ENDPOINT, headers)
+
+        body = json.dumps({"first_name": f"Load{next(counter)}"}).encode()
+        headers["Content-Type"] = "application/json"
+        return RequestSpec(action, "PATCH", f"{ENDPOINT}{user_id}/", headers, body)
+
+    return next_request
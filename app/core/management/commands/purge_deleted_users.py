@@ -0,0 +1,98 @@
+"""
+Management command to hard-delete soft-deleted users in bounded batches
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from app.accounts.changes import purge_tombstones
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete soft-deleted users and their related rows (groups, "
+        "permissions, admin log entries), a batch per transaction"
+    )
+
+    def add_arguments(self, parser):
+        config = settings.ACCOUNT_DELETION
+        parser.add_argument(
+            "--older-than",
+            type=float,
+            default=config["PURGE_AFTER_DAYS"],
+            help="Only purge users deleted at least this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config["PURGE_BATCH_SIZE"],
+            help="Users deleted per transaction",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=config["PURGE_PAUSE"],
+            help="Seconds to sleep between batches, to limit the load on the DB",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=0,
+            help="Stop after purging this many users (0: no limit)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many users would be purged",
+        )
+
+    def handle(self, *args, **options):
+        batch_size, limit = options["batch_size"], options["limit"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive number")
+        if limit < 0 or options["pause"] < 0 or options["older_than"] < 0:
+            raise CommandError("--limit, --pause and --older-than can't be negative")
+
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        deleted = User.all_objects.filter(deleted_at__lte=cutoff)
+
+        if options["dry_run"]:
+            count = deleted.count()
+            self.stdout.write(f"{count} deleted user(s) would be purged.")
+            return
+
+        purged, rows, batches = 0, 0, 0
+        while not limit or purged < limit:
+            size = min(batch_size, limit - purged) if limit else batch_size
+            # Oldest first, served by the partial deleted_at index
+            ids = list(
+                deleted.order_by("deleted_at").values_list("pk", flat=True)[:size]
+            )
+            if not ids:
+                break
+            if batches:
+                time.sleep(options["pause"])
+
+            with transaction.atomic():
+                total, per_model = User.all_objects.filter(pk__in=ids).delete()
+            purged += per_model.get(User._meta.label, 0)
+            rows += total
+            batches += 1
+            self.stdout.write(f"Batch {batches}: purged {len(ids)} user(s)")
+
+        # Purged users left tombstones for the change feed; drop expired ones
+        tombstones = purge_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Purged {purged} user(s) ({rows} rows) in {batches} batch(es), "
+                f"and {tombstones} expired tombstone(s)"
+            )
+        )
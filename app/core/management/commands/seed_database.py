@@ -2,8 +2,18 @@
 Management command to seed the entire database with sample data for development
 """
 
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
+
+User = get_user_model()
+
+SEED_EMAIL_DOMAIN = "seed.example.com"
 
 
 class Command(BaseCommand):
@@ -15,6 +25,18 @@ class Command(BaseCommand):
             action="store_true",
             help="Clear existing data before seeding",
         )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=0,
+            help="Number of sample users to create (e.g. 1000000 for a large table)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk insert when seeding users",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("Starting database seeding..."))
@@ -27,6 +49,8 @@ class Command(BaseCommand):
                     self._clear_data()
 
                 # Seed in dependency order
+                if options["users"]:
+                    self._seed_users(options["users"], options["batch_size"])
 
             self.stdout.write(
                 self.style.SUCCESS("Database seeding completed successfully!")
@@ -37,14 +61,19 @@ class Command(BaseCommand):
             raise CommandError(f"Seeding failed: {str(e)}") from e
 
     def _validate_arguments(self, options):
-        # raise CommandError("Raise an error if the argument is invalid")
-        pass
+        if options["users"] < 0:
+            raise CommandError("--users must be zero or a positive number")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number")
 
     def _clear_data(self):
         self.stdout.write("Clearing existing data...")
 
         try:
             # Clear in reverse dependency order to avoid foreign key constraints
+            User.all_objects.filter(
+                email__endswith=f"@{SEED_EMAIL_DOMAIN}", is_superuser=False
+            ).delete()
 
             self.stdout.write(
                 self.style.WARNING("✓ Cleared existing data (kept superusers and )")
@@ -53,3 +82,30 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error clearing data: {str(e)}"))
             raise
+
+    def _seed_users(self, count, batch_size):
+        """
+        Bulk insert sample users. Passwords are unusable so no hashing
+        happens per row, which keeps seeding millions of rows fast.
+        """
+        self.stdout.write(f"Seeding {count} users...")
+
+        password = make_password(None)
+        now = timezone.now()
+        offset = User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").count()
+
+        for start in range(0, count, batch_size):
+            batch = [
+                User(
+                    email=f"user{offset + i}@{SEED_EMAIL_DOMAIN}",
+                    first_name=f"First{offset + i}",
+                    last_name=f"Last{offset + i}",
+                    auth_id=uuid.uuid4(),
+                    password=password,
+                    date_joined=now - timedelta(minutes=offset + i),
+                )
+                for i in range(start, min(start + batch_size, count))
+            ]
+            User.objects.bulk_create(batch, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Seeded {count} users"))
@@ -0,0 +1,220 @@
+"""
+Management command to upsert users from an export of the identity provider
+(Supabase ``auth.users``), so their tokens are accepted by JWTAuthentication
+"""
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import sys
+import uuid
+from dataclasses import dataclass
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+User = get_user_model()
+
+SYNCED_FIELDS = ["auth_id", "email", "first_name", "last_name"]
+NAME_MAX_LENGTH = 255
+MAX_REPORTED_CONFLICTS = 20
+
+
+@dataclass
+class AuthUser:
+    auth_id: uuid.UUID
+    email: str
+    first_name: str
+    last_name: str
+    created_at: datetime.datetime | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update users from a JSONL or CSV export of the identity "
+        "provider's users, matched by auth_id, then by email"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="Export file (.jsonl, .csv, optionally .gz), or - for stdin",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="Input format (default: from the file extension, jsonl for stdin)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Users upserted per query and transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without writing",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number")
+
+        self.counts = dict.fromkeys(
+            ["created", "updated", "unchanged", "conflicting", "invalid"], 0
+        )
+        self.password = make_password(None)
+        self.now = timezone.now()
+
+        with self._open(options["path"]) as stream:
+            records = self._read(stream, options["format"] or self._format(options))
+            while batch := list(islice(records, options["batch_size"])):
+                self._sync_batch(batch, options["dry_run"])
+
+        prefix = "[dry run] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {prefix}Created {self.counts['created']}, "
+                f"updated {self.counts['updated']}, "
+                f"unchanged {self.counts['unchanged']}, "
+                f"conflicting {self.counts['conflicting']}, "
+                f"invalid {self.counts['invalid']}"
+            )
+        )
+
+    # Input
+
+    @staticmethod
+    def _format(options) -> str:
+        path = options["path"].removesuffix(".gz")
+        return "csv" if path.endswith(".csv") else "jsonl"
+
+    def _open(self, path: str):
+        if path == "-":
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        try:
+            if path.endswith(".gz"):
+                return gzip.open(path, "rt", encoding="utf-8", newline="")
+            return open(path, encoding="utf-8", newline="")
+        except OSError as exc:
+            raise CommandError(f"Can't read {path}: {exc}") from exc
+
+    def _read(self, stream, input_format: str):
+        """Parsed users, one at a time (the input is never loaded whole)."""
+        rows = csv.DictReader(stream) if input_format == "csv" else stream
+        for number, row in enumerate(rows, start=1):
+            try:
+                if input_format == "jsonl":
+                    if not row.strip():
+                        continue
+                    row = json.loads(row)
+                yield self._parse(row)
+            except (ValueError, TypeError, AttributeError, ValidationError) as exc:
+                self.counts["invalid"] += 1
+                self.stderr.write(f"Record {number}: invalid user ({exc})")
+
+    @staticmethod
+    def _parse(row: dict) -> AuthUser:
+        auth_id = uuid.UUID(str(row.get("id") or row.get("auth_id")))
+        email = User.objects.normalize_email(row.get("email"))
+        validate_email(email)
+
+        # Names may come as columns or in the user metadata (a JSON string
+        # in CSV exports)
+        metadata = row.get("raw_user_meta_data") or row.get("user_metadata") or {}
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        first_name = row.get("first_name") or metadata.get("first_name") or ""
+        last_name = row.get("last_name") or metadata.get("last_name") or ""
+
+        return AuthUser(
+            auth_id=auth_id,
+            email=email,
+            first_name=first_name[:NAME_MAX_LENGTH],
+            last_name=last_name[:NAME_MAX_LENGTH],
+            created_at=parse_datetime(row.get("created_at") or ""),
+        )
+
+    # Upsert
+
+    def _sync_batch(self, batch: list[AuthUser], dry_run: bool):
+        # Later rows for the same auth_id win
+        by_auth_id = {user.auth_id: user for user in batch}
+
+        existing = User.all_objects.filter(
+            Q(auth_id__in=by_auth_id)
+            | Q(email__lower__in={user.email for user in by_auth_id.values()})
+        ).only("id", "deleted_at", *SYNCED_FIELDS)
+        rows_by_auth_id = {row.auth_id: row for row in existing if row.auth_id}
+        rows_by_email = {row.email.lower(): row for row in existing}
+
+        to_write, emails = [], set()
+        created = updated = 0
+        for user in by_auth_id.values():
+            row = rows_by_auth_id.get(user.auth_id)
+            email_row = rows_by_email.get(user.email)
+            if row is None and email_row is not None and email_row.auth_id is None:
+                row = email_row  # an existing local user, linked on first sync
+
+            if (
+                user.email in emails
+                or (email_row is not None and email_row is not row)
+                or (row is not None and row.deleted_at is not None)
+            ):
+                self._conflict(user, row, email_row)
+                continue
+            emails.add(user.email)
+
+            if row is None:
+                to_write.append(self._user(user, uuid.uuid4()))
+                created += 1
+            elif any(getattr(row, f) != getattr(user, f) for f in SYNCED_FIELDS):
+                to_write.append(self._user(user, row.pk))
+                updated += 1
+            else:
+                self.counts["unchanged"] += 1
+
+        if to_write and not dry_run:
+            # One INSERT ... ON CONFLICT (id) DO UPDATE for new and changed rows
+            with transaction.atomic():
+                User.all_objects.bulk_create(
+                    to_write,
+                    update_conflicts=True,
+                    unique_fields=["id"],
+                    # updated_at: the row's position in the change feed
+                    update_fields=[*SYNCED_FIELDS, "updated_at"],
+                )
+        self.counts["created"] += created
+        self.counts["updated"] += updated
+
+    def _user(self, user: AuthUser, pk: uuid.UUID):
+        # Only SYNCED_FIELDS (and updated_at) are written to existing rows
+        return User(
+            id=pk,
+            password=self.password,
+            date_joined=user.created_at or self.now,
+            **{field: getattr(user, field) for field in SYNCED_FIELDS},
+        )
+
+    def _conflict(self, user: AuthUser, row, email_row):
+        self.counts["conflicting"] += 1
+        if self.counts["conflicting"] > MAX_REPORTED_CONFLICTS:
+            return
+        if row is not None and row.deleted_at is not None:
+            reason = "the user is deleted"
+        elif email_row is not None and email_row is not row:
+            reason = f"the email belongs to user {email_row.pk}"
+        else:
+            reason = "the email appears twice in the batch"
+        self.stderr.write(f"Conflict for {user.auth_id} <{user.email}>: {reason}")
@@ -0,0 +1,68 @@
+"""
+Prometheus metrics exported at ``/metrics``.
+
+Gunicorn pre-forks several worker processes, each with its own in-memory
+registry. When ``PROMETHEUS_MULTIPROC_DIR`` is set, prometheus_client
+writes every sample to per-process files in that directory and the
+``/metrics`` view aggregates them, so a scrape sees all workers.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route.",
+    ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests by route, method and status code.",
+    ["route", "method", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+JWT_AUTH_OUTCOMES = Counter(
+    "jwt_auth_outcomes_total",
+    "JWTAuthentication results (ok, expired, bad_audience, unknown_user, invalid).",
+    ["outcome"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache (permissions, throttle, readiness, openapi, "
+    "openapi_file) and result (hit or miss).",
+    ["cache", "result"],
+)
+
+
+def record_jwt_auth(outcome: str):
+    JWT_AUTH_OUTCOMES.labels(outcome=outcome).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Count a cache lookup; hit ratio = hits / (hits + misses)."""
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition payload for all workers, and its content type."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
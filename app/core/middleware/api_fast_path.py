@@ -0,0 +1,70 @@
+"""
+Lean middleware path for bearer-token API requests.
+
+API clients authenticate with ``Authorization: Bearer <JWT>`` and never use
+sessions, cookies-based CSRF or flash messages. The middleware below are
+drop-in replacements for Django's session, CSRF, authentication and
+messages middleware that step aside for such requests, while requests to
+``/admin/`` (or without a bearer token) keep the full stack.
+"""
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+
+BEARER_PREFIX = "Bearer "
+
+
+def is_api_fast_path(request) -> bool:
+    """Whether the request is a bearer-token API call (result is cached)."""
+    try:
+        return request._api_fast_path
+    except AttributeError:
+        pass
+
+    config = settings.API_FAST_PATH
+    fast_path = (
+        config["ENABLED"]
+        and request.path_info.startswith(tuple(config["PREFIXES"]))
+        and request.META.get("HTTP_AUTHORIZATION", "").startswith(BEARER_PREFIX)
+    )
+    request._api_fast_path = fast_path
+    return fast_path
+
+
+class ApiFastPathMixin:
+    """Skip the wrapped middleware entirely for bearer-token API requests."""
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if is_api_fast_path(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if is_api_fast_path(request):
+            return await self.get_response(request)
+        return await super().__acall__(request)
+
+
+class LeanSessionMiddleware(ApiFastPathMixin, SessionMiddleware):
+    pass
+
+
+class LeanCsrfViewMiddleware(ApiFastPathMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # process_view is called by the handler, not by __call__
+        if is_api_fast_path(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class LeanAuthenticationMiddleware(ApiFastPathMixin, AuthenticationMiddleware):
+    pass
+
+
+class LeanMessageMiddleware(ApiFastPathMixin, MessageMiddleware):
+    pass
@@ -0,0 +1,122 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from app.core import timing
+from app.core.compression import CODINGS, negotiate
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best coding the client accepts among
+    COMPRESSION["CODINGS"] (zstd, br, gzip), at COMPRESSION["LEVELS"].
+
+    Only COMPRESSION["CONTENT_TYPES"] are compressed, and whole bodies only
+    from COMPRESSION["MIN_SIZE"] bytes. Streaming responses (sync or async)
+    are compressed as they are sent, never buffered whole.
+    Responses that already have a Content-Encoding (e.g. the precompressed
+    OpenAPI schema) are left alone.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        config = settings.COMPRESSION
+        if (
+            not config["ENABLED"]
+            or response.has_header("Content-Encoding")
+            or not _compressible_type(response, config["CONTENT_TYPES"])
+        ):
+            return response
+        # The body depends on Accept-Encoding from here on, for caches too
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if not response.streaming and len(response.content) < config["MIN_SIZE"]:
+            return response
+        coding = negotiate(
+            request.headers.get("Accept-Encoding", ""), config["CODINGS"]
+        )
+        if coding is None:
+            return response
+
+        level = config["LEVELS"][coding]
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    response.streaming_content, CODINGS[coding](level)
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, CODINGS[coding](level)
+                )
+            del response.headers["Content-Length"]
+        else:
+            with timing.phase("compress"):
+                compressor = CODINGS[coding](level)
+                compressed = compressor.compress(response.content) + compressor.flush()
+            # Incompressible bodies (already compressed formats) are sent as is
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The compressed body differs byte for byte from the one it was for
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
+
+
+def _compressible_type(response, content_types) -> bool:
+    content_type = response.get("Content-Type", "")
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in content_types
+
+
+def compress_stream(chunks, compressor):
+    """
+    Compress an iterable of byte chunks as it is consumed. Small chunks are
+    joined up to STREAM_CHUNK_SIZE first: compressors hold back that much
+    anyway, and brotli compresses tiny writes poorly at low levels.
+    """
+    pending, size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_SIZE:
+            if data := compressor.compress(b"".join(pending)):
+                yield data
+            pending, size = [], 0
+    yield compressor.compress(b"".join(pending)) + compressor.flush()
+
+
+async def acompress_stream(chunks, compressor):
+    """See compress_stream()."""
+    pending, size = [], 0
+    async for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_SIZE:
+            if data := compressor.compress(b"".join(pending)):
+                yield data
+            pending, size = [], 0
+    yield compressor.compress(b"".join(pending)) + compressor.flush()
@@ -0,0 +1,73 @@
+import json
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+
+from app.core import health
+
+
+class HealthCheckMiddleware:
+    """
+    Answer the load balancer's probes before the rest of the stack:
+    HEALTH["LIVENESS_PATH"] (the process serves requests; touches nothing)
+    and HEALTH["READINESS_PATH"] (see app.core.health).
+
+    Being first, probes skip sessions, auth, CSRF, ALLOWED_HOSTS checks
+    (load balancers often probe by IP), access logs and request metrics.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        config = settings.HEALTH
+        self.liveness_path = config["LIVENESS_PATH"]
+        self.readiness_path = config["READINESS_PATH"]
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        probe = self._probe(request)
+        if probe == "liveness":
+            return _liveness()
+        if probe == "readiness":
+            return _readiness(health.readiness())
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        probe = self._probe(request)
+        if probe == "liveness":
+            return _liveness()
+        if probe == "readiness":
+            return _readiness(await sync_to_async(health.readiness)())
+        return await self.get_response(request)
+
+    def _probe(self, request) -> str | None:
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if request.path_info == self.liveness_path:
+            return "liveness"
+        if request.path_info == self.readiness_path:
+            return "readiness"
+        return None
+
+
+def _liveness():
+    return _json_response({"status": "ok"}, 200)
+
+
+def _readiness(report):
+    return _json_response(report.as_dict(), 200 if report.ready else 503)
+
+
+def _json_response(data, status):
+    response = HttpResponse(
+        json.dumps(data), content_type="application/json", status=status
+    )
+    response["Cache-Control"] = "no-store"
+    return response
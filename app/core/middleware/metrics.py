@@ -0,0 +1,73 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from app.core import metrics, timing
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Record request latency, status and DB query count per route.
+
+    Routes are labelled with the URL name (e.g. ``account-detail``) rather
+    than the raw path, so label cardinality stays bounded. Requests pass
+    straight through unless METRICS["ENABLED"].
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS["ENABLED"]:
+            return self.get_response(request)
+
+        # Reuse the Server-Timing collector when active, for the DB counters
+        token = timing.activate() if timing.current() is None else None
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            timings = timing.deactivate(token) if token else timing.current()
+        self._observe(request, response, elapsed, timings)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS["ENABLED"]:
+            return await self.get_response(request)
+
+        token = timing.activate() if timing.current() is None else None
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            timings = timing.deactivate(token) if token else timing.current()
+        self._observe(request, response, elapsed, timings)
+        return response
+
+    def _observe(self, request, response, elapsed, timings):
+        route = _route(request)
+        metrics.REQUEST_LATENCY.labels(route=route, method=request.method).observe(
+            elapsed
+        )
+        metrics.REQUESTS.labels(
+            route=route, method=request.method, status=response.status_code
+        ).inc()
+        metrics.REQUEST_DB_QUERIES.labels(route=route).observe(timings.db_queries)
+
+
+def _route(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match.route
@@ -0,0 +1,38 @@
+"""
+Django middleware whose hooks never block, run on the event loop under ASGI.
+
+MiddlewareMixin runs process_request and process_response through
+sync_to_async under ASGI: a thread hop each, on every request. The hooks
+of the middleware below only read the request and set response headers
+(no database, no I/O), so they are called inline instead.
+
+Django's deploy checks look for the originals by dotted path; see
+app.core.checks for how they are run against these subclasses.
+"""
+
+from django.middleware import clickjacking, common, security
+
+
+class InlineHooksMixin:
+    """MiddlewareMixin.__acall__, without the thread hops around the hooks."""
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, "process_request"):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, "process_response"):
+            response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineHooksMixin, security.SecurityMiddleware):
+    pass
+
+
+class CommonMiddleware(InlineHooksMixin, common.CommonMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(InlineHooksMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
@@ -0,0 +1,113 @@
+import logging
+import os
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework import exceptions
+
+from app.core import profiling
+from app.jwt_auth.authentication import bearer_token, decode_request_token
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests carrying the PROFILING["HEADER"] header (``cpu`` or
+    ``memory``) when PROFILING["ENABLED"], and log the report (see
+    app.core.profiling). Profiled responses carry the pid of the worker in
+    ``X-Profile-Worker``, to query its /api/profiling/ endpoint.
+
+    Only requests with the bearer token of an active staff user are
+    profiled: the token is checked before any profiling work, the others
+    pass through.
+
+    Streaming bodies are produced after the profile ends, and are not
+    covered.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        kind = profiling.requested(request)
+        if kind and not _staff_token(request):
+            kind = None
+        token = profiling.activate(kind) if kind else None
+        if token is None:
+            return self.get_response(request)
+
+        try:
+            with profiling.phase("request"):
+                response = self.get_response(request)
+        finally:
+            profile = profiling.deactivate(token)
+        return self._report(request, response, profile)
+
+    async def __acall__(self, request):
+        kind = profiling.requested(request)
+        if kind and not await sync_to_async(_staff_token)(request):
+            kind = None
+        token = profiling.activate(kind) if kind else None
+        if token is None:
+            return await self.get_response(request)
+
+        try:
+            with profiling.phase("request"):
+                response = await self.get_response(request)
+        finally:
+            profile = profiling.deactivate(token)
+        return self._report(request, response, profile)
+
+    def _report(self, request, response, profile):
+        match = request.resolver_match
+        report = profiling.report(
+            profile,
+            request_id=getattr(request, "request_id", None),
+            method=request.method,
+            path=request.path,
+            view=match.view_name if match else None,
+            status=response.status_code,
+        )
+        logger.info(
+            "Profiled %s %s (%s)",
+            request.method,
+            request.path,
+            profile.kind,
+            extra={"profile": report},
+        )
+        response["X-Profile-Worker"] = str(os.getpid())
+        return response
+
+
+def _staff_token(request) -> bool:
+    """
+    Whether the request's bearer token is valid and names an active staff
+    user. The decoded token is reused by JWTAuthentication for other
+    users; for staff, it is dropped so the profile covers the decoding.
+    """
+    token = bearer_token(request)
+    if token is None:
+        return False
+    try:
+        auth_id = uuid.UUID(str(decode_request_token(request, token).get("sub")))
+    except (exceptions.AuthenticationFailed, ValueError):
+        return False
+
+    staff = (
+        get_user_model()
+        .objects.filter(auth_id=auth_id, is_staff=True, is_active=True)
+        .exists()
+    )
+    if staff:
+        del request._jwt_decoded
+    return staff
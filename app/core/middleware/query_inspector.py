@@ -0,0 +1,54 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from app.core import query_inspector
+
+logger = logging.getLogger(__name__)
+
+
+class RepeatedQueryMiddleware:
+    """
+    Development-only middleware logging SQL statements executed at least
+    ``QUERY_INSPECTOR["THRESHOLD"]`` times in one request, with the stack
+    trace of the code that issued them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        query_inspector.install()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = query_inspector.activate(settings.QUERY_INSPECTOR["THRESHOLD"])
+        try:
+            return self.get_response(request)
+        finally:
+            self._report(request, query_inspector.deactivate(token))
+
+    async def __acall__(self, request):
+        token = query_inspector.activate(settings.QUERY_INSPECTOR["THRESHOLD"])
+        try:
+            return await self.get_response(request)
+        finally:
+            self._report(request, query_inspector.deactivate(token))
+
+    def _report(self, request, query_log):
+        for sql, count, stack in query_log.repeated():
+            logger.warning(
+                "Repeated query (%d times) in %s %s: %s\n%s",
+                count,
+                request.method,
+                request.path,
+                sql,
+                stack,
+                extra={"sql": sql, "count": count, "path": request.path},
+            )
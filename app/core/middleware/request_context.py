@@ -0,0 +1,80 @@
+import logging
+import re
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from app.core.structured_logging import request_id_var, user_id_var
+
+logger = logging.getLogger("app.access")
+
+# Accept upstream request ids (from a proxy or load balancer) when sane
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """
+    Bind a request id (``X-Request-ID`` from upstream, or a new one) to the
+    log context, echo it on the response and write one access log record
+    per request with its status and latency, and the phase timings of
+    ServerTimingMiddleware when it collected them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        tokens, start = self._bind(request)
+        try:
+            response = self.get_response(request)
+            self._finish(request, response, start)
+            return response
+        finally:
+            self._unbind(tokens)
+
+    async def __acall__(self, request):
+        tokens, start = self._bind(request)
+        try:
+            response = await self.get_response(request)
+            self._finish(request, response, start)
+            return response
+        finally:
+            self._unbind(tokens)
+
+    def _bind(self, request):
+        request_id = request.headers.get("X-Request-ID", "")
+        if not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        tokens = (request_id_var.set(request_id), user_id_var.set(None))
+        return tokens, time.perf_counter()
+
+    def _unbind(self, tokens):
+        request_id_var.reset(tokens[0])
+        user_id_var.reset(tokens[1])
+
+    def _finish(self, request, response, start):
+        response["X-Request-ID"] = request.request_id
+        timings = getattr(request, "timings", None)
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                **(timings.as_dict() if timings is not None else {}),
+            },
+        )
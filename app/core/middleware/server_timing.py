@@ -0,0 +1,64 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from app.core import timing
+
+
+class ServerTimingMiddleware:
+    """
+    Collect per-phase timings for each request and report them as a
+    ``Server-Timing`` header and, when ``SERVER_TIMING["LOG"]``, as fields
+    of the request's access log record (see RequestContextMiddleware).
+
+    ``SERVER_TIMING["MODE"]`` controls it:
+    - ``"off"``: requests pass straight through, nothing is collected.
+    - ``"staff"``: timings are collected, the header is sent to staff only.
+    - ``"all"``: timings are collected and sent to everyone.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if settings.SERVER_TIMING["MODE"] == "off":
+            return self.get_response(request)
+
+        token = timing.activate()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = timing.deactivate(token)
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request):
+        if settings.SERVER_TIMING["MODE"] == "off":
+            return await self.get_response(request)
+
+        token = timing.activate()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timings = timing.deactivate(token)
+        return self._report(request, response, timings)
+
+    def _report(self, request, response, timings):
+        config = settings.SERVER_TIMING
+        if config["MODE"] == "all" or _is_staff(request):
+            response["Server-Timing"] = timings.server_timing_header()
+
+        if config["LOG"]:
+            request.timings = timings
+        return response
+
+
+def _is_staff(request) -> bool:
+    user = getattr(request, "user", None)
+    return bool(getattr(user, "is_staff", False))
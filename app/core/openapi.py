@@ -0,0 +1,123 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, which takes
+hundreds of milliseconds. It is generated once per code version instead:
+kept in memory for the life of the process and, when
+OPENAPI_SCHEMA["CACHE_DIR"] is set, in a file shared by every process
+(written at build time by ``manage.py generate_schema``, or by the first
+process that needs it).
+"""
+
+import functools
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import NamedTuple, Self
+
+from django.conf import settings
+
+from . import metrics
+
+
+class SchemaDocument(NamedTuple):
+    version: str
+    content: bytes
+    gzipped: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, version: str, content: bytes) -> Self:
+        digest = hashlib.sha256(content).hexdigest()
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        return cls(version, content, gzipped, f'"{digest[:32]}"')
+
+
+_document: SchemaDocument | None = None
+_lock = threading.Lock()
+
+
+def code_version() -> str:
+    """
+    OPENAPI_SCHEMA["CODE_VERSION"] (e.g. the git SHA of the build), or a
+    hash of the application's Python sources.
+    """
+    return settings.OPENAPI_SCHEMA["CODE_VERSION"] or _source_hash()
+
+
+@functools.cache
+def _source_hash() -> str:
+    digest = hashlib.sha256()
+    app_dir = Path(settings.BASE_DIR) / "app"
+    for path in sorted(app_dir.rglob("*.py")):
+        digest.update(str(path.relative_to(app_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def get_schema() -> SchemaDocument:
+    """The schema of the current code version, generated at most once."""
+    global _document
+    version = code_version()
+    document = _document
+    if document is not None and document.version == version:
+        metrics.record_cache_lookup("openapi", hit=True)
+        return document
+
+    with _lock:
+        stale = _document is None or _document.version != version
+        metrics.record_cache_lookup("openapi", hit=not stale)
+        if stale:
+            _document = _load_or_generate(version)
+        return _document
+
+
+def _load_or_generate(version: str) -> SchemaDocument:
+    path = schema_path(version)
+    if path is not None:
+        metrics.record_cache_lookup("openapi_file", hit=path.exists())
+    if path is not None and path.exists():
+        return SchemaDocument.from_content(version, path.read_bytes())
+
+    content = generate_schema()
+    if path is not None:
+        write_schema(path, content)
+    return SchemaDocument.from_content(version, content)
+
+
+def schema_path(version: str) -> Path | None:
+    cache_dir = settings.OPENAPI_SCHEMA["CACHE_DIR"]
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / f"openapi-{version}.json"
+
+
+def generate_schema() -> bytes:
+    """Introspect the API and render its schema as JSON."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(
+        request=None, public=spectacular_settings.SERVE_PUBLIC
+    )
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def write_schema(path: Path, content: bytes):
+    """
+    Write the schema atomically, so concurrent readers never see a partial
+    file, and remove the files of other code versions.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(content)
+    os.replace(tmp_name, path)
+
+    for stale in path.parent.glob("openapi-*.json"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
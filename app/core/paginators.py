@@ -0,0 +1,57 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact ``COUNT(*)`` on very large tables.
+
+    For unfiltered querysets on PostgreSQL the row count is read from the
+    planner statistics in ``pg_class``. The default manager's own filter
+    (e.g. hiding soft-deleted users) does not count as one: the rows it hides
+    are few, and included in the estimate. Small tables, filtered querysets
+    and other database backends fall back to the exact count.
+    """
+
+    # Below this many rows an exact count is cheap enough to be worth it.
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_row_count(self.object_list)
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+
+def estimated_row_count(queryset) -> int | None:
+    """
+    Return the planner's row estimate for an unfiltered queryset.
+    Returns None when no cheap estimate is available.
+    """
+    if not isinstance(queryset, QuerySet) or not _unfiltered(queryset):
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    # reltuples is -1 for tables that have never been analyzed
+    if not row or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def _unfiltered(queryset) -> bool:
+    """Whether `queryset` has no filter beyond its model's default manager's."""
+    where = queryset.query.where
+    return not where or where == queryset.model._default_manager.all().query.where
@@ -0,0 +1,75 @@
+"""
+Parsers: ORJSONParser and MessagePackParser.
+
+ORJSONParser is a faster drop-in replacement for DRF's JSONParser.
+
+Bodies orjson rejects (invalid JSON, non-UTF-8 encodings) are parsed again
+by JSONParser, so error messages stay the same. So are bodies with runs of
+19+ digits, since orjson turns integers wider than 64 bits into floats.
+Without orjson installed, this parser is JSONParser.
+
+MessagePackParser reads ``application/msgpack`` bodies as written by
+MessagePackRenderer: Timestamps become aware datetimes and UUID extensions
+become UUIDs, which serializer fields accept as they are.
+"""
+
+import io
+import uuid
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import UUID_EXT_TYPE, MessagePackRenderer, ORJSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# Maps digits to b"0" and everything else to b" ", so that runs of digits
+# long enough to overflow 64 bits can be found with a substring search
+# (much faster than a regex on large bodies)
+_DIGITS = bytes(ord("0") if 0x30 <= i <= 0x39 else ord(" ") for i in range(256))
+_LONG_DIGIT_RUN = b"0" * 19
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        # orjson rejects NaN/Infinity, so it only matches strict parsing
+        if orjson is None or not self.strict or encoding.lower() != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if _LONG_DIGIT_RUN not in body.translate(_DIGITS):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), timestamp=3, ext_hook=_ext_hook)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}") from exc
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == UUID_EXT_TYPE:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
@@ -0,0 +1,344 @@
+"""
+On-demand CPU and memory profiling of live workers (PROFILING setting).
+
+When PROFILING["ENABLED"], ProfilingMiddleware profiles requests carrying
+the PROFILING["HEADER"] header:
+- ``cpu``: cProfile, in every thread the request runs code in (under ASGI,
+  sync views run in a thread of their own). From Python 3.12, a profiler
+  covers every thread and only one can run at a time: the request's single
+  profiler then also sees the worker's other threads;
+- ``memory``: tracemalloc, diffing the allocations of the whole request and
+  of each phase (AccountViewSet actions, JWTAuthentication token decoding
+  and user lookup).
+
+Only requests with the bearer token of an active staff user are profiled,
+and one at a time per worker: the others pass through. Each worker keeps
+its last PROFILING["KEEP"] reports and its allocation totals by phase, and
+takes tracemalloc snapshots on demand (see ProfilingViewSet).
+
+Without a profile bound to the context, phase() is a no-op, so profiling
+costs next to nothing while off.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+KINDS = ("cpu", "memory")
+
+# cProfile is built on sys.monitoring, which is process-wide, from 3.12
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+# Allocations made by tracemalloc and the import system are noise
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class RequestProfile:
+    """CPU profilers or allocation diffs, by phase, of a single request."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.profilers: dict[int, cProfile.Profile] = {}
+        self.phases: dict[str, list[tracemalloc.StatisticDiff]] = {}
+        self.owns_tracing = False
+
+    def profile_thread(self) -> cProfile.Profile | None:
+        """
+        Start cProfile in the current thread, unless it runs there already
+        (or, with a process-wide profiler, anywhere), or another profiling
+        tool is active.
+        """
+        ident = threading.get_ident()
+        if ident in self.profilers or (PROCESS_WIDE_PROFILER and self.profilers):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Python 3.12+: another tool, e.g. a debugger
+            return None
+        self.profilers[ident] = profiler
+        return profiler
+
+
+@dataclass
+class PhaseAllocations:
+    """Allocations of a phase, summed over the staff requests profiled."""
+
+    requests: int = 0
+    size: int = 0
+    sites: Counter[str] = field(default_factory=Counter)
+
+    def add(self, diffs: list[tracemalloc.StatisticDiff]):
+        self.requests += 1
+        for diff in diffs:
+            if diff.size_diff > 0:
+                self.size += diff.size_diff
+                self.sites[_site(diff.traceback[0])] += diff.size_diff
+
+    def as_dict(self, top: int) -> dict:
+        return {
+            "requests": self.requests,
+            "size": self.size,
+            "top": [
+                {"site": site, "size": size}
+                for site, size in self.sites.most_common(top)
+            ],
+        }
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar(
+    "request_profile", default=None
+)
+
+# Held by the profiled request, never waited for
+_lock = threading.Lock()
+_reports: deque[dict] = deque()
+_allocations: dict[str, PhaseAllocations] = {}
+
+# Held while tracemalloc is started or stopped, by requests and snapshots
+_tracing_lock = threading.Lock()
+_baseline: tracemalloc.Snapshot | None = None
+_tracing = False  # tracemalloc started by take_snapshot(), not by a request
+_memory_profile: RequestProfile | None = None
+
+
+def current() -> RequestProfile | None:
+    """The profile of the request being handled, if it is profiled."""
+    return _current.get()
+
+
+def requested(request) -> str | None:
+    """The kind of profile the request asks for, if profiling is enabled."""
+    config = settings.PROFILING
+    if not config["ENABLED"]:
+        return None
+    kind = request.headers.get(config["HEADER"], "").strip().lower()
+    return kind if kind in KINDS else None
+
+
+def activate(kind: str) -> Token | None:
+    """Bind a new profile, or return None if the worker is profiling already."""
+    global _memory_profile
+    if not _lock.acquire(blocking=False):
+        return None
+    profile = RequestProfile(kind)
+    if kind == "memory":
+        with _tracing_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                profile.owns_tracing = True
+            _memory_profile = profile
+    return _current.set(profile)
+
+
+def deactivate(token: Token) -> RequestProfile:
+    global _memory_profile
+    profile = _current.get()
+    _current.reset(token)
+    if profile.kind == "memory":
+        with _tracing_lock:
+            _memory_profile = None
+            if profile.owns_tracing and not _tracing:
+                tracemalloc.stop()
+    _lock.release()
+    return profile
+
+
+@contextmanager
+def phase(name: str):
+    """Profile the enclosed block as `name` (diffs of a phase add up)."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+
+    if profile.kind == "cpu":
+        profiler = profile.profile_thread()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        return
+
+    before = _snapshot()
+    try:
+        yield
+    finally:
+        diffs = _snapshot().compare_to(before, "lineno")
+        profile.phases.setdefault(name, []).extend(diffs)
+
+
+def report(profile: RequestProfile, **request_fields) -> dict:
+    """
+    Build the report of a request's profile, and keep it with the worker's
+    recent reports and allocation totals.
+    """
+    config = settings.PROFILING
+    top = config["TOP"]
+    data = {
+        **request_fields,
+        "kind": profile.kind,
+        "pid": os.getpid(),
+        "duration_ms": round((time.perf_counter() - profile.started) * 1000, 2),
+    }
+    if profile.kind == "cpu":
+        data["top"] = _cpu_rows(profile.profilers.values(), top)
+    else:
+        data["phases"] = {
+            name: _diff_rows(diffs, top) for name, diffs in profile.phases.items()
+        }
+        for name, diffs in profile.phases.items():
+            _allocations.setdefault(name, PhaseAllocations()).add(diffs)
+
+    _reports.appendleft(data)
+    while len(_reports) > config["KEEP"]:
+        _reports.pop()
+    return data
+
+
+def worker_status() -> dict:
+    """Recent reports and allocations by phase of this worker."""
+    top = settings.PROFILING["TOP"]
+    return {
+        "pid": os.getpid(),
+        "tracing": tracemalloc.is_tracing(),
+        "traced_memory": _traced_memory(),
+        "reports": list(_reports),
+        "allocations": {
+            name: allocations.as_dict(top) for name, allocations in _allocations.items()
+        },
+    }
+
+
+def take_snapshot() -> dict:
+    """
+    Snapshot the worker's live allocations, diffed with its previous
+    snapshot. Tracing starts with the first snapshot (so that one is
+    nearly empty) and goes on until stop_tracing().
+    """
+    global _baseline, _tracing
+    top = settings.PROFILING["TOP"]
+    with _tracing_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing = True
+        snapshot = _snapshot()
+        previous, _baseline = _baseline, snapshot
+
+    return {
+        "pid": os.getpid(),
+        "traced_memory": _traced_memory(),
+        "top": [
+            {"site": _site(stat.traceback[0]), "size": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+        "diff": (
+            None
+            if previous is None
+            else _diff_rows(snapshot.compare_to(previous, "lineno"), top)
+        ),
+    }
+
+
+def stop_tracing():
+    """
+    Stop tracemalloc and drop the worker's snapshot. A memory profile
+    under way keeps tracing until it ends.
+    """
+    global _baseline, _tracing
+    with _tracing_lock:
+        if _memory_profile is None:
+            tracemalloc.stop()
+        else:
+            _memory_profile.owns_tracing = True
+        _baseline = None
+        _tracing = False
+
+
+def clear():
+    """Forget the worker's reports and allocation totals."""
+    _reports.clear()
+    _allocations.clear()
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def _traced_memory() -> dict | None:
+    if not tracemalloc.is_tracing():
+        return None
+    size, peak = tracemalloc.get_traced_memory()
+    return {"size": size, "peak": peak}
+
+
+def _cpu_rows(profilers, top: int) -> list[dict]:
+    """The `top` functions by cumulative time, over all threads."""
+    if not profilers:
+        return []
+    stats = pstats.Stats(*profilers).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": _function(key),
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for key, (_, calls, tottime, cumtime, _) in rows[:top]
+    ]
+
+
+def _diff_rows(diffs: list[tracemalloc.StatisticDiff], top: int) -> list[dict]:
+    """The `top` sites by memory allocated (and still held) since the diff base."""
+    grown = sorted(
+        (diff for diff in diffs if diff.size_diff > 0),
+        key=lambda diff: diff.size_diff,
+        reverse=True,
+    )
+    return [
+        {
+            "site": _site(diff.traceback[0]),
+            "size": diff.size_diff,
+            "count": diff.count_diff,
+        }
+        for diff in grown[:top]
+    ]
+
+
+def _function(key: tuple[str, int, str]) -> str:
+    filename, lineno, name = key
+    if filename == "~":  # Built-in functions
+        return name
+    return f"{_relative(filename)}:{lineno}({name})"
+
+
+def _site(frame: tracemalloc.Frame) -> str:
+    return f"{_relative(frame.filename)}:{frame.lineno}"
+
+
+def _relative(filename: str) -> str:
+    """Paths from the project root, or from site-packages for libraries."""
+    base = f"{settings.BASE_DIR}{os.sep}"
+    if filename.startswith(base):
+        return filename[len(base) :]
+    _, found, library_path = filename.rpartition(f"site-packages{os.sep}")
+    return library_path if found else filename
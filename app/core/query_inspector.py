@@ -0,0 +1,88 @@
+"""
+Detection of repeated identical SQL within one request (N+1 patterns).
+
+Queries are grouped by their SQL shape, i.e. the statement with parameter
+placeholders, so ``SELECT ... WHERE id = %s`` run once per row counts as
+one shape executed N times. Only active while RepeatedQueryMiddleware has
+bound a QueryLog to the current context, and installed by it.
+"""
+
+import traceback
+from collections import Counter
+from contextvars import ContextVar, Token
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class QueryLog:
+    """SQL shapes executed during a request, with the stack of each repeat."""
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.counts: Counter[str] = Counter()
+        self.stacks: dict[str, str] = {}
+
+    def record(self, sql: str):
+        self.counts[sql] += 1
+        if self.counts[sql] == self.threshold:
+            self.stacks[sql] = _app_stack()
+
+    def repeated(self) -> list[tuple[str, int, str]]:
+        """(sql, count, stack) for every shape that reached the threshold."""
+        return [
+            (sql, count, self.stacks[sql])
+            for sql, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+
+_current: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+
+def activate(threshold: int) -> Token:
+    return _current.set(QueryLog(threshold))
+
+
+def deactivate(token: Token) -> QueryLog:
+    query_log = _current.get()
+    _current.reset(token)
+    return query_log
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper feeding the active QueryLog."""
+    query_log = _current.get()
+    if query_log is not None:
+        query_log.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """`connection_created` receiver installing record_query once per connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """
+    Install record_query on the connections opened from now on, and on
+    those this thread has open already. Only RepeatedQueryMiddleware calls
+    it, so the wrapper stays off stacks without the middleware.
+    """
+    connection_created.connect(install_query_recorder)
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(sender=None, connection=connection)
+
+
+def _app_stack() -> str:
+    """Current stack trace, limited to frames from this project's code."""
+    app_dir = str(settings.BASE_DIR / "app")
+    frames = [
+        frame
+        for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(app_dir)
+        and "query_inspector" not in frame.filename
+    ]
+    return "".join(traceback.format_list(frames))
@@ -0,0 +1,94 @@
+"""
+Renderers: ORJSONRenderer and MessagePackRenderer.
+
+ORJSONRenderer is a faster drop-in replacement for DRF's JSONRenderer.
+
+Output is byte-for-byte what JSONRenderer produces for the data our
+serializers return: compact separators, unescaped unicode, DRF's
+formatting of datetimes (``Z`` for UTC), dates, UUIDs, decimals and lazy
+strings, and escaped U+2028/U+2029. Anything orjson cannot encode the same
+way (indented output, non-string dict keys, integers wider than 64 bits,
+ASCII-only or non-compact settings) goes through JSONRenderer.
+
+Differences: non-finite floats are rendered as ``null`` instead of raising,
+and float exponents are not zero-padded (``1e-7`` rather than ``1e-07``).
+Without orjson installed, this renderer is JSONRenderer.
+
+MessagePackRenderer encodes ``application/msgpack`` for internal clients.
+Aware datetimes use the standard Timestamp extension (type -1) and UUIDs
+a 16-byte extension of type UUID_EXT_TYPE; serializers with
+NativeTypesMixin keep both as native objects for it.
+"""
+
+import datetime
+import uuid
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+UUID_EXT_TYPE = 1
+
+# orjson writes these raw; JSONRenderer escapes them (valid JavaScript)
+_LINE_SEPARATOR = (b"\xe2\x80\xa8", b"\\u2028")
+_PARAGRAPH_SEPARATOR = (b"\xe2\x80\xa9", b"\\u2029")
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not self._orjson_compatible(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                # Dates and times go through DRF's encoder for identical output
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return ret.replace(*_LINE_SEPARATOR).replace(*_PARAGRAPH_SEPARATOR)
+
+    def _orjson_compatible(self, accepted_media_type, renderer_context) -> bool:
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    # Serializers with NativeTypesMixin keep UUIDs and datetimes native
+    native_types = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_msgpack_default, datetime=True)
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT_TYPE, obj.bytes)
+    if isinstance(obj, datetime.datetime) and obj.tzinfo is None:
+        return obj.isoformat()  # Timestamps need a timezone
+    # Same conversions as JSON (lazy strings, dates, decimals, ...)
+    return JSONEncoder().default(obj)
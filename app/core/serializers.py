@@ -0,0 +1,44 @@
+"""
+Serializer helpers shared by the apps.
+"""
+
+from rest_framework import serializers
+
+
+class NativeUUIDField(serializers.UUIDField):
+    def to_representation(self, value):
+        return value
+
+
+class NativeDateTimeField(serializers.DateTimeField):
+    def to_representation(self, value):
+        return self.enforce_timezone(value) if value else None
+
+
+NATIVE_FIELDS = {
+    serializers.UUIDField: NativeUUIDField,
+    serializers.DateTimeField: NativeDateTimeField,
+}
+
+
+def renders_native_types(context: dict) -> bool:
+    """Whether the negotiated renderer encodes UUIDs/datetimes itself."""
+    renderer = getattr(context.get("request"), "accepted_renderer", None)
+    return getattr(renderer, "native_types", False)
+
+
+class NativeTypesMixin:
+    """
+    Output UUIDs and datetimes as Python objects instead of strings when the
+    renderer encodes them natively (e.g. MessagePackRenderer), so they are
+    written in compact binary form.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if renders_native_types(self.context):
+            for name, field in fields.items():
+                native_class = NATIVE_FIELDS.get(type(field))
+                if native_class is not None:
+                    fields[name] = native_class(*field._args, **field._kwargs)
+        return fields
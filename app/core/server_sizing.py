@@ -0,0 +1,82 @@
+"""
+Size gunicorn worker pools from the CPUs actually available to the
+container (cgroup CPU quota), not from the host's core count.
+
+Used by ``gunicorn.conf.py``; importing this module does not require
+Django settings.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+# Threads per gthread worker: requests mostly wait on the DB/network
+DEFAULT_THREADS = 4
+
+
+class PoolSize(NamedTuple):
+    workers: int
+    threads: int
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> float | None:
+    """
+    CPUs allowed by the cgroup quota (v2 ``cpu.max`` or v1
+    ``cpu.cfs_quota_us``/``cpu.cfs_period_us``), or None when unlimited.
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> int:
+    """CPUs this process may use: the cgroup quota, capped by CPU affinity."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def pool_size(worker_class: str, cpus: int) -> PoolSize:
+    """
+    Default pool for a worker class:
+
+    - sync: 2 * CPUs + 1 single-threaded workers;
+    - gthread: CPUs + 1 workers with DEFAULT_THREADS threads each;
+    - uvicorn: one event-loop worker per CPU.
+    """
+    if worker_class == "sync":
+        return PoolSize(2 * cpus + 1, 1)
+    if worker_class == "gthread":
+        return PoolSize(cpus + 1, DEFAULT_THREADS)
+    if worker_class == "uvicorn":
+        return PoolSize(cpus, 1)
+    raise ValueError(
+        f"Unknown worker class {worker_class!r}; expected one of "
+        f"{', '.join(WORKER_CLASSES)}"
+    )
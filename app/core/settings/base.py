@@ -10,9 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
-from .load_env_utils import get_env_var, load_json_env_var
+from .load_env_utils import get_bool_env_var, get_env_var, load_json_env_var
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 # __file__ = app/core/settings/base.py
@@ -43,18 +44,39 @@ INSTALLED_APPS = [
     "rest_framework",
     "app.core",
     "app.accounts",
+    "app.jobs",
 ]
 
 MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Answers /healthz and /readyz before anything else (see HEALTH below)
+    "app.core.middleware.health.HealthCheckMiddleware",
+    # Binds the request id used by every log record of the request
+    "app.core.middleware.request_context.RequestContextMiddleware",
+    # Profiles staff requests asking for it (see PROFILING below)
+    "app.core.middleware.profiling.ProfilingMiddleware",
+    # Outermost, so the total timing covers the whole middleware stack
+    "app.core.middleware.server_timing.ServerTimingMiddleware",
+    "app.core.middleware.metrics.PrometheusMetricsMiddleware",
+    # Compresses what every inner middleware produced (see COMPRESSION below)
+    "app.core.middleware.compression.CompressionMiddleware",
+    # Django's security, common and clickjacking middleware, without thread
+    # hops under ASGI (see app.core.middleware.native_async)
+    "app.core.middleware.native_async.SecurityMiddleware",
+    # Session, CSRF, auth and messages are skipped for Bearer API requests
+    # (see API_FAST_PATH below)
+    "app.core.middleware.api_fast_path.LeanSessionMiddleware",
+    "app.core.middleware.native_async.CommonMiddleware",
+    "app.core.middleware.api_fast_path.LeanCsrfViewMiddleware",
+    "app.core.middleware.api_fast_path.LeanAuthenticationMiddleware",
+    "app.core.middleware.api_fast_path.LeanMessageMiddleware",
+    "app.core.middleware.native_async.XFrameOptionsMiddleware",
 ]
 
+# Django's deploy checks look for its security, clickjacking and CSRF
+# middleware by dotted path, and report the subclasses above missing. They
+# are run against the subclasses instead (see app.core.checks).
+SILENCED_SYSTEM_CHECKS = ["security.W001", "security.W002", "security.W003"]
+
 ROOT_URLCONF = "app.core.urls"
 
 TEMPLATES = [
@@ -140,6 +162,183 @@ REST_FRAMEWORK = {
         "app.jwt_auth.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
+    # orjson-based drop-ins for DRF's JSONRenderer/JSONParser (same output)
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Requests under these prefixes carrying an `Authorization: Bearer` header
+# skip the session, CSRF, auth and messages middleware.
+API_FAST_PATH = {
+    "ENABLED": True,
+    "PREFIXES": ["/api/"],
+}
+
+# Per-request phase timings (auth, user, db, serialize, render, total)
+# reported in a Server-Timing header and, with LOG, as fields of the
+# request's `app.access` record.
+# MODE: "off" | "staff" (header only for staff users) | "all"
+SERVER_TIMING = {
+    "MODE": "off",
+    "LOG": True,
+}
+
+# On-demand profiling of live workers (app.core.profiling), staff only.
+# Requests with an `X-Profile: cpu|memory` header are profiled, one at a
+# time per worker; the TOP rows of each report are logged, and the last
+# KEEP ones served by /api/profiling/ with tracemalloc snapshots.
+PROFILING = {
+    "ENABLED": get_bool_env_var("PROFILING_ENABLED"),
+    "HEADER": "X-Profile",
+    "TOP": 25,
+    "KEEP": 20,
+}
+
+# Prometheus /metrics endpoint (404 unless enabled). When ALLOWED_IPS is
+# non-empty, only those client addresses may scrape it. Set
+# PROMETHEUS_MULTIPROC_DIR to aggregate metrics across gunicorn workers.
+METRICS = {
+    "ENABLED": get_bool_env_var("METRICS_ENABLED"),
+    "ALLOWED_IPS": load_json_env_var("METRICS_ALLOWED_IPS") or ["127.0.0.1"],
+}
+
+# Response compression (app.core.middleware.compression). CODINGS is the
+# server's preference among those the client accepts; br and zstd need the
+# brotli and zstandard packages. HTML is left out: admin pages carry CSRF
+# tokens, which compression would expose to BREACH-style attacks.
+COMPRESSION = {
+    "ENABLED": get_bool_env_var("COMPRESSION_ENABLED", default=True),
+    "CODINGS": ["zstd", "br", "gzip"],
+    "LEVELS": {"zstd": 3, "br": 4, "gzip": 6},
+    "MIN_SIZE": 1024,
+    "CONTENT_TYPES": [
+        "application/json",
+        "application/msgpack",
+        "application/vnd.oai.openapi+json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+    ],
+}
+
+# Load balancer probes (app.core.middleware.health): liveness touches
+# nothing; readiness checks the database, CACHE and the JWT key, and its
+# result is reused for CACHE_TTL seconds.
+HEALTH = {
+    "LIVENESS_PATH": "/healthz",
+    "READINESS_PATH": "/readyz",
+    "CACHE": "default",
+    "CACHE_TTL": 5.0,
+}
+
+# Work done at boot by app.core.warmup (from wsgi.py/asgi.py) instead of on
+# the first request: lazy imports, URL resolvers, JWT key, translations.
+# IMPORTS lists extra modules to import eagerly.
+WARMUP = {
+    "ENABLED": get_bool_env_var("WARMUP_ENABLED", default=True),
+    "IMPORTS": [],
+}
+
+# Cache shared by every worker (throttling counters, permission sets). Uses
+# Redis when REDIS_URL is set; the local-memory default is per process.
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+        if os.getenv("REDIS_URL")
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    ),
+}
+
+# Per-user rate limits (app.core.throttling), keyed on the verified JWT
+# subject and checked before the user is loaded from the DB. RATES maps
+# "<scope>.<action>" or "<scope>" to "<requests>/<period>" (s, m, h, d).
+# Each worker syncs its counts to CACHE every SYNC_INTERVAL seconds.
+THROTTLING = {
+    "ENABLED": get_bool_env_var("THROTTLING_ENABLED", default=True),
+    "CACHE": "default",
+    "SYNC_INTERVAL": 1.0,
+    "RATES": {
+        "accounts": "300/min",
+        "accounts.list": "60/min",
+        "accounts.create": "10/min",
+        "accounts.update": "30/min",
+        "accounts.partial_update": "30/min",
+        "accounts.destroy": "5/min",
+        "accounts.changes": "60/min",
+        "jobs": "300/min",
+        "jobs.create": "10/min",
+    },
+}
+
+# Users' last activity (User.last_seen_at), buffered per process and written
+# by a background thread every FLUSH_INTERVAL seconds in batched UPDATEs
+# (app.accounts.activity). A user is written at most once per MIN_INTERVAL
+# seconds.
+ACTIVITY_TRACKING = {
+    "ENABLED": get_bool_env_var("ACTIVITY_TRACKING_ENABLED", default=True),
+    "FLUSH_INTERVAL": 10.0,
+    "MIN_INTERVAL": 60,
+    "BATCH_SIZE": 500,
+}
+
+# Change feed of users (GET /api/accounts/changes/, app.accounts.changes).
+# Changes younger than SETTLE_SECONDS are held back until concurrent
+# transactions have committed; tombstones of deleted users, and tokens, are
+# kept TOMBSTONE_DAYS.
+ACCOUNT_CHANGES = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 5,
+    "TOMBSTONE_DAYS": 30,
+}
+
+# Permission sets of staff users, cached across requests for TIMEOUT seconds
+# (app.accounts.backends) and invalidated whenever groups or permissions
+# change. Off by default without REDIS_URL: invalidating a per-process cache
+# wouldn't reach the other workers.
+AUTHENTICATION_BACKENDS = ["app.accounts.backends.CachedPermissionBackend"]
+PERMISSION_CACHE = {
+    "ENABLED": get_bool_env_var(
+        "PERMISSION_CACHE_ENABLED", default=bool(os.getenv("REDIS_URL"))
+    ),
+    "CACHE": "default",
+    "TIMEOUT": 3600,
+}
+
+# Account deletion through the API. With SOFT, users are only marked deleted
+# (hidden by User.objects) and `manage.py purge_deleted_users` deletes them,
+# with their related rows, PURGE_AFTER_DAYS later in bounded batches.
+# Until then their email and auth_id stay taken.
+ACCOUNT_DELETION = {
+    "SOFT": get_bool_env_var("ACCOUNT_SOFT_DELETE", default=True),
+    "PURGE_AFTER_DAYS": 30,
+    "PURGE_BATCH_SIZE": 200,
+    "PURGE_PAUSE": 0.5,
+}
+
+# Background jobs (app.jobs), run by `manage.py run_worker`. Failed jobs are
+# retried up to MAX_ATTEMPTS times, after BACKOFF_BASE * 2^n seconds (capped
+# at BACKOFF_MAX). A job still running after LEASE seconds is considered
+# abandoned by its worker and re-queued. Job files (e.g. exports) are written
+# to FILES_DIR. MODULES lists extra modules registering job handlers.
+JOBS = {
+    "MAX_ATTEMPTS": 3,
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 3600,
+    "LEASE": 1800,
+    "POLL_INTERVAL": 1.0,
+    "FILES_DIR": Path(os.getenv("JOBS_FILES_DIR") or BASE_DIR / ".cache" / "jobs"),
+    "MODULES": [],
 }
 
 # Supabase authentication configuration
@@ -151,12 +350,35 @@ JWT_AUTH = {
 }
 
 # Logging
+# Records are written as JSON lines by a background thread
+# (BackgroundQueueHandler), so request threads never block on stdout.
+# High-volume JWT authentication warnings are sampled per message.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "app.core.structured_logging.JSONFormatter",
+        },
+    },
+    "filters": {
+        "auth_failure_sampling": {
+            "()": "app.core.structured_logging.RateLimitFilter",
+            "rate": 10,
+            "per": 1.0,
+        },
+    },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            # A factory, not "class": Python 3.12 configures QueueHandler
+            # classes as handing records to other configured handlers
+            "()": "app.core.structured_logging.BackgroundQueueHandler",
+            "formatter": "json",
+        },
+    },
+    "loggers": {
+        "app.jwt_auth.authentication": {
+            "filters": ["auth_failure_sampling"],
         },
     },
     "root": {
@@ -1,5 +1,16 @@
+import os
+
 from .base import *  # noqa: F403
-from .base import INSTALLED_APPS, REST_FRAMEWORK
+from .base import BASE_DIR, INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, SERVER_TIMING
+
+# Report phase timings on every request during development
+SERVER_TIMING["MODE"] = "all"
+
+# Log SQL repeated within one request (likely N+1 queries), with stack traces
+MIDDLEWARE += ["app.core.middleware.query_inspector.RepeatedQueryMiddleware"]
+QUERY_INSPECTOR = {
+    "THRESHOLD": 5,
+}
 
 # Spectacular configuration for OpenAPI
 INSTALLED_APPS += [
@@ -14,3 +25,11 @@ SPECTACULAR_SETTINGS = {
     "DESCRIPTION": "API documentation for DRF backend starter",
     "VERSION": "1.0.0",
 }
+
+# /api/schema/ serves a schema generated once per code version (see
+# app.core.openapi), cached in CACHE_DIR. CODE_VERSION defaults to a hash of
+# the app's sources; set it (e.g. to the git SHA) in builds.
+OPENAPI_SCHEMA = {
+    "CACHE_DIR": BASE_DIR / ".cache" / "openapi",
+    "CODE_VERSION": os.getenv("CODE_VERSION"),
+}
@@ -13,6 +13,17 @@ def get_env_var(name: str) -> str:
     raise ValueError(f"Missing required environment variable: {name}")
 
 
+def get_bool_env_var(name: str, default: bool = False) -> bool:
+    """
+    Get an environment variable as a boolean.
+    Accepts 1/true/yes/on (case-insensitive); returns default if not set.
+    """
+    raw_value = os.getenv(name)
+    if not raw_value:
+        return default
+    return raw_value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def load_json_env_var(name: str) -> dict | None:
     """
     Try to parse an environment variable as JSON.
@@ -0,0 +1,187 @@
+"""
+Non-blocking structured (JSON lines) logging.
+
+- BackgroundQueueHandler puts records on a bounded queue; a QueueListener
+  thread formats and writes them, so request threads never block on stdout.
+- JSONFormatter writes one JSON object per line, including the request id,
+  user id and any ``extra=`` fields of the record.
+- RateLimitFilter samples high-volume messages (e.g. auth failures).
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+user_id_var: ContextVar[str | None] = ContextVar("user_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "user_id",
+    "taskName",
+}
+
+
+def bind_user_id(user_id) -> None:
+    """Attach the authenticated user's id to log records of this request."""
+    user_id_var.set(str(user_id))
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "user_id": getattr(record, "user_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+# Live handlers, so their listener threads can be restarted after a fork
+_handlers = weakref.WeakSet()
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Hand records to a background thread that writes them to a stream.
+
+    The formatter configured on this handler is used by the background
+    thread. When the queue is full, records are dropped (and counted)
+    instead of blocking the request. Pending records are flushed when the
+    handler is closed, which ``logging.shutdown()`` does at process exit.
+    """
+
+    def __init__(self, stream=None, queue_size: int = 10000):
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.dropped = 0
+        super().__init__(queue.Queue(queue_size))
+        self._start_listener()
+        _handlers.add(self)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._running = True
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Resolve the message and capture request context on the calling
+        thread; JSON formatting is left to the background thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = request_id_var.get()
+        record.user_id = user_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until every queued record has been written."""
+        if self._running:
+            self.queue.join()
+        self._flush_target()
+
+    def close(self):
+        if self._running:
+            self._running = False
+            self.listener.stop()  # writes the remaining records first
+        self._flush_target()
+        super().close()
+
+    def _flush_target(self):
+        try:
+            self.target.flush()
+        except (OSError, ValueError):
+            pass  # nosec B110 - stream already closed at interpreter shutdown
+
+    def _after_fork_in_child(self):
+        # The listener thread does not survive fork (e.g. gunicorn --preload),
+        # and the queue's locks may have been held: start fresh.
+        self.queue = queue.Queue(self.queue_size)
+        self._start_listener()
+
+
+def _restart_listeners_after_fork():
+    for handler in list(_handlers):
+        handler._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `rate` records per `per` seconds for each message
+    template (warnings and below); errors are never dropped. The number of
+    dropped records is reported on the next record let through, as the
+    ``suppressed`` field.
+    """
+
+    def __init__(self, rate: int = 10, per: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self._windows: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(str(record.msg), [now, 0, 0])
+            if now - window[0] >= self.per:
+                window[0], window[1] = now, 0
+            if window[1] >= self.rate:
+                window[2] += 1
+                return False
+            window[1] += 1
+            if window[2]:
+                record.suppressed, window[2] = window[2], 0
+        return True
+
+
+@atexit.register
+def _flush_on_exit():
+    """Make sure queued records are written even if logging.shutdown is skipped."""
+    for handler in list(_handlers):
+        handler.close()
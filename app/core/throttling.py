@@ -0,0 +1,290 @@
+"""
+Per-user rate limiting, checked before authentication.
+
+Requests are keyed on the verified JWT ``sub`` claim, so a rejected
+request costs a signature check but no DB work: the throttle runs before
+the user is loaded. Session-authenticated requests (browsable API, admin)
+are keyed on the session's user id, and the others on the client IP.
+
+Counts use a sliding window (the previous fixed window weighted by how
+much of it still overlaps, plus the current one). Each process counts its
+own hits and syncs them to the shared cache every
+THROTTLING["SYNC_INTERVAL"] seconds, or sooner once it holds 5% of a
+limit, so most requests need no cache round trip. Between syncs every
+process may let a few extra requests through. The cache round trips of a
+sync happen outside the process's lock, and one thread at a time syncs a
+key: the others go on with the counts they have. When the cache fails,
+the process goes on with its own counts until the next sync (fail open).
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.throttling import BaseThrottle
+
+from app.core import metrics
+from app.jwt_auth.authentication import bearer_token, decode_request_token
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class RateLimitStatus(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the current window ends
+    retry_after: int | None
+
+
+@dataclass
+class _Window:
+    number: int
+    current: int  # hits of all processes, as of the last sync
+    previous: int
+    pending: int = 0  # this process's hits not yet synced
+    synced_at: float = 0.0
+    syncing: bool = False
+    retry_at: float = 0.0  # after a failed sync, none before this
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    ``"<requests>/<period>"`` → (requests, seconds). The period is s, m, h
+    or d, or any word starting with one (e.g. "100/min").
+    """
+    num, period = rate.split("/")
+    return int(num), PERIODS[period.strip()[0]]
+
+
+class SlidingWindowCounter:
+    """Sliding-window hit counter, shared between processes through a cache."""
+
+    def __init__(self):
+        self._windows: dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: int) -> RateLimitStatus:
+        """Count a hit for `key`, unless it would go over `limit` per `period`."""
+        now = time.time()
+        number, offset = divmod(now, period)
+        number = int(number)
+        overlap = 1 - offset / period
+
+        with self._lock:
+            window = self._windows.get(key)
+            stale = (
+                window is None
+                or window.number != number
+                or (
+                    now >= window.retry_at
+                    and (
+                        now - window.synced_at >= settings.THROTTLING["SYNC_INTERVAL"]
+                        or window.pending >= max(limit // 20, 1)
+                    )
+                )
+            )
+            # Another thread syncing the window is not waited for
+            sync = stale and not (
+                window is not None and window.syncing and window.number == number
+            )
+            # Hits are answered from this process's counts alone
+            metrics.record_cache_lookup("throttle", hit=not sync)
+            if not sync:
+                return self._count(window, limit, period, offset, overlap)
+            flush = self._start_sync(key, window, number)
+
+        try:
+            counts = self._sync(key, flush, number, period)
+        except Exception:
+            logger.exception("Rate limit sync failed, using local counts: %s", key)
+            with self._lock:
+                window = self._windows.get(key)
+                if window is None or window.number != number:
+                    window = _Window(number, 0, 0)
+                elif flush is not None and flush[0] == number:
+                    # Flushed again by the next sync
+                    window.current -= flush[1]
+                    window.pending += flush[1]
+                window.syncing = False
+                window.retry_at = now + settings.THROTTLING["SYNC_INTERVAL"]
+                return self._count(window, limit, period, offset, overlap)
+
+        with self._lock:
+            latest = self._windows.get(key)
+            window = _Window(number, *counts, synced_at=now)
+            if latest is not None and latest.number == number:
+                # Hits counted by other threads during the sync
+                window.pending = latest.pending
+            if latest is None or latest.number <= number:
+                self._windows[key] = window
+            return self._count(window, limit, period, offset, overlap)
+
+    def clear(self):
+        """Forget this process's state (not the shared counts)."""
+        with self._lock:
+            self._windows.clear()
+
+    def _start_sync(self, key: str, window: _Window | None, number: int):
+        """
+        Mark `key` as syncing (under the lock), and take the pending hits to
+        flush; this process keeps counting them until the sync is done.
+        """
+        flush = None
+        if window is not None and window.pending:
+            flush = (window.number, window.pending)
+            window.current += window.pending
+            window.pending = 0
+        if window is None or window.number != number:
+            previous = window.current if window and window.number == number - 1 else 0
+            window = self._windows[key] = _Window(number, 0, previous)
+        window.syncing = True
+        return flush
+
+    def _count(self, window, limit, period, offset, overlap) -> RateLimitStatus:
+        """Count a hit in `window`, unless it would go over `limit` (locked)."""
+        current = window.current + window.pending
+        count = window.previous * overlap + current
+        reset = max(math.ceil(period - offset), 1)
+
+        if count + 1 > limit:
+            return RateLimitStatus(
+                False,
+                limit,
+                0,
+                reset,
+                self._retry_after(window, limit, period, offset),
+            )
+
+        window.pending += 1
+        remaining = max(math.floor(limit - count - 1), 0)
+        return RateLimitStatus(True, limit, remaining, reset, None)
+
+    def _sync(
+        self, key: str, flush: tuple[int, int] | None, number: int, period: int
+    ) -> tuple[int, int]:
+        """Add the flushed hits to the shared counts, and read them back."""
+        cache = caches[settings.THROTTLING["CACHE"]]
+        if flush is not None:
+            flush_number, hits = flush
+            self._add(cache, f"throttle:{key}:{flush_number}", hits, period)
+
+        current_key = f"throttle:{key}:{number}"
+        previous_key = f"throttle:{key}:{number - 1}"
+        counts = cache.get_many([current_key, previous_key])
+        return counts.get(current_key, 0), counts.get(previous_key, 0)
+
+    @staticmethod
+    def _add(cache, cache_key: str, hits: int, period: int):
+        # Kept for two windows, so it still counts as the previous one
+        cache.add(cache_key, 0, timeout=2 * period)
+        try:
+            cache.incr(cache_key, hits)
+        except ValueError:  # expired in between
+            cache.set(cache_key, hits, timeout=2 * period)
+
+    @staticmethod
+    def _retry_after(window: _Window, limit: int, period: int, offset: float) -> int:
+        """Seconds until a request would be allowed, as of the current counts."""
+        current = window.current + window.pending
+        if current + 1 > limit or not window.previous:
+            return max(math.ceil(period - offset), 1)
+        # previous * (1 - t / period) + current + 1 <= limit
+        allowed_at = period * (1 - (limit - current - 1) / window.previous)
+        return max(math.ceil(allowed_at - offset), 1)
+
+
+counter = SlidingWindowCounter()
+
+
+class JWTSubjectRateThrottle(BaseThrottle):
+    """
+    Rate limit per JWT subject and view action.
+
+    Rates come from THROTTLING["RATES"], looked up as
+    ``"<throttle_scope>.<action>"`` then ``"<throttle_scope>"`` (the view's
+    `throttle_scope`); views without a rate are not throttled. Use with
+    ThrottleBeforeAuthenticationMixin so it runs before authentication.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        config = settings.THROTTLING
+        if not config["ENABLED"]:
+            return True
+        rate_name = self.get_rate_name(view, config["RATES"])
+        if rate_name is None:
+            return True
+
+        limit, period = parse_rate(config["RATES"][rate_name])
+        key = f"{rate_name}:{self.get_ident(request)}"
+        self.status = request.rate_limit = counter.hit(key, limit, period)
+        return self.status.allowed
+
+    def wait(self) -> int | None:
+        return self.status.retry_after
+
+    @staticmethod
+    def get_rate_name(view, rates: dict) -> str | None:
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            return None
+        action = getattr(view, "action", None)
+        if action and f"{scope}.{action}" in rates:
+            return f"{scope}.{action}"
+        return scope if scope in rates else None
+
+    def get_ident(self, request) -> str:
+        """
+        `sub:<JWT subject>`, `user:<id>` for a logged-in session, or
+        `ip:<client address>` otherwise.
+        """
+        token = bearer_token(request)
+        if token is not None:
+            try:
+                subject = decode_request_token(request, token).get("sub")
+            except AuthenticationFailed:
+                subject = None  # authentication answers 401 after the check
+            if subject:
+                return f"sub:{subject}"
+        # Skipped for bearer API requests (see app.core.middleware.api_fast_path)
+        session = getattr(request, "session", None)
+        if session is not None and (user_id := session.get(SESSION_KEY)):
+            return f"user:{user_id}"
+        return f"ip:{super().get_ident(request)}"
+
+
+class ThrottleBeforeAuthenticationMixin:
+    """
+    Check the view's throttles before authenticating (which loads the user
+    from the DB), and report the rate limit in `RateLimit-*` headers.
+    Throttled responses carry `Retry-After`.
+    """
+
+    def perform_authentication(self, request):
+        self.check_throttles(request)
+        super().perform_authentication(request)
+
+    def check_throttles(self, request):
+        # DRF checks throttles again after the permissions
+        if getattr(request, "_throttles_checked", False):
+            return
+        request._throttles_checked = True
+        super().check_throttles(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        status = getattr(request, "rate_limit", None)
+        if status is not None:
+            response["RateLimit-Limit"] = str(status.limit)
+            response["RateLimit-Remaining"] = str(status.remaining)
+            response["RateLimit-Reset"] = str(status.reset)
+        return response
@@ -0,0 +1,118 @@
+"""
+Per-request phase timings: auth decode, user fetch, DB queries, serializer
+and renderer.
+
+Timings are only collected while ServerTimingMiddleware has bound a
+RequestTimings to the current context. Without one, every hook is a no-op,
+so instrumented code paths cost next to nothing when timing is off.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+
+class RequestTimings:
+    """Phase durations and DB statistics for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.phases: dict[str, float] = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def as_dict(self) -> dict:
+        """Durations in milliseconds, suitable for structured log fields."""
+        data = {f"{name}_ms": _ms(seconds) for name, seconds in self.phases.items()}
+        data["db_queries"] = self.db_queries
+        data["db_ms"] = _ms(self.db_time)
+        data["total_ms"] = _ms(self.total)
+        return data
+
+    def server_timing_header(self) -> str:
+        """Value for the ``Server-Timing`` response header."""
+        metrics = [f"{name};dur={_ms(sec)}" for name, sec in self.phases.items()]
+        metrics.append(f'db;dur={_ms(self.db_time)};desc="{self.db_queries} queries"')
+        metrics.append(f"total;dur={_ms(self.total)}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def current() -> RequestTimings | None:
+    """The timings of the request being handled, if timing is active."""
+    return _current.get()
+
+
+def activate() -> Token:
+    return _current.set(RequestTimings())
+
+
+def deactivate(token: Token) -> RequestTimings:
+    timings = _current.get()
+    timings.finished = time.perf_counter()
+    _current.reset(token)
+    return timings
+
+
+@contextmanager
+def phase(name: str):
+    """Time the enclosed block as `name` (durations of a phase add up)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and DB time."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.db_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    `connection_created` receiver installing record_query on every
+    connection, including the per-thread ones used by sync views under ASGI.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedDataMixin:
+    """Serializer mixin timing ``.data`` as the ``serialize`` phase."""
+
+    @property
+    def data(self):
+        with phase("serialize"):
+            return super().data
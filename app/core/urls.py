@@ -19,21 +19,32 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+from .views import ProfilingViewSet, metrics_view, openapi_schema_view
+
 urlpatterns = [
+    path("metrics", metrics_view, name="metrics"),
     path("admin/", admin.site.urls),
     path("api/", include("app.accounts.urls")),
+    path("api/", include("app.jobs.urls")),
+    path(
+        "api/profiling/",
+        ProfilingViewSet.as_view({"get": "list"}),
+        name="profiling",
+    ),
+    path(
+        "api/profiling/snapshots/",
+        ProfilingViewSet.as_view({"post": "snapshot", "delete": "stop"}),
+        name="profiling-snapshots",
+    ),
 ]
 
 # OpenAPI: Spectacular configuration
 if settings.DEBUG:
-    from drf_spectacular.views import (
-        SpectacularAPIView,
-        SpectacularRedocView,
-        SpectacularSwaggerView,
-    )
+    from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 
     urlpatterns += [
-        path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+        # Precomputed schema; `manage.py spectacular` still generates it ad hoc
+        path("api/schema/", openapi_schema_view, name="schema"),
         path(
             "api/docs/swagger/",
             SpectacularSwaggerView.as_view(url_name="schema"),
@@ -0,0 +1,95 @@
+import re
+
+from django.conf import settings
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotModified,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+from rest_framework import permissions, status, viewsets
+from rest_framework.response import Response
+
+from . import metrics, openapi, profiling
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Answers 404 unless METRICS["ENABLED"], and
+    403 to clients outside METRICS["ALLOWED_IPS"] (when the list is set).
+    """
+    config = settings.METRICS
+    if not config["ENABLED"]:
+        raise Http404
+    allowed_ips = config["ALLOWED_IPS"]
+    if allowed_ips and request.META.get("REMOTE_ADDR") not in allowed_ips:
+        return HttpResponseForbidden()
+
+    payload, content_type = metrics.render_latest()
+    return HttpResponse(payload, content_type=content_type)
+
+
+@require_safe
+def openapi_schema_view(request):
+    """
+    OpenAPI schema, generated once per code version (see app.core.openapi).
+    Served with a strong ETag, precompressed with gzip when accepted.
+    """
+    document = openapi.get_schema()
+    # Weak comparison: CompressionMiddleware weakens the ETag when it compresses
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if document.etag in {etag.removeprefix("W/") for etag in etags}:
+        response = HttpResponseNotModified()
+    elif ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+        response = HttpResponse(
+            document.gzipped, content_type="application/vnd.oai.openapi+json"
+        )
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(
+            document.content, content_type="application/vnd.oai.openapi+json"
+        )
+
+    response["ETag"] = document.etag
+    # Clients (Swagger UI, Redoc) revalidate, getting a 304 while unchanged
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+class ProfilingViewSet(viewsets.ViewSet):
+    """
+    Profiling of the worker answering (see app.core.profiling). Answers 404
+    unless PROFILING["ENABLED"]; staff only.
+
+    Available endpoints:
+    - GET    /profiling/            → Recent request profiles, allocations by phase
+    - POST   /profiling/snapshots/  → tracemalloc snapshot, diffed with the last
+    - DELETE /profiling/snapshots/  → Stop tracemalloc, drop the snapshot
+
+    Each worker has its own reports and snapshot: responses carry its `pid`,
+    and a diff is only against a snapshot of the same worker.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    schema = None  # Operational, not part of the API
+
+    def initial(self, request, *args, **kwargs):
+        if not settings.PROFILING["ENABLED"]:
+            raise Http404
+        super().initial(request, *args, **kwargs)
+
+    def list(self, request):
+        return Response(profiling.worker_status())
+
+    def snapshot(self, request):
+        return Response(profiling.take_snapshot(), status=status.HTTP_201_CREATED)
+
+    def stop(self, request):
+        profiling.stop_tracing()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,100 @@
+"""
+Worker warm-up: do the work a cold process would otherwise do on its first
+request (lazy imports, URL resolver population, JWT key parsing,
+translation catalogs) right after Django setup.
+
+``warm_up()`` is called from ``app.core.wsgi``/``app.core.asgi``, so with
+gunicorn ``--preload`` it runs once in the master and the result is shared
+with every forked worker. It opens no database connection unless
+``connect_db=True``: connections must not be shared across fork, so they
+are opened per worker, after the fork.
+"""
+
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# DRF settings that are imported lazily, on first access
+DRF_LAZY_SETTINGS = (
+    "DEFAULT_RENDERER_CLASSES",
+    "DEFAULT_PARSER_CLASSES",
+    "DEFAULT_AUTHENTICATION_CLASSES",
+    "DEFAULT_PERMISSION_CLASSES",
+    "DEFAULT_THROTTLE_CLASSES",
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+    "DEFAULT_PAGINATION_CLASS",
+    "DEFAULT_FILTER_BACKENDS",
+    "DEFAULT_SCHEMA_CLASS",
+    "EXCEPTION_HANDLER",
+)
+
+
+def warm_up(connect_db: bool = False) -> dict[str, float]:
+    """
+    Run every warm-up step; returns the duration of each step (ms).
+    A failing step is logged and skipped, it never prevents the boot.
+    """
+    steps = [
+        ("imports", _import_lazy_modules),
+        ("urls", _load_url_resolvers),
+        ("jwt_key", _load_jwt_key),
+        ("translations", _load_translations),
+    ]
+    if connect_db:
+        steps.append(("db", _connect_databases))
+
+    durations = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %r failed.", name)
+        durations[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    logger.info("Worker warm-up done.", extra={"warmup_ms": durations})
+    return durations
+
+
+def _import_lazy_modules():
+    from django.conf import settings
+    from rest_framework.settings import api_settings
+
+    for name in DRF_LAZY_SETTINGS:
+        getattr(api_settings, name)
+    for module in settings.WARMUP["IMPORTS"]:
+        importlib.import_module(module)
+
+
+def _load_url_resolvers():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018  (imports every view and populates lookups)
+
+
+def _load_jwt_key():
+    from django.conf import settings
+
+    from app.jwt_auth.authentication import get_es256_public_key
+
+    if settings.JWT_AUTH.get("ES256_PUBLIC_JWK"):
+        get_es256_public_key()
+
+
+def _load_translations():
+    from django.conf import settings
+    from django.utils import translation
+
+    if settings.USE_I18N:
+        with translation.override(settings.LANGUAGE_CODE):
+            translation.gettext("Authentication credentials were not provided.")
+
+
+def _connect_databases():
+    from django.db import connections
+
+    for connection in connections.all():
+        connection.ensure_connection()
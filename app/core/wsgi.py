@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
+from app.core.warmup import warm_up
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.core.settings.prod")
 
 application = get_wsgi_application()
+
+# Pay first-request costs at boot (once in the master with --preload)
+if settings.WARMUP["ENABLED"]:
+    warm_up()
@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["name", "status", "attempts", "created_at", "finished_at"]
+    list_filter = ["status", "name"]
+    list_select_related = False
+    raw_id_fields = ["created_by"]
+    readonly_fields = [
+        "status",
+        "attempts",
+        "locked_by",
+        "locked_at",
+        "result",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    ]
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "app.jobs"
+
+    def ready(self):
+        from importlib import import_module
+
+        from django.conf import settings
+        from django.utils.module_loading import autodiscover_modules
+
+        # Registers the job handlers (app.jobs.registry.job)
+        autodiscover_modules("jobs")
+        for module in settings.JOBS["MODULES"]:
+            import_module(module)
@@ -0,0 +1,51 @@
+"""
+Management command to run a background job worker
+"""
+
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs. Start several workers (processes or "
+        "hosts) to run more jobs in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is ready, instead of waiting for more",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            help="Exit after running this many jobs (e.g. to recycle the process)",
+        )
+        parser.add_argument("--name", help="Worker name (default: host:pid)")
+
+    def handle(self, *args, **options):
+        if options["max_jobs"] is not None and options["max_jobs"] < 1:
+            raise CommandError("--max-jobs must be a positive number")
+
+        worker = Worker(options["name"])
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping after the current job...")
+            worker.stop()
+
+        # Finish the running job on SIGTERM (e.g. a deployment)
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker {worker.name} started.")
+        worker.run(burst=options["burst"], max_jobs=options["max_jobs"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Worker {worker.name} stopped after {worker.processed} job(s)"
+            )
+        )
@@ -0,0 +1,82 @@
+"""
+Job handlers and enqueueing.
+
+Handlers are registered with the `job` decorator in a ``jobs`` module of an
+installed app (or a module listed in JOBS["MODULES"]), and receive their
+Job; what they return is stored as the job's JSON result::
+
+    @job("accounts.deactivate", payload_serializer=DeactivatePayload)
+    def deactivate_accounts(job):
+        ...
+        return {"deactivated": count}
+"""
+
+import datetime
+from collections.abc import Callable
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job can't help."""
+
+
+class JobType(NamedTuple):
+    name: str
+    func: Callable[[Job], object]
+    staff_only: bool
+    max_attempts: int | None
+    payload_serializer: type | None  # a DRF Serializer validating the payload
+
+
+_registry: dict[str, JobType] = {}
+
+
+def job(
+    name: str,
+    *,
+    staff_only: bool = True,
+    max_attempts: int | None = None,
+    payload_serializer: type | None = None,
+):
+    """Register the decorated function as the handler of `name` jobs."""
+
+    def register(func):
+        _registry[name] = JobType(
+            name, func, staff_only, max_attempts, payload_serializer
+        )
+        return func
+
+    return register
+
+
+def get_job_type(name: str) -> JobType | None:
+    return _registry.get(name)
+
+
+def job_types() -> list[JobType]:
+    return sorted(_registry.values())
+
+
+def enqueue(
+    name: str,
+    payload: dict | None = None,
+    *,
+    user=None,
+    run_after: datetime.datetime | None = None,
+) -> Job:
+    """Queue a `name` job; a worker runs it once `run_after` has passed."""
+    job_type = _registry.get(name)
+    if job_type is None:
+        raise LookupError(f"No job handler registered for {name!r}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+        max_attempts=job_type.max_attempts or settings.JOBS["MAX_ATTEMPTS"],
+        run_after=run_after or timezone.now(),
+    )
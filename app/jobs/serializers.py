@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from .models import Job
+from .registry import get_job_type
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "name",
+            "payload",
+            "status",
+            "attempts",
+            "max_attempts",
+            "error",
+            "created_at",
+            "run_after",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [f for f in fields if f not in ("name", "payload")]
+
+    def validate_name(self, name):
+        job_type = get_job_type(name)
+        if job_type is None:
+            raise serializers.ValidationError(f"Unknown job {name!r}.")
+        request = self.context.get("request")
+        if job_type.staff_only and not (request and request.user.is_staff):
+            raise serializers.ValidationError(f"Only staff can run {name!r} jobs.")
+        return name
+
+    def validate(self, attrs):
+        """Validate the payload with the job's payload serializer, if any."""
+        job_type = get_job_type(attrs["name"])
+        if job_type.payload_serializer is not None:
+            payload = job_type.payload_serializer(data=attrs.get("payload", {}))
+            if not payload.is_valid():
+                raise serializers.ValidationError({"payload": payload.errors})
+            attrs["payload"] = payload.validated_data
+        return attrs
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from app.core.throttling import (
+    JWTSubjectRateThrottle,
+    ThrottleBeforeAuthenticationMixin,
+)
+
+from .models import Job
+from .registry import enqueue
+from .serializers import JobSerializer
+
+
+class JobPagination(CursorPagination):
+    ordering = "-created_at"
+    page_size = 50
+
+
+class JobViewSet(
+    ThrottleBeforeAuthenticationMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    API endpoints for background jobs.
+
+    Available endpoints:
+    - POST /jobs/               → Queue a job ({"name", "payload"}); 202
+    - GET  /jobs/               → List jobs (staff: all; others: their own)
+    - GET  /jobs/{id}/          → Poll a job's status
+    - GET  /jobs/{id}/result/   → The result of a succeeded job (409 before)
+    - GET  /jobs/{id}/file/     → Download the file a succeeded job produced
+    """
+
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [JWTSubjectRateThrottle]
+    throttle_scope = "jobs"
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = (
+            Job.objects.all() if user.is_staff else Job.objects.filter(created_by=user)
+        )
+        # Results can be large; only the result endpoints load them
+        if self.action not in ("result", "file"):
+            queryset = queryset.defer("result")
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue(
+            serializer.validated_data["name"],
+            serializer.validated_data.get("payload"),
+            user=request.user,
+        )
+        location = self.reverse_action("detail", args=[job.pk])
+        return Response(
+            self.get_serializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": location},
+        )
+
+    @action(detail=True, methods=["get"])
+    def result(self, request, pk=None):
+        job = self.get_object()
+        if job.status != Job.Status.SUCCEEDED:
+            return Response(
+                {"detail": f"The job is {job.status}.", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(job.result)
+
+    @action(detail=True, methods=["get"])
+    def file(self, request, pk=None):
+        job = self.get_object()
+        name = (job.result or {}).get("file") if isinstance(job.result, dict) else None
+        if job.status != Job.Status.SUCCEEDED or not name:
+            raise Http404
+        files_dir = Path(settings.JOBS["FILES_DIR"]).resolve()
+        path = (files_dir / name).resolve()
+        if path.parent != files_dir or not path.is_file():
+            raise Http404
+        return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
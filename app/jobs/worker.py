@@ -0,0 +1,194 @@
+"""
+Job worker: claims queued jobs and runs them, one at a time.
+
+Any number of workers (processes or hosts) can share the queue. On
+databases with ``SELECT ... FOR UPDATE SKIP LOCKED`` (PostgreSQL) each
+claim locks one queued row that no other worker holds; elsewhere (SQLite)
+a worker claims a candidate with a conditional UPDATE, which only one
+worker can win.
+"""
+
+import datetime
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import PermanentJobError, get_job_type
+
+logger = logging.getLogger(__name__)
+
+# Rows a worker tries to claim in turn, without SKIP LOCKED
+CLAIM_CANDIDATES = 10
+
+MAX_ERROR_LENGTH = 4000
+
+
+def backoff(attempts: int) -> float:
+    """Seconds before retrying after `attempts` failures: exponential, jittered."""
+    config = settings.JOBS
+    delay = min(config["BACKOFF_BASE"] * 2 ** (attempts - 1), config["BACKOFF_MAX"])
+    return delay * random.uniform(0.5, 1.0)  # nosec B311 - not security related
+
+
+class Worker:
+    def __init__(self, name: str | None = None):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self._stop = threading.Event()
+
+    def run(self, *, burst: bool = False, max_jobs: int | None = None):
+        """
+        Run jobs until stopped; with `burst`, until no job is ready. Jobs
+        whose worker died are re-queued every JOBS["LEASE"] / 10 seconds.
+        """
+        config = settings.JOBS
+        next_recovery = 0.0
+        while not self._stop.is_set():
+            if max_jobs is not None and self.processed >= max_jobs:
+                break
+            close_old_connections()
+            try:
+                if timezone.now().timestamp() >= next_recovery:
+                    requeue_abandoned()
+                    next_recovery = timezone.now().timestamp() + config["LEASE"] / 10
+                job = self.claim()
+            except DatabaseError:
+                logger.exception("Could not claim a job.")
+                connection.close()
+                job = None
+            else:
+                if job is None and burst:
+                    break
+            if job is None:
+                self._stop.wait(config["POLL_INTERVAL"])
+                continue
+            try:
+                self.execute(job)
+            except DatabaseError:
+                # Left running: retried once its lease expires
+                logger.exception("Could not record the outcome of job %s.", job.pk)
+                connection.close()
+            self.processed += 1
+
+    def stop(self):
+        """Stop after the current job."""
+        self._stop.set()
+
+    def claim(self) -> Job | None:
+        """Mark the next ready job as running by this worker, and return it."""
+        now = timezone.now()
+        ready = Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=now)
+        claimed = {
+            "status": Job.Status.RUNNING,
+            "locked_by": self.name,
+            "locked_at": now,
+            "started_at": now,
+        }
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                job = (
+                    ready.select_for_update(skip_locked=True)
+                    .order_by("run_after")
+                    .first()
+                )
+                if job is None:
+                    return None
+                Job.objects.filter(pk=job.pk).update(
+                    attempts=F("attempts") + 1, **claimed
+                )
+        else:
+            candidates = ready.order_by("run_after").values_list("pk", flat=True)
+            for pk in candidates[:CLAIM_CANDIDATES]:
+                if Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(
+                    attempts=F("attempts") + 1, **claimed
+                ):
+                    break
+            else:
+                return None
+            job = Job(pk=pk)
+
+        job.refresh_from_db()
+        return job
+
+    def execute(self, job: Job):
+        """Run the job's handler and record its result, or its failure."""
+        logger.info("Running job %s (%s), attempt %d.", job.pk, job.name, job.attempts)
+        job_type = get_job_type(job.name)
+        try:
+            if job_type is None:
+                raise PermanentJobError(f"No job handler registered for {job.name!r}")
+            result = job_type.func(job)
+        except Exception as exc:
+            self._failed(job, exc)
+        else:
+            self._finish(
+                job,
+                status=Job.Status.SUCCEEDED,
+                result=result,
+                error="",
+                finished_at=timezone.now(),
+            )
+            logger.info("Job %s (%s) succeeded.", job.pk, job.name)
+
+    def _failed(self, job: Job, exc: Exception):
+        error = "".join(traceback.format_exception(exc))[-MAX_ERROR_LENGTH:]
+        if isinstance(exc, PermanentJobError) or job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) failed: %s", job.pk, job.name, exc)
+            self._finish(
+                job, status=Job.Status.FAILED, error=error, finished_at=timezone.now()
+            )
+            return
+
+        delay = backoff(job.attempts)
+        logger.warning(
+            "Job %s (%s) failed, retrying in %.0fs: %s", job.pk, job.name, delay, exc
+        )
+        self._finish(
+            job,
+            status=Job.Status.QUEUED,
+            error=error,
+            run_after=timezone.now() + datetime.timedelta(seconds=delay),
+        )
+
+    def _finish(self, job: Job, **fields):
+        # A job re-queued by requeue_abandoned() belongs to its next worker
+        updated = Job.objects.filter(
+            pk=job.pk, status=Job.Status.RUNNING, locked_by=self.name
+        ).update(locked_by="", locked_at=None, **fields)
+        if not updated:
+            logger.warning("Job %s was taken over by another worker.", job.pk)
+        for field, value in fields.items():
+            setattr(job, field, value)
+
+
+def requeue_abandoned() -> int:
+    """
+    Re-queue running jobs locked longer than JOBS["LEASE"] seconds (their
+    worker died), or fail them when out of attempts.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.JOBS["LEASE"])
+    abandoned = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff)
+    error = "Abandoned by its worker (lease expired)."
+    failed = abandoned.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        locked_by="",
+        locked_at=None,
+        error=error,
+        finished_at=timezone.now(),
+    )
+    requeued = abandoned.update(
+        status=Job.Status.QUEUED, locked_by="", locked_at=None, error=error
+    )
+    if failed or requeued:
+        logger.warning("Re-queued %d and failed %d abandoned job(s).", requeued, failed)
+    return failed + requeued
@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import uuid
@@ -5,8 +6,13 @@ import uuid
 import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from jwt.algorithms import ECAlgorithm
 from rest_framework import authentication, exceptions
 
+from app.accounts import activity
+from app.core import metrics, profiling, timing
+from app.core.structured_logging import bind_user_id
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
@@ -19,27 +25,21 @@ class JWTAuthentication(authentication.BaseAuthentication):
     keyword = "Bearer"
 
     def authenticate(self, request):
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith(f"{self.keyword} "):
+        token = bearer_token(request)
+        if token is None:
             return None  # DRF: no credentials → let other authenticators run
 
-        token = auth_header[len(self.keyword) :].strip()
         logger.debug("Authenticating JWT...")
 
-        # Decode the token and validate structure
-        try:
-            payload = decode_jwt_auth_jwt(token)
-        except exceptions.AuthenticationFailed:
-            raise
-        except Exception as exc:
-            logger.exception("Unexpected JWT decoding failure.")
-            raise exceptions.AuthenticationFailed("Invalid or expired token.") from exc
+        # Decode the token and validate structure (at most once per request)
+        payload = decode_request_token(request, token)
 
         # Extract user ID
         user_id = payload.get("sub")
         user_email = payload.get("email")
 
         if not user_id:
+            metrics.record_jwt_auth("invalid")
             raise exceptions.AuthenticationFailed("Token missing 'sub' claim.")
 
         # Convert to UUID
@@ -47,23 +47,67 @@ class JWTAuthentication(authentication.BaseAuthentication):
             user_uuid = uuid.UUID(str(user_id))
         except Exception as e:
             logger.warning("Invalid UUID format in token: %s", user_id)
+            metrics.record_jwt_auth("invalid")
             raise exceptions.AuthenticationFailed("Invalid user ID in token.") from e
 
         # Look up the local user
         try:
-            user = User.objects.get(auth_id=user_uuid)
+            with timing.phase("user"), profiling.phase("jwt.user"):
+                user = User.objects.get(auth_id=user_uuid)
         except User.DoesNotExist as udne:
             logger.warning(
                 "User %s (%s) in JWT not found in local DB.",
                 user_email,
                 user_uuid,
             )
+            metrics.record_jwt_auth("unknown_user")
             raise exceptions.AuthenticationFailed("User is not registered.") from udne
 
+        bind_user_id(user.id)
+        activity.record(user.id)
         logger.debug("User authenticated: %s", user.email)
+        metrics.record_jwt_auth("ok")
         return (user, None)
 
 
+def bearer_token(request) -> str | None:
+    """The token of an `Authorization: Bearer` header, or None."""
+    auth_header = request.headers.get("Authorization", "")
+    keyword = JWTAuthentication.keyword
+    if not auth_header.startswith(f"{keyword} "):
+        return None
+    return auth_header[len(keyword) :].strip()
+
+
+def decode_request_token(request, token: str) -> dict:
+    """
+    Decode the request's token, reusing the result (or the failure) of an
+    earlier call for the same request, e.g. by the throttle, which runs
+    before authentication (see app.core.throttling).
+    """
+    cached = getattr(request, "_jwt_decoded", None)
+    if cached is not None and cached[0] == token:
+        if isinstance(cached[1], exceptions.AuthenticationFailed):
+            raise cached[1]
+        return cached[1]
+
+    try:
+        with timing.phase("auth"), profiling.phase("jwt.decode"):
+            payload = decode_jwt_auth_jwt(token)
+    except exceptions.AuthenticationFailed as exc:
+        request._jwt_decoded = (token, exc)
+        raise
+    except Exception as exc:
+        logger.exception("Unexpected JWT decoding failure.")
+        metrics.record_jwt_auth("invalid")
+        failure = exceptions.AuthenticationFailed("Invalid or expired token.")
+        request._jwt_decoded = (token, failure)
+        raise failure from exc
+
+    request._jwt_decoded = (token, payload)
+    return payload
+
+
 def decode_jwt_auth_jwt(token: str) -> dict:
     """
     Decode a JWT using the correct algorithm (ES256).
@@ -74,15 +118,19 @@ def decode_jwt_auth_jwt(token: str) -> dict:
         alg = header.get("alg")
 
         if alg != "ES256":
+            metrics.record_jwt_auth("invalid")
             raise exceptions.AuthenticationFailed(f"Unsupported JWT algorithm: {alg}")
 
         return _decode_es256(token)
 
     except jwt.ExpiredSignatureError as exc:
+        metrics.record_jwt_auth("expired")
         raise exceptions.AuthenticationFailed("Token has expired.") from exc
     except jwt.InvalidAudienceError as exc:
+        metrics.record_jwt_auth("bad_audience")
         raise exceptions.AuthenticationFailed("Invalid token audience.") from exc
     except jwt.InvalidTokenError as exc:
+        metrics.record_jwt_auth("invalid")
         raise exceptions.AuthenticationFailed("Invalid token.") from exc
 
 
@@ -92,21 +140,30 @@ def _decode_es256(token: str) -> dict:
     """
     logger.debug("Decoding ES256 token...")
 
+    return jwt.decode(
+        token,
+        get_es256_public_key(),
+        algorithms=["ES256"],
+        audience="authenticated",
+    )
+
+
+def get_es256_public_key():
+    """
+    Public key of the configured ES256 JWK. The JWK is parsed once and
+    reused, instead of on every request (see also app.core.warmup).
+    """
     jwk = settings.JWT_AUTH.get("ES256_PUBLIC_JWK")
     if not jwk:
         raise exceptions.AuthenticationFailed("ES256 public key not configured.")
 
-    from jwt.algorithms import ECAlgorithm
-
     try:
-        public_key = ECAlgorithm.from_jwk(json.dumps(jwk))
+        return _load_jwk(json.dumps(jwk, sort_keys=True))
     except Exception as exc:
         logger.exception("Invalid ES256 JWK.")
         raise exceptions.AuthenticationFailed("Invalid ES256 public key.") from exc
 
-    return jwt.decode(
-        token,
-        public_key,
-        algorithms=["ES256"],
-        audience="authenticated",
-    )
+
+@functools.lru_cache(maxsize=8)
+def _load_jwk(jwk_json: str):
+    return ECAlgorithm.from_jwk(jwk_json)
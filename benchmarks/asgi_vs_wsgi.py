@@ -0,0 +1,60 @@
+"""
+Compare WSGI (sync workers) and ASGI (uvicorn workers) throughput at a fixed
+concurrency against views that wait on an artificially slow upstream.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi [--workers 2] [--concurrency 64]
+        [--duration 10] [--latency-ms 50]
+"""
+
+import argparse
+import json
+
+from benchmarks.common import gunicorn_server, run_load
+
+SCENARIOS = [
+    # (label, gunicorn app, extra gunicorn args, path)
+    (
+        "wsgi-sync-workers",
+        "app.core.wsgi:application",
+        [],
+        "/bench/sync-upstream/",
+    ),
+    (
+        "asgi-uvicorn-workers (async view)",
+        "app.core.asgi:application",
+        ["--worker-class", "uvicorn_worker.UvicornWorker"],
+        "/bench/async-upstream/",
+    ),
+    (
+        "asgi-uvicorn-workers (sync view)",
+        "app.core.asgi:application",
+        ["--worker-class", "uvicorn_worker.UvicornWorker"],
+        "/bench/sync-upstream/",
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    env = {"BENCH_UPSTREAM_LATENCY_MS": str(args.latency_ms)}
+    results = {}
+    for label, app, extra_args, path in SCENARIOS:
+        with gunicorn_server(
+            app, "--workers", str(args.workers), *extra_args, env=env
+        ) as port:
+            # Warm up workers before measuring
+            run_load(port, path, args.workers, 1.0)
+            results[label] = run_load(port, path, args.concurrency, args.duration)
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
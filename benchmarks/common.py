@@ -0,0 +1,85 @@
+"""
+Helpers shared by the benchmark scripts: starting a gunicorn server and
+driving it with a fixed number of concurrent keep-alive connections (see
+app.core.loadgen).
+"""
+
+import asyncio
+import os
+import socket
+import subprocess  # nosec B404
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core import loadgen
+from app.core.loadgen import RequestSpec, Target
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(app: str, *args: str, env: dict | None = None, stdout=None):
+    """Run gunicorn serving `app` on a free local port; yields the port."""
+    port = free_port()
+    server_env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+        **(env or {}),
+    }
+    cmd = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        app,
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--config",
+        str(ROOT_DIR / "benchmarks" / "gunicorn.conf.py"),
+        "--log-level",
+        "warning",
+        *args,
+    ]
+    process = subprocess.Popen(  # nosec B603
+        cmd, cwd=ROOT_DIR, env=server_env, stdout=stdout
+    )
+    try:
+        _wait_for_port(port)
+        yield port
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start in {timeout}s")
+
+
+def run_load(
+    port: int,
+    path: str,
+    concurrency: int,
+    duration: float,
+    headers: dict | None = None,
+) -> dict:
+    """Hammer `path` from `concurrency` connections for `duration` seconds."""
+    target = Target("127.0.0.1", port, None)
+    spec = RequestSpec("bench", "GET", path, headers or {})
+    result = asyncio.run(loadgen.run_load(target, lambda: spec, concurrency, duration))
+    summary = result.summary()
+    summary.pop("by_request")
+    return summary
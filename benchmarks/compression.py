@@ -0,0 +1,119 @@
+"""
+Compare response compression codings and levels on the staff accounts list
+of a seeded dataset: bytes on the wire, and CPU time to compress (server)
+and decompress (client). Also compresses the same rows as an NDJSON stream,
+chunk by chunk, as CompressionMiddleware does for streaming responses.
+
+Runs in-process against an in-memory database seeded with
+``seed_database``.
+
+Usage:
+    python -m benchmarks.compression [--users 10000] [--repeat 10]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+import django  # noqa: E402
+
+django.setup()
+
+import brotli  # noqa: E402
+import orjson  # noqa: E402
+import zstandard  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from app.accounts.views import AccountViewSet  # noqa: E402
+from app.core.compression import CODINGS  # noqa: E402
+from app.core.middleware.compression import compress_stream  # noqa: E402
+
+User = get_user_model()
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 11], "zstd": [1, 3, 19]}
+DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def best_of(repeat: int, func) -> tuple[float, object]:
+    """Fastest of `repeat` runs in milliseconds, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 2), result
+
+
+def compress(coding: str, level: int, chunks) -> bytes:
+    compressor = CODINGS[coding](level)
+    return b"".join([compressor.compress(chunk) for chunk in chunks]) + (
+        compressor.flush()
+    )
+
+
+def stream_compress(coding: str, level: int, chunks) -> bytes:
+    return b"".join(compress_stream(iter(chunks), CODINGS[coding](level)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    call_command("seed_database", users=args.users, stdout=io.StringIO())
+    staff = User.objects.create_user(email="bench.staff@example.com", is_staff=True)
+
+    request = APIRequestFactory().get("/api/accounts/")
+    force_authenticate(request, user=staff)
+    content = AccountViewSet.as_view({"get": "list"})(request).render().content
+    # The same rows as a stream: one NDJSON line per chunk
+    lines = [orjson.dumps(row) + b"\n" for row in orjson.loads(content)]
+
+    results = []
+    for coding, levels in LEVELS.items():
+        for level in levels:
+            compress_ms, body = best_of(
+                args.repeat, lambda c=coding, n=level: compress(c, n, [content])
+            )
+            stream_ms, stream = best_of(
+                args.repeat, lambda c=coding, n=level: stream_compress(c, n, lines)
+            )
+            decompress_ms = best_of(
+                args.repeat, lambda c=coding, b=body: DECOMPRESS[c](b)
+            )[0]
+            results.append(
+                {
+                    "coding": coding,
+                    "level": level,
+                    "bytes": len(body),
+                    "ratio": round(len(content) / len(body), 1),
+                    "compress_ms": compress_ms,
+                    "decompress_ms": decompress_ms,
+                    "stream_bytes": len(stream),
+                    "stream_compress_ms": stream_ms,
+                }
+            )
+
+    print(
+        json.dumps(
+            {"config": vars(args), "bytes": len(content), "results": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
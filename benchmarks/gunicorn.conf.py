@@ -0,0 +1,2 @@
+# Benchmarks pass their gunicorn options on the command line. Loading this
+# (empty) file keeps the project's gunicorn.conf.py from applying.
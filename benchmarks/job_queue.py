@@ -0,0 +1,91 @@
+"""
+Measure how job throughput scales with the number of workers: queues
+sleep-bound jobs (stand-ins for I/O-bound work) and drains them with 1, 2,
+4... ``run_worker --burst`` processes sharing a file SQLite database. Also
+checks that every job ran exactly once.
+
+Usage:
+    python -m benchmarks.job_queue [--jobs 200] [--ms 20] [--workers 1 2 4 8]
+"""
+
+import argparse
+import json
+import os
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--ms", type=int, default=20, help="Duration of each job")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+        os.environ["BENCH_DATABASE"] = str(Path(tmp) / "jobs.sqlite3")
+
+        import django
+
+        django.setup()
+
+        from django.core.management import call_command
+
+        from app.jobs.models import Job
+        from app.jobs.registry import enqueue
+
+        call_command("migrate", verbosity=0)
+
+        results = []
+        for workers in args.workers:
+            Job.objects.all().delete()
+            for _ in range(args.jobs):
+                enqueue("bench.sleep", {"ms": args.ms})
+
+            start = time.perf_counter()
+            processes = [
+                subprocess.Popen(  # nosec B603
+                    [
+                        sys.executable,
+                        "-m",
+                        "django",
+                        "run_worker",
+                        "--burst",
+                        "--name",
+                        f"bench-{i}",
+                    ],
+                    cwd=ROOT_DIR,
+                    stdout=subprocess.DEVNULL,
+                )
+                for i in range(workers)
+            ]
+            for process in processes:
+                process.wait()
+            elapsed = time.perf_counter() - start
+
+            statuses = set(Job.objects.values_list("status", flat=True))
+            attempts = set(Job.objects.values_list("attempts", flat=True))
+            results.append(
+                {
+                    "workers": workers,
+                    "seconds": round(elapsed, 2),
+                    "jobs_per_second": round(args.jobs / elapsed, 1),
+                    "all_succeeded": statuses == {Job.Status.SUCCEEDED},
+                    "ran_once": attempts == {1},
+                }
+            )
+
+    base = results[0]["jobs_per_second"]
+    for result in results:
+        result["speedup"] = round(result["jobs_per_second"] / base, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Job handlers for the job queue benchmark.
+"""
+
+import time
+
+from app.jobs.registry import job
+
+
+@job("bench.sleep")
+def sleep(job):
+    """Stand-in for I/O-bound work: sleeps for payload["ms"] milliseconds."""
+    time.sleep(job.payload["ms"] / 1000)
@@ -0,0 +1,112 @@
+"""
+Compare DRF's JSONRenderer/JSONParser with the orjson-based ORJSONRenderer/
+ORJSONParser on UserSerializer list payloads of 1k and 10k users.
+
+Users are built in memory (no database), serialized once, and the
+resulting data is rendered (and the rendered body parsed) repeatedly. A
+small PATCH-like body is parsed too, as typical of request bodies.
+
+Usage:
+    python -m benchmarks.json_rendering [--sizes 1000 10000] [--repeat 20]
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from app.accounts.serializers import UserSerializer  # noqa: E402
+from app.core.parsers import ORJSONParser  # noqa: E402
+from app.core.renderers import ORJSONRenderer  # noqa: E402
+
+User = get_user_model()
+
+
+def user_list_data(size: int):
+    joined = datetime(2026, 1, 1, tzinfo=UTC)
+    users = [
+        User(
+            id=n,
+            email=f"user{n}@example.com",
+            first_name="Zoë",
+            last_name=f"User {n}",
+            auth_id=uuid.uuid4(),
+            date_joined=joined + timedelta(seconds=n, microseconds=n),
+        )
+        for n in range(size)
+    ]
+    return UserSerializer(users, many=True).data
+
+
+def best_of(repeat: int, func) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 3)
+
+
+def measure(size: int, repeat: int) -> dict:
+    data = user_list_data(size)
+    body = JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == body, "renderers disagree"
+
+    render = {
+        "JSONRenderer": best_of(repeat, lambda: JSONRenderer().render(data)),
+        "ORJSONRenderer": best_of(repeat, lambda: ORJSONRenderer().render(data)),
+    }
+    parse = {
+        "JSONParser": best_of(repeat, lambda: JSONParser().parse(io.BytesIO(body))),
+        "ORJSONParser": best_of(repeat, lambda: ORJSONParser().parse(io.BytesIO(body))),
+    }
+    return {
+        "bytes": len(body),
+        "render_ms": render,
+        "render_speedup": round(render["JSONRenderer"] / render["ORJSONRenderer"], 1),
+        "parse_ms": parse,
+        "parse_speedup": round(parse["JSONParser"] / parse["ORJSONParser"], 1),
+    }
+
+
+def measure_request_body(repeat: int) -> dict:
+    """Parse a typical (small) PATCH body 1000 times."""
+    body = json.dumps({"first_name": "Zoë", "last_name": "Doe"}).encode()
+
+    def parse_many(parser):
+        return lambda: [parser.parse(io.BytesIO(body)) for _ in range(1000)]
+
+    parse = {
+        "JSONParser": best_of(repeat, parse_many(JSONParser())),
+        "ORJSONParser": best_of(repeat, parse_many(ORJSONParser())),
+    }
+    return {"parse_x1000_ms": parse}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {f"{size}_users": measure(size, args.repeat) for size in args.sizes}
+    results["small_request_body"] = measure_request_body(args.repeat)
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
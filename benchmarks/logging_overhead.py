@@ -0,0 +1,77 @@
+"""
+Compare request latency under load with INFO logging written synchronously
+(StreamHandler) and through the background queue handler, while the log
+consumer (e.g. a container log driver) drains stdout slowly.
+
+Usage:
+    python -m benchmarks.logging_overhead [--workers 2] [--concurrency 32]
+        [--duration 10] [--drain-kbps 256]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+from benchmarks.common import gunicorn_server, run_load
+
+PATH = "/bench/log/"
+
+
+def slow_drain(fd: int, kbytes_per_sec: int, stop: threading.Event):
+    """Read from `fd` at a limited rate, like a slow log collector."""
+    chunk = 4096
+    delay = chunk / (kbytes_per_sec * 1024)
+    os.set_blocking(fd, False)
+    while not stop.is_set():
+        try:
+            os.read(fd, chunk)
+        except BlockingIOError:
+            pass
+        time.sleep(delay)
+
+
+def measure(mode: str, args) -> dict:
+    read_fd, write_fd = os.pipe()
+    stop = threading.Event()
+    drain = threading.Thread(
+        target=slow_drain, args=(read_fd, args.drain_kbps, stop), daemon=True
+    )
+    drain.start()
+    try:
+        with gunicorn_server(
+            "app.core.wsgi:application",
+            "--workers",
+            str(args.workers),
+            "--threads",
+            "4",
+            env={"BENCH_LOGGING": mode},
+            stdout=write_fd,
+        ) as port:
+            run_load(port, PATH, args.workers, 1.0)  # warm-up
+            return run_load(port, PATH, args.concurrency, args.duration)
+    finally:
+        stop.set()
+        os.close(write_fd)
+        drain.join()
+        os.close(read_fd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--drain-kbps", type=int, default=256)
+    args = parser.parse_args()
+
+    results = {
+        "sync-stream-handler": measure("stream", args),
+        "background-queue-handler": measure("queue", args),
+    }
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
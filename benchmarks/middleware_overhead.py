@@ -0,0 +1,64 @@
+"""
+Measure per-request middleware overhead for bearer-token API requests with
+the API fast path enabled (lean stack) and disabled (full stack).
+
+Requests go through the whole Django handler in-process to a view that does
+no work, so the difference is the cost of the skipped middleware.
+
+Usage:
+    python -m benchmarks.middleware_overhead [--requests 20000]
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+PATH = "/api/bench/noop/"
+HEADERS = {"Authorization": "Bearer benchmark-token"}
+
+
+def measure(requests: int) -> dict:
+    client = Client()
+    for _ in range(100):  # warm-up
+        client.get(PATH, headers=HEADERS)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(PATH, headers=HEADERS)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "per_request_us": round(elapsed / requests * 1_000_000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+    for label, enabled in (("full-stack", False), ("api-fast-path", True)):
+        config = {**settings.API_FAST_PATH, "ENABLED": enabled}
+        with override_settings(API_FAST_PATH=config):
+            results[label] = measure(args.requests)
+
+    saved = results["full-stack"]["per_request_us"]
+    saved -= results["api-fast-path"]["per_request_us"]
+    results["saved_per_request_us"] = round(saved, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare MessagePack with JSON for the accounts list endpoint on a seeded
+dataset: payload size (raw and gzipped), server time to serialize and
+render, and client time to decode (to plain values for JSON, and to UUIDs
+and datetimes like MessagePack returns them).
+
+Runs in-process against an in-memory database seeded with
+``seed_database``.
+
+Usage:
+    python -m benchmarks.msgpack_vs_json [--users 10000] [--repeat 10]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+import django  # noqa: E402
+
+django.setup()
+
+import orjson  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from app.accounts.views import AccountViewSet  # noqa: E402
+from app.core.parsers import MessagePackParser  # noqa: E402
+
+User = get_user_model()
+ACCEPT = {"json": "application/json", "msgpack": "application/msgpack"}
+
+
+def best_of(repeat: int, func) -> tuple[float, object]:
+    """Fastest of `repeat` runs in milliseconds, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 2), result
+
+
+def json_to_native(rows):
+    for row in rows:
+        row["auth_id"] = uuid.UUID(row["auth_id"]) if row["auth_id"] else None
+        row["date_joined"] = datetime.fromisoformat(row["date_joined"])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    call_command("seed_database", users=args.users, stdout=io.StringIO())
+    staff = User.objects.create_user(email="bench.staff@example.com", is_staff=True)
+
+    view = AccountViewSet.as_view({"get": "list"})
+    factory = APIRequestFactory()
+
+    def fetch(fmt):
+        request = factory.get("/api/accounts/", HTTP_ACCEPT=ACCEPT[fmt])
+        force_authenticate(request, user=staff)
+        return view(request).render().content
+
+    results = {}
+    for fmt in ACCEPT:
+        server_ms, content = best_of(args.repeat, lambda fmt=fmt: fetch(fmt))
+        results[fmt] = {
+            "bytes": len(content),
+            "gzip_bytes": len(gzip.compress(content, compresslevel=6)),
+            "server_ms": server_ms,
+        }
+        if fmt == "json":
+            results[fmt]["decode_ms"] = best_of(
+                args.repeat, lambda c=content: orjson.loads(c)
+            )[0]
+            results[fmt]["decode_native_ms"] = best_of(
+                args.repeat, lambda c=content: json_to_native(orjson.loads(c))
+            )[0]
+        else:
+            decode_ms = best_of(
+                args.repeat, lambda c=content: MessagePackParser().parse(io.BytesIO(c))
+            )[0]
+            results[fmt]["decode_ms"] = results[fmt]["decode_native_ms"] = decode_ms
+
+    results["msgpack_size_ratio"] = round(
+        results["msgpack"]["bytes"] / results["json"]["bytes"], 2
+    )
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
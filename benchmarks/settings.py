@@ -0,0 +1,43 @@
+"""
+Settings for running the benchmarks against real gunicorn/uvicorn servers.
+
+Extends the test settings with benchmark-only URLs; placeholder values are
+used for the required environment variables that are not set.
+"""
+
+import os
+
+for _name in (
+    "DJANGO_SECRET_KEY",
+    "SUPABASE_PROJECT_URL",
+    "SUPABASE_PUBLIC_KEY",
+    "SUPABASE_SECRET_KEY",
+):
+    os.environ.setdefault(_name, "benchmark-placeholder")
+
+from app.core.settings.test import *  # noqa: E402, F403
+
+ALLOWED_HOSTS = ["*"]
+ROOT_URLCONF = "benchmarks.urls"
+
+# BENCH_LOGGING=stream swaps the background queue handler for a plain
+# synchronous StreamHandler, to compare both under load.
+if os.getenv("BENCH_LOGGING") == "stream":
+    LOGGING["handlers"]["console"] = {  # noqa: F405
+        "class": "logging.StreamHandler",
+        "stream": "ext://sys.stdout",
+        "formatter": "json",
+    }
+
+# BENCH_DATABASE puts the database in a file, shared by the processes of a
+# benchmark (e.g. job workers).
+if os.getenv("BENCH_DATABASE"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ["BENCH_DATABASE"],
+            "OPTIONS": {"timeout": 30, "transaction_mode": "IMMEDIATE"},
+        }
+    }
+
+JOBS = {**JOBS, "MODULES": ["benchmarks.jobs"]}  # noqa: F405
@@ -0,0 +1,45 @@
+"""
+Benchmark-only views that simulate a slow upstream call (HTTP API, cache,
+search...) with a fixed artificial latency.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from django.http import JsonResponse
+from django.urls import include, path
+
+UPSTREAM_LATENCY = int(os.getenv("BENCH_UPSTREAM_LATENCY_MS", "50")) / 1000
+
+logger = logging.getLogger("benchmarks")
+
+
+def sync_upstream(request):
+    time.sleep(UPSTREAM_LATENCY)
+    return JsonResponse({"ok": True})
+
+
+async def async_upstream(request):
+    await asyncio.sleep(UPSTREAM_LATENCY)
+    return JsonResponse({"ok": True})
+
+
+def noop(request):
+    return JsonResponse({"ok": True})
+
+
+def log_lines(request):
+    for line in range(5):
+        logger.info("Benchmark log line %d", line, extra={"line": line})
+    return JsonResponse({"ok": True})
+
+
+urlpatterns = [
+    path("bench/sync-upstream/", sync_upstream),
+    path("bench/async-upstream/", async_upstream),
+    path("api/bench/noop/", noop),
+    path("bench/log/", log_lines),
+    path("", include("app.core.urls")),
+]
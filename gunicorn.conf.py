@@ -0,0 +1,128 @@
+"""
+Gunicorn configuration, driven by environment variables.
+
+Workers and threads are sized from the container's CPU quota
+(app.core.server_sizing) unless set explicitly:
+
+    GUNICORN_WORKER_CLASS    sync | gthread | uvicorn (default: gthread)
+    GUNICORN_WORKERS         worker processes (default: from the CPU quota)
+    GUNICORN_THREADS         threads per gthread worker (default: 4)
+    GUNICORN_MAX_WORKERS     upper bound of the computed workers (default: 16)
+    GUNICORN_BIND            (default: 0.0.0.0:$APP_PORT or 0.0.0.0:8000)
+    GUNICORN_KEEPALIVE       seconds (default: 5)
+    GUNICORN_BACKLOG         (default: 2048)
+    GUNICORN_MAX_REQUESTS    recycle workers after N requests (default: 1000,
+                             0 disables), plus up to GUNICORN_MAX_REQUESTS_JITTER
+    GUNICORN_TIMEOUT         seconds (default: 30)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds (default: 30)
+    GUNICORN_PRELOAD         load the app in the master (default: true)
+
+The uvicorn worker class serves app.core.asgi; the others app.core.wsgi.
+"""
+
+import os
+
+from app.core.server_sizing import (
+    DEFAULT_THREADS,
+    WORKER_CLASSES,
+    available_cpus,
+    pool_size,
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+_worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread").strip().lower()
+_cpus = available_cpus()
+_pool = pool_size(_worker_class, _cpus)
+
+wsgi_app = (
+    "app.core.asgi:application"
+    if _worker_class == "uvicorn"
+    else "app.core.wsgi:application"
+)
+worker_class = WORKER_CLASSES[_worker_class]
+workers = _env_int(
+    "GUNICORN_WORKERS", min(_pool.workers, _env_int("GUNICORN_MAX_WORKERS", 16))
+)
+threads = (
+    _env_int("GUNICORN_THREADS", DEFAULT_THREADS) if _worker_class == "gthread" else 1
+)
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('APP_PORT', '8000')}")
+backlog = _env_int("GUNICORN_BACKLOG", 2048)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Recycle workers to bound memory growth; the jitter keeps them from all
+# restarting at once
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# Boot and warm up the app once in the master (app.core.warmup); workers
+# share its memory
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+# Worker heartbeat files in memory rather than on a (possibly slow) disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"  # nosec B108
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving %s with %d %s worker(s) x %d thread(s) (%d CPU(s) available)",
+        wsgi_app,
+        workers,
+        worker_class,
+        threads,
+        _cpus,
+    )
+
+
+def post_fork(server, worker):
+    """Never reuse database connections inherited from the master."""
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+
+
+def post_worker_init(worker):
+    """
+    Open this worker's database connections and re-run the (cheap,
+    idempotent) warm-up before the first request.
+    """
+    from django.conf import settings
+
+    from app.core.warmup import warm_up
+
+    if settings.WARMUP["ENABLED"]:
+        # ASGI runs sync views in executor threads, which connect lazily
+        warm_up(connect_db=_worker_class != "uvicorn")
+
+
+def worker_exit(server, worker):
+    """Write the activity still buffered by this worker (app.accounts.activity)."""
+    from app.accounts.activity import tracker
+
+    tracker.stop()
+
+
+def child_exit(server, worker):
+    """Remove the metric files of a dead worker (Prometheus multiprocess)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,164 @@
+"""
+Write-behind last-activity tracking (app.accounts.activity).
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.accounts import activity
+from app.accounts.activity import ActivityTracker
+from tests.unit.conftest import make_test_jwt
+
+User = get_user_model()
+
+T0 = datetime.datetime(2026, 10, 19, 8, 0, tzinfo=datetime.UTC)
+
+
+@pytest.fixture
+def tracking(settings):
+    settings.ACTIVITY_TRACKING = {
+        "ENABLED": True,
+        "FLUSH_INTERVAL": 3600.0,
+        "MIN_INTERVAL": 60,
+        "BATCH_SIZE": 500,
+    }
+    return settings.ACTIVITY_TRACKING
+
+
+@pytest.fixture
+def tracker(tracking):
+    tracker = ActivityTracker()
+    yield tracker
+    tracker.stop()
+
+
+def _users(count: int):
+    return [
+        User.objects.create_user(email=f"user{i}@example.com", password="x")
+        for i in range(count)
+    ]
+
+
+def _updates(queries) -> list[str]:
+    return [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+
+
+@pytest.mark.django_db
+class TestActivityTracker:
+    def test_repeat_hits_are_merged_into_one_write(self, tracker):
+        (user,) = _users(1)
+        for minutes in (0, 5, 2):
+            tracker.record(user.id, T0 + datetime.timedelta(minutes=minutes))
+
+        with CaptureQueriesContext(connection) as queries:
+            assert tracker.flush() == 1
+
+        assert len(_updates(queries)) == 1
+        user.refresh_from_db()
+        assert user.last_seen_at == T0 + datetime.timedelta(minutes=5)
+
+    def test_users_are_written_at_most_once_per_min_interval(self, tracker):
+        (user,) = _users(1)
+        now = timezone.now()
+        tracker.record(user.id, now)
+        tracker.flush()
+
+        tracker.record(user.id, now + datetime.timedelta(seconds=30))
+        assert tracker.flush() == 0
+        tracker.record(user.id, now + datetime.timedelta(seconds=61))
+        assert tracker.flush() == 1
+
+        user.refresh_from_db()
+        assert user.last_seen_at == now + datetime.timedelta(seconds=61)
+
+    def test_users_are_written_in_batches(self, tracker, tracking):
+        tracking["BATCH_SIZE"] = 2
+        users = _users(5)
+        for user in users:
+            tracker.record(user.id, T0)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert tracker.flush() == 5
+
+        updates = _updates(queries)
+        assert len(updates) == 3
+        assert "CASE" in updates[0]
+        assert User.objects.filter(last_seen_at=T0).count() == 5
+
+    def test_failed_writes_are_retried(self, tracker):
+        (user,) = _users(1)
+        tracker.record(user.id, T0)
+
+        with mock.patch.object(
+            User.objects, "bulk_update", side_effect=RuntimeError("db down")
+        ):
+            assert tracker.flush() == 0
+        tracker.record(user.id, T0 + datetime.timedelta(seconds=1))
+        assert tracker.flush() == 1
+
+        user.refresh_from_db()
+        assert user.last_seen_at == T0 + datetime.timedelta(seconds=1)
+
+    def test_stop_writes_what_is_buffered(self, tracker):
+        (user,) = _users(1)
+        tracker.record(user.id, T0)
+        assert tracker._thread.is_alive()
+
+        tracker.stop()
+
+        assert tracker._thread is None
+        user.refresh_from_db()
+        assert user.last_seen_at == T0
+
+    def test_disabled(self, tracker, tracking):
+        (user,) = _users(1)
+        tracking["ENABLED"] = False
+        tracker.record(user.id, T0)
+
+        assert tracker.flush() == 0
+        assert tracker._thread is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("mock_es256_key")
+def test_concurrent_requests_are_tracked_by_the_flush_thread(tracking, monkeypatch):
+    tracking["FLUSH_INTERVAL"] = 0.01
+    monkeypatch.setattr(activity, "record", activity.tracker.record)
+    users = _users(4)
+    for user in users:
+        user.auth_id = user.id
+        user.save(update_fields=["auth_id"])
+    tokens = [make_test_jwt(email=u.email, user_id=str(u.auth_id)) for u in users]
+
+    def get_me(token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        try:
+            return client.get("/api/accounts/me/").status_code
+        finally:
+            connection.close()
+
+    tracker = activity.tracker
+    written = []
+    flush = tracker.flush
+    try:
+        with mock.patch.object(tracker, "flush", lambda: written.append(flush())):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                statuses = list(pool.map(get_me, tokens * 25))
+            tracker.stop()
+    finally:
+        tracker.stop()
+        tracker._written.clear()
+
+    assert statuses == [200] * 100
+    # Every user written once: later hits fall within MIN_INTERVAL
+    assert sum(written) == 4
+    assert User.objects.filter(last_seen_at__isnull=True).count() == 0
@@ -0,0 +1,128 @@
+import io
+import time
+from unittest import mock
+
+import pytest
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.core import paginators
+from app.core.paginators import EstimatedCountPaginator, estimated_row_count
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+CHANGELIST_URL = "/admin/accounts/user/"
+
+
+def _seed(count):
+    call_command("seed_database", users=count, batch_size=1000, stdout=io.StringIO())
+
+
+def _changelist_queries(client, url=CHANGELIST_URL):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [q["sql"] for q in ctx.captured_queries]
+
+
+@pytest.fixture
+def planner_estimate(monkeypatch):
+    """PostgreSQL planner statistics of 250k rows, for every table."""
+    fake = mock.MagicMock(vendor="postgresql")
+    fake.cursor.return_value.__enter__.return_value.fetchone.return_value = (250_000,)
+    monkeypatch.setattr(paginators, "connections", {"default": fake})
+    return fake
+
+
+@pytest.fixture
+def admin_session(client, superuser):
+    client.force_login(superuser)
+    return client
+
+
+class TestUserAdminChangelist:
+    def test_query_count_does_not_grow_with_table_size(self, admin_session):
+        """The changelist issues the same number of queries for 50 or 5000 rows."""
+        _seed(50)
+        small = _changelist_queries(admin_session)
+
+        _seed(4950)
+        large = _changelist_queries(admin_session)
+
+        assert len(large) == len(small)
+
+    def test_single_count_query(self, admin_session):
+        """Only the paginator counts rows; the full result count is disabled."""
+        _seed(200)
+        queries = _changelist_queries(admin_session)
+        count_queries = [q for q in queries if "COUNT(" in q.upper()]
+        assert len(count_queries) == 1
+
+    def test_loads_only_displayed_columns(self, admin_session):
+        """The page query does not load passwords or other unused columns."""
+        _seed(10)
+        queries = _changelist_queries(admin_session)
+        page_query = next(
+            q for q in queries if "ORDER BY" in q and '"accounts_user"' in q
+        )
+        assert '"password"' not in page_query
+        assert '"last_login"' not in page_query
+
+    def test_changelist_is_fast_on_large_table(self, admin_session):
+        """A changelist page on a seeded large table renders quickly."""
+        _seed(20000)
+        start = time.perf_counter()
+        _changelist_queries(admin_session)
+        assert time.perf_counter() - start < 2.0
+
+    def test_search_by_exact_email(self, admin_session):
+        """A term containing '@' matches the exact email only."""
+        _seed(30)
+        response = admin_session.get(CHANGELIST_URL, {"q": "user12@seed.example.com"})
+        results = list(response.context["cl"].result_list)
+        assert [u.email for u in results] == ["user12@seed.example.com"]
+
+    def test_search_by_email_prefix(self, admin_session):
+        """Other terms match the beginning of the email address."""
+        _seed(30)
+        response = admin_session.get(CHANGELIST_URL, {"q": "user2"})
+        emails = {u.email for u in response.context["cl"].result_list}
+        assert emails == {"user2@seed.example.com"} | {
+            f"user2{i}@seed.example.com" for i in range(10)
+        }
+
+    def test_search_does_not_use_contains(self, admin_session):
+        """Search never falls back to an unindexed LIKE '%term%' scan."""
+        _seed(10)
+        queries = _changelist_queries(admin_session, f"{CHANGELIST_URL}?q=user1")
+        assert not any("'%user1" in q for q in queries)
+
+
+class TestEstimatedCountPaginator:
+    def test_falls_back_to_exact_count(self, regular_user, another_user):
+        """Without planner statistics the exact count is used."""
+        queryset = User.objects.order_by("-date_joined")
+        assert estimated_row_count(queryset) is None
+        assert EstimatedCountPaginator(queryset, 10).count == 2
+
+    def test_no_estimate_for_filtered_queryset(self, regular_user):
+        queryset = User.objects.filter(is_staff=False)
+        assert estimated_row_count(queryset) is None
+
+    def test_estimates_despite_hiding_soft_deleted_users(
+        self, planner_estimate, superuser, rf
+    ):
+        """The default manager's soft-delete filter does not prevent estimates."""
+        request = rf.get(CHANGELIST_URL)
+        request.user = superuser
+        queryset = site._registry[User].get_queryset(request)
+
+        assert EstimatedCountPaginator(queryset, 100).count == 250_000
+
+    def test_no_estimate_with_filters_beyond_the_default(self, planner_estimate):
+        assert estimated_row_count(User.objects.filter(is_staff=True)) is None
+        assert estimated_row_count(User.objects.order_by("email")) == 250_000
@@ -0,0 +1,209 @@
+"""
+Change feed of users: positions, tombstones and bounded pages.
+"""
+
+import datetime
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.accounts.changes import Position, Token
+from app.accounts.models import UserTombstone
+
+User = get_user_model()
+
+ENDPOINT = "/api/accounts/changes/"
+
+
+@pytest.fixture(autouse=True)
+def feed_settings(settings):
+    settings.ACCOUNT_CHANGES = {
+        **settings.ACCOUNT_CHANGES,
+        "SETTLE_SECONDS": 0,
+        "PAGE_SIZE": 3,
+        "MAX_PAGE_SIZE": 4,
+    }
+    return settings.ACCOUNT_CHANGES
+
+
+@pytest.fixture
+def staff_client(api_client, staff_user):
+    api_client.force_authenticate(user=staff_user)
+    return api_client
+
+
+def _ago(seconds):
+    return timezone.now() - datetime.timedelta(seconds=seconds)
+
+
+def _users(count, seconds_ago=60):
+    users = [
+        User.objects.create_user(email=f"feed{i}@example.com") for i in range(count)
+    ]
+    # Settled changes, one second apart
+    for i, user in enumerate(users):
+        User.objects.filter(pk=user.pk).update(updated_at=_ago(seconds_ago - i))
+    return users
+
+
+def _follow(client, since=None, **params):
+    """Every page of the feed from `since`; returns the changes and last token."""
+    results = []
+    while True:
+        if since:
+            params["since"] = since
+        response = client.get(ENDPOINT, params)
+        assert response.status_code == 200, response.data
+        results += response.data["results"]
+        since = response.data["next"]
+        if not response.data["has_more"]:
+            return results, since
+
+
+@pytest.mark.django_db
+class TestChangeFeed:
+    def test_full_sync_in_bounded_pages(self, staff_client, staff_user):
+        users = _users(5)
+        User.objects.filter(pk=staff_user.pk).update(updated_at=_ago(120))
+
+        response = staff_client.get(ENDPOINT)
+        assert len(response.data["results"]) == 3
+        assert response.data["has_more"] is True
+
+        results, _ = _follow(staff_client)
+        assert [row["id"] for row in results] == [
+            str(u.pk) for u in [staff_user, *users]
+        ]
+        assert results[0]["email"] == staff_user.email
+        assert results[0]["deleted"] is False
+
+    def test_page_size_is_bounded(self, staff_client):
+        _users(6)
+
+        response = staff_client.get(ENDPOINT, {"limit": 1000})
+
+        assert len(response.data["results"]) == 4
+
+    def test_only_changes_since_the_token(self, staff_client):
+        users = _users(3)
+        _, token = _follow(staff_client)
+
+        users[0].first_name = "Changed"
+        users[0].save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = staff_client.get(ENDPOINT, {"since": token})
+        assert [row["first_name"] for row in response.data["results"]] == ["Changed"]
+        # Users and tombstones, whatever the size of the table
+        assert len([q for q in queries if "accounts_user" in q["sql"]]) <= 3
+
+    def test_recent_changes_wait_until_settled(self, staff_client, feed_settings):
+        _, token = _follow(staff_client)
+        user = User.objects.create_user(email="new@example.com")
+
+        feed_settings["SETTLE_SECONDS"] = 5
+        results, held = _follow(staff_client, token)
+        assert results == []
+
+        # 5 seconds later
+        feed_settings["SETTLE_SECONDS"] = 0
+        results, _ = _follow(staff_client, held)
+        assert [row["id"] for row in results] == [str(user.pk)]
+
+    def test_deletions(self, staff_client, settings):
+        soft, hard, purged = _users(3)
+        _, token = _follow(staff_client)
+
+        soft.soft_delete()
+        settings.ACCOUNT_DELETION = {**settings.ACCOUNT_DELETION, "SOFT": False}
+        assert staff_client.delete(f"/api/accounts/{hard.pk}/").status_code == 204
+        purged.soft_delete()
+        call_command("purge_deleted_users", "--pause", "0", stdout=StringIO())
+
+        results, _ = _follow(staff_client, token)
+        assert sorted(str(row["id"]) for row in results) == sorted(
+            str(u.pk) for u in (soft, hard, purged)
+        )
+        assert all(row == {"id": row["id"], "deleted": True} for row in results)
+
+    def test_purge_keeps_the_position_of_soft_deleted_users(self, staff_client):
+        (user,) = _users(1)
+        user.soft_delete()
+        _, token = _follow(staff_client)
+
+        call_command(
+            "purge_deleted_users",
+            "--older-than",
+            "0",
+            "--pause",
+            "0",
+            stdout=StringIO(),
+        )
+
+        # The client saw the deletion already
+        assert _follow(staff_client, token)[0] == []
+        assert UserTombstone.objects.filter(pk=user.pk).exists()
+
+    def test_tokens_advance_while_nothing_changes(self, staff_client):
+        _users(1)
+        _, token = _follow(staff_client)
+
+        _, later = _follow(staff_client, token)
+
+        assert Token.decode(later).position > Token.decode(token).position
+
+    def test_invalid_token(self, staff_client):
+        response = staff_client.get(ENDPOINT, {"since": "not-a-token"})
+
+        assert response.status_code == 400
+
+    def test_expired_token_requires_a_resync(self, staff_client, feed_settings):
+        (user,) = _users(1)
+        old = Token(Position(_ago(60), user.pk), issued=_ago(31 * 86400)).encode()
+
+        response = staff_client.get(ENDPOINT, {"since": old})
+
+        assert response.status_code == 410
+        assert response.data["detail"].code == "resync_required"
+
+    def test_full_resync_of_rows_older_than_tombstones(self, staff_client, staff_user):
+        users = _users(5, seconds_ago=60 * 86400)
+        User.objects.filter(pk=staff_user.pk).update(updated_at=_ago(90 * 86400))
+
+        results, token = _follow(staff_client)
+
+        assert [row["id"] for row in results] == [
+            str(u.pk) for u in [staff_user, *users]
+        ]
+        # Caught up: the token is as fresh as the sync, not as the rows
+        assert Token.decode(token).issued > _ago(60)
+
+    def test_tokens_of_a_sync_keep_its_start(self, staff_client):
+        _users(9)
+        started = timezone.now()
+
+        first = staff_client.get(ENDPOINT).data
+        second = staff_client.get(ENDPOINT, {"since": first["next"]}).data
+
+        assert first["has_more"] and second["has_more"]
+        issued = [Token.decode(page["next"]).issued for page in (first, second)]
+        assert issued[0] == issued[1] >= started
+
+    def test_expired_tombstones_are_purged(self):
+        UserTombstone.objects.create(id=User().pk, updated_at=_ago(31 * 86400))
+        out = StringIO()
+
+        call_command("purge_deleted_users", "--pause", "0", stdout=out)
+
+        assert "1 expired tombstone(s)" in out.getvalue()
+        assert not UserTombstone.objects.exists()
+
+    def test_staff_only(self, api_client, regular_user):
+        api_client.force_authenticate(user=regular_user)
+
+        assert api_client.get(ENDPOINT).status_code == 403
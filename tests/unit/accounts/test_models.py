@@ -0,0 +1,83 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, models, transaction
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+email_migration = importlib.import_module(
+    "app.accounts.migrations.0003_user_email_ci_unique"
+)
+
+
+class TestCanonicalEmail:
+    def test_create_user_stores_canonical_email(self):
+        user = User.objects.create_user(email="  Mixed.Case@Example.COM ")
+        assert user.email == "mixed.case@example.com"
+
+    def test_case_variants_are_rejected_by_constraint(self, regular_user):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            User.objects.bulk_create([User(email=regular_user.email.upper())])
+
+    def test_get_by_email_ignores_case(self, regular_user):
+        assert User.objects.get_by_email("USER@example.com") == regular_user
+
+    def test_get_by_natural_key_ignores_case(self, regular_user):
+        assert User.objects.get_by_natural_key("User@Example.com") == regular_user
+
+    def test_email_lookup_uses_lower_expression(self):
+        sql = str(User.objects.filter_by_email("A@B.com").query)
+        assert 'LOWER("accounts_user"."email") = a@b.com' in sql
+
+    def test_lower_lookup_is_only_on_user_email(self):
+        assert "lower" in User._meta.get_field("email").get_lookups()
+        assert "lower" not in models.EmailField.get_lookups()
+
+    def test_admin_login_is_case_insensitive(self, client, staff_user):
+        assert client.login(username="ADMIN@example.com", password="adminpass")
+
+
+class TestEmailConflictMigration:
+    # The migration functions only use the editor's connection
+    editor = SimpleNamespace(connection=connection)
+
+    def test_reports_conflicting_rows(self, regular_user):
+        # Simulate legacy data; the test transaction restores the index
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX accounts_user_email_ci_uniq")
+        User.objects.bulk_create([User(email="USER@example.com")])
+
+        with pytest.raises(RuntimeError, match="user@example.com"):
+            email_migration.check_email_conflicts(apps, self.editor)
+
+    def test_passes_without_conflicts(self, regular_user, another_user):
+        email_migration.check_email_conflicts(apps, self.editor)
+
+    def test_canonicalizes_existing_emails(self):
+        User.objects.bulk_create([User(email="Legacy@Example.com")])
+        email_migration.canonicalize_emails(apps, self.editor)
+        assert User.objects.filter(email="legacy@example.com").exists()
+
+
+class TestAccountEmailAPI:
+    endpoint = "/api/accounts/"
+
+    def test_create_own_account_with_different_case(self, api_client, not_in_db_user):
+        """The email match against the JWT user is case-insensitive."""
+        api_client.force_authenticate(user=not_in_db_user)
+        payload = {"email": not_in_db_user.email.upper()}
+        response = api_client.post(self.endpoint, payload)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["email"] == not_in_db_user.email
+
+    def test_create_duplicate_with_different_case(self, api_client, staff_user):
+        """A case variant of an existing email is a validation error, not a 500."""
+        api_client.force_authenticate(user=staff_user)
+        response = api_client.post(self.endpoint, {"email": "ADMIN@example.com"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "email" in response.data
@@ -0,0 +1,121 @@
+"""
+MessagePack content negotiation on the accounts endpoints.
+"""
+
+import datetime
+import io
+import uuid
+
+import msgpack
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from app.core.parsers import MessagePackParser
+from app.core.renderers import UUID_EXT_TYPE, MessagePackRenderer
+from tests.unit.conftest import make_test_jwt
+
+User = get_user_model()
+
+ENDPOINT = "/api/accounts/"
+MSGPACK = "application/msgpack"
+
+
+def _client_for(user):
+    client = APIClient()
+    token = make_test_jwt(email=user.email, user_id=str(user.auth_id))
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _decode(content: bytes):
+    return MessagePackParser().parse(io.BytesIO(content))
+
+
+class TestMessagePackCodec:
+    def test_round_trip_with_binary_uuid_and_timestamp(self):
+        data = {
+            "id": uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+            "at": datetime.datetime(
+                2026, 10, 19, 8, 30, 15, 123456, tzinfo=datetime.UTC
+            ),
+            "name": "Zoë",
+            "items": [1, None, True],
+        }
+        content = MessagePackRenderer().render(data)
+
+        raw = msgpack.unpackb(content)
+        assert raw["id"] == msgpack.ExtType(UUID_EXT_TYPE, data["id"].bytes)
+        assert isinstance(raw["at"], msgpack.Timestamp)
+        assert _decode(content) == data
+
+    def test_other_types_are_converted_like_json(self):
+        naive = datetime.datetime(2026, 1, 1, 12, 0)
+        content = MessagePackRenderer().render({"d": naive.date(), "n": naive})
+        assert _decode(content) == {"d": "2026-01-01", "n": "2026-01-01T12:00:00"}
+
+    def test_none_renders_empty(self):
+        assert MessagePackRenderer().render(None) == b""
+
+    @pytest.mark.parametrize("body", [b"\xc1", b"\x92\x01", b"\x81\x01\x02"])
+    def test_invalid_body_is_a_parse_error(self, body):
+        with pytest.raises(ParseError, match="MessagePack parse error"):
+            _decode(body)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestAccountsMessagePack:
+    def test_retrieve_uses_native_types(self, regular_user):
+        response = _client_for(regular_user).get(
+            f"{ENDPOINT}{regular_user.id}/", HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == MSGPACK
+
+        data = _decode(response.content)
+        regular_user.refresh_from_db()
+        assert data["auth_id"] == regular_user.auth_id
+        assert data["date_joined"] == regular_user.date_joined
+        assert data["email"] == regular_user.email
+
+    def test_json_is_still_the_default(self, regular_user):
+        response = _client_for(regular_user).get(f"{ENDPOINT}me/")
+        assert response["Content-Type"] == "application/json"
+        assert response.json()["auth_id"] == str(regular_user.auth_id)
+
+    def test_list_matches_json(self, staff_user, regular_user, another_user):
+        staff_user.auth_id = uuid.uuid4()
+        staff_user.save()
+        client = _client_for(staff_user)
+
+        as_json = client.get(ENDPOINT).json()
+        as_msgpack = _decode(client.get(ENDPOINT, HTTP_ACCEPT=MSGPACK).content)
+
+        assert len(as_msgpack) == len(as_json) == 3
+        for packed, text in zip(as_msgpack, as_json, strict=True):
+            assert str(packed["auth_id"]) == text["auth_id"]
+            assert (
+                packed["date_joined"].isoformat().replace("+00:00", "Z")
+                == (text["date_joined"])
+            )
+
+    def test_update_with_msgpack_body(self, regular_user):
+        body = MessagePackRenderer().render({"first_name": "Packed"})
+        response = _client_for(regular_user).patch(
+            f"{ENDPOINT}{regular_user.id}/",
+            body,
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+        assert response.status_code == 200
+        assert _decode(response.content)["first_name"] == "Packed"
+        regular_user.refresh_from_db()
+        assert regular_user.first_name == "Packed"
+
+    def test_invalid_msgpack_body_is_rejected(self, regular_user):
+        response = _client_for(regular_user).patch(
+            f"{ENDPOINT}{regular_user.id}/", b"\xc1", content_type=MSGPACK
+        )
+        assert response.status_code == 400
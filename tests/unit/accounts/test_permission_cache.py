@@ -0,0 +1,148 @@
+"""
+Cached permission sets of staff users, and their invalidation.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+
+User = get_user_model()
+
+VIEW_USER = "accounts.view_user"
+CHANGE_USER = "accounts.change_user"
+
+
+@pytest.fixture(autouse=True)
+def permission_cache(settings):
+    settings.PERMISSION_CACHE = {**settings.PERMISSION_CACHE, "ENABLED": True}
+    cache.clear()
+    yield settings.PERMISSION_CACHE
+    cache.clear()
+
+
+@pytest.fixture
+def editors(db):
+    group = Group.objects.create(name="editors")
+    group.permissions.add(Permission.objects.get(codename="view_user"))
+    return group
+
+
+@pytest.fixture
+def staff(staff_user, editors):
+    staff_user.groups.add(editors)
+    return staff_user
+
+
+def _fresh(user):
+    """A new instance of `user`, as each request loads one."""
+    return User.objects.get(pk=user.pk)
+
+
+def _permission_queries(queries) -> list[str]:
+    return [q["sql"] for q in queries if "auth_permission" in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestPermissionCache:
+    def test_permissions_are_read_from_the_cache(self, staff):
+        assert _fresh(staff).has_perm(VIEW_USER)
+
+        user = _fresh(staff)
+        with CaptureQueriesContext(connection) as queries:
+            assert user.has_perm(VIEW_USER)
+            assert not user.has_perm(CHANGE_USER)
+            assert user.has_module_perms("accounts")
+        assert len(queries) == 0
+
+    def test_hits_and_misses_are_counted(self, staff):
+        def lookups(result):
+            labels = {"cache": "permissions", "result": result}
+            return REGISTRY.get_sample_value("cache_lookups_total", labels) or 0
+
+        hits, misses = lookups("hit"), lookups("miss")
+
+        _fresh(staff).has_perm(VIEW_USER)
+        _fresh(staff).has_perm(VIEW_USER)
+
+        assert (lookups("hit"), lookups("miss")) == (hits + 1, misses + 1)
+
+    def test_admin_pages_run_no_permission_queries(self, client, staff):
+        client.force_login(staff)
+        assert client.get("/admin/accounts/user/").status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get("/admin/accounts/user/").status_code == 200
+        assert _permission_queries(queries) == []
+
+    def test_group_permission_changes(
+        self, staff, editors, django_capture_on_commit_callbacks
+    ):
+        _fresh(staff).has_perm(VIEW_USER)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            editors.permissions.add(Permission.objects.get(codename="change_user"))
+        assert _fresh(staff).has_perm(CHANGE_USER)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            editors.permissions.clear()
+        assert not _fresh(staff).has_perm(VIEW_USER)
+
+    def test_membership_and_user_permission_changes(
+        self, staff, editors, django_capture_on_commit_callbacks
+    ):
+        _fresh(staff).has_perm(VIEW_USER)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff.user_permissions.add(Permission.objects.get(codename="change_user"))
+        assert _fresh(staff).has_perm(CHANGE_USER)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            editors.user_set.remove(staff)
+        assert not _fresh(staff).has_perm(VIEW_USER)
+
+    def test_deleted_groups(self, staff, editors, django_capture_on_commit_callbacks):
+        _fresh(staff).has_perm(VIEW_USER)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            editors.delete()
+        assert not _fresh(staff).has_perm(VIEW_USER)
+
+    def test_stale_until_the_change_commits(self, staff, editors):
+        _fresh(staff).has_perm(VIEW_USER)
+
+        # No commit: a concurrent request must not cache the uncommitted state
+        editors.permissions.clear()
+        user = _fresh(staff)
+        with CaptureQueriesContext(connection) as queries:
+            user.has_perm(VIEW_USER)
+        assert len(queries) == 0
+
+    def test_superuser_flag_is_part_of_the_entry(self, staff):
+        _fresh(staff).get_all_permissions()
+        User.objects.filter(pk=staff.pk).update(is_superuser=True)
+
+        permissions = _fresh(staff).get_all_permissions()
+
+        assert CHANGE_USER in permissions
+
+    def test_non_staff_users_are_not_cached(self, regular_user, editors):
+        regular_user.groups.add(editors)
+        _fresh(regular_user).has_perm(VIEW_USER)
+
+        user = _fresh(regular_user)
+        with CaptureQueriesContext(connection) as queries:
+            assert user.has_perm(VIEW_USER)
+        assert len(_permission_queries(queries)) == 2
+
+    def test_disabled(self, staff, permission_cache):
+        permission_cache["ENABLED"] = False
+        _fresh(staff).has_perm(VIEW_USER)
+
+        user = _fresh(staff)
+        with CaptureQueriesContext(connection) as queries:
+            assert user.has_perm(VIEW_USER)
+        assert len(_permission_queries(queries)) == 2
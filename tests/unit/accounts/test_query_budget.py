@@ -0,0 +1,125 @@
+"""
+Query budgets for every accounts endpoint.
+
+Each request is made end-to-end with a JWT, so budgets include the user
+lookup done by JWTAuthentication. A budget failing means a change added
+queries; list budgets are checked at 10 and 1000 rows so per-row queries
+(N+1) fail even when they stay under the budget on a small table.
+"""
+
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.unit.conftest import make_test_jwt
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("mock_es256_key")]
+User = get_user_model()
+
+ENDPOINT = "/api/accounts/"
+
+# Maximum queries per request, authentication included
+BUDGETS = {
+    "list": 2,
+    "retrieve": 2,
+    "me": 1,
+    "create": 3,
+    "update": 3,
+    # Soft deletion (ACCOUNT_DELETION["SOFT"]) is a single UPDATE
+    "delete": 3,
+    # Cascades to related rows, and records a tombstone
+    "hard_delete": 8,
+}
+
+
+def _client_for(user):
+    client = APIClient()
+    token = make_test_jwt(email=user.email, user_id=str(user.auth_id))
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _count_queries(call):
+    with CaptureQueriesContext(connection) as ctx:
+        response = call()
+    assert response.status_code < 400, response.content
+    return len(ctx.captured_queries)
+
+
+def _seed(count):
+    call_command("seed_database", users=count, batch_size=500, stdout=io.StringIO())
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_user(
+        email="budget.staff@example.com",
+        is_staff=True,
+        auth_id="550e8400-e29b-41d4-a716-4466554400aa",
+    )
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(
+        email="budget.member@example.com",
+        auth_id="550e8400-e29b-41d4-a716-4466554400bb",
+    )
+
+
+@pytest.mark.parametrize("rows", [10, 1000])
+def test_list_budget(staff, rows):
+    _seed(rows)
+    client = _client_for(staff)
+    assert _count_queries(lambda: client.get(ENDPOINT)) <= BUDGETS["list"]
+
+
+def test_list_does_not_scale_with_rows(staff):
+    client = _client_for(staff)
+    _seed(10)
+    small = _count_queries(lambda: client.get(ENDPOINT))
+    _seed(990)
+    large = _count_queries(lambda: client.get(ENDPOINT))
+    assert large == small
+
+
+def test_retrieve_budget(staff, member):
+    client = _client_for(staff)
+    url = f"{ENDPOINT}{member.id}/"
+    assert _count_queries(lambda: client.get(url)) <= BUDGETS["retrieve"]
+
+
+def test_me_budget(member):
+    client = _client_for(member)
+    assert _count_queries(lambda: client.get(f"{ENDPOINT}me/")) <= BUDGETS["me"]
+
+
+def test_create_budget(staff):
+    client = _client_for(staff)
+    payload = {"email": "budget.new@example.com", "first_name": "New"}
+    assert _count_queries(lambda: client.post(ENDPOINT, payload)) <= BUDGETS["create"]
+
+
+def test_update_budget(member):
+    client = _client_for(member)
+    url = f"{ENDPOINT}{member.id}/"
+    payload = {"first_name": "Updated"}
+    assert _count_queries(lambda: client.patch(url, payload)) <= BUDGETS["update"]
+
+
+def test_delete_budget(staff, member):
+    client = _client_for(staff)
+    url = f"{ENDPOINT}{member.id}/"
+    assert _count_queries(lambda: client.delete(url)) <= BUDGETS["delete"]
+
+
+def test_hard_delete_budget(staff, member, settings):
+    settings.ACCOUNT_DELETION = {**settings.ACCOUNT_DELETION, "SOFT": False}
+    client = _client_for(staff)
+    url = f"{ENDPOINT}{member.id}/"
+    assert _count_queries(lambda: client.delete(url)) <= BUDGETS["hard_delete"]
@@ -0,0 +1,178 @@
+"""
+Soft deletion of accounts and the purge of deleted users.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tests.unit.conftest import make_test_jwt
+
+User = get_user_model()
+
+ENDPOINT = "/api/accounts/"
+
+
+def _deleted_users(count: int, days_ago: float = 40):
+    group = Group.objects.get_or_create(name="members")[0]
+    users = []
+    for i in range(count):
+        user = User.objects.create_user(email=f"gone{i}@example.com", password="x")
+        user.groups.add(group)
+        LogEntry.objects.log_actions(
+            user_id=user.pk,
+            queryset=[user],
+            action_flag=ADDITION,
+            single_object=True,
+        )
+        user.soft_delete()
+        users.append(user)
+    User.all_objects.filter(pk__in=[u.pk for u in users]).update(
+        deleted_at=timezone.now() - timedelta(days=days_ago)
+    )
+    return users
+
+
+def _purge(*args) -> str:
+    out = StringIO()
+    call_command("purge_deleted_users", "--pause", "0", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+    endpoint = ENDPOINT
+
+    def test_delete_marks_the_user_deleted(self, api_client, regular_user):
+        api_client.force_authenticate(user=regular_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.delete(f"{self.endpoint}{regular_user.id}/")
+
+        assert response.status_code == 204
+        assert not any(q["sql"].startswith("DELETE") for q in queries)
+        assert not User.objects.filter(pk=regular_user.pk).exists()
+        user = User.all_objects.get(pk=regular_user.pk)
+        assert user.deleted_at is not None
+        assert not user.is_active
+
+    def test_hard_delete_when_disabled(self, settings, api_client, regular_user):
+        settings.ACCOUNT_DELETION = {**settings.ACCOUNT_DELETION, "SOFT": False}
+        api_client.force_authenticate(user=regular_user)
+
+        response = api_client.delete(f"{self.endpoint}{regular_user.id}/")
+
+        assert response.status_code == 204
+        assert not User.all_objects.filter(pk=regular_user.pk).exists()
+
+    def test_deleted_users_are_hidden_from_the_api(
+        self, api_client, staff_user, regular_user
+    ):
+        regular_user.soft_delete()
+        api_client.force_authenticate(user=staff_user)
+
+        listed = api_client.get(self.endpoint)
+        detail = api_client.get(f"{self.endpoint}{regular_user.id}/")
+
+        assert regular_user.email not in [u["email"] for u in listed.data]
+        assert detail.status_code == 404
+
+    @pytest.mark.usefixtures("mock_es256_key")
+    def test_deleted_users_can_not_authenticate(self, regular_user):
+        regular_user.refresh_from_db()
+        client = APIClient()
+        token = make_test_jwt(
+            email=regular_user.email, user_id=str(regular_user.auth_id)
+        )
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert client.get(f"{self.endpoint}me/").status_code == 200
+
+        regular_user.soft_delete()
+
+        response = client.get(f"{self.endpoint}me/")
+        assert response.status_code == 403
+        assert response.data["detail"] == "User is not registered."
+
+    def test_email_is_taken_until_purged(self, api_client, staff_user, regular_user):
+        regular_user.soft_delete()
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(self.endpoint, {"email": regular_user.email})
+
+        assert response.status_code == 400
+        assert "email" in response.data
+
+    def test_auth_id_is_taken_until_purged(self, api_client, staff_user, regular_user):
+        regular_user.soft_delete()
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(
+            self.endpoint,
+            {"email": "new@example.com", "auth_id": str(regular_user.auth_id)},
+        )
+
+        assert response.status_code == 400
+        assert "auth_id" in response.data
+
+
+@pytest.mark.django_db
+class TestPurgeDeletedUsers:
+    def test_purges_users_and_related_rows_in_batches(self, regular_user):
+        users = _deleted_users(5)
+
+        output = _purge("--batch-size", "2")
+
+        assert "✓ Purged 5 user(s)" in output
+        assert "in 3 batch(es)" in output
+        assert not User.all_objects.filter(pk__in=[u.pk for u in users]).exists()
+        assert not LogEntry.objects.filter(user_id__in=[u.pk for u in users]).exists()
+        assert not User.groups.through.objects.exists()
+        assert User.objects.filter(pk=regular_user.pk).exists()
+
+    def test_only_purges_users_deleted_long_enough_ago(self):
+        old = _deleted_users(2, days_ago=40)
+        recent = User.objects.create_user(email="recent@example.com", password="x")
+        recent.soft_delete()
+
+        _purge("--older-than", "30")
+
+        assert not User.all_objects.filter(pk__in=[u.pk for u in old]).exists()
+        assert User.all_objects.filter(pk=recent.pk).exists()
+
+    def test_keeps_recently_deleted_users_by_default(self):
+        old = _deleted_users(2, days_ago=40)
+        recent = User.objects.create_user(email="recent@example.com", password="x")
+        recent.soft_delete()
+
+        _purge()
+
+        assert not User.all_objects.filter(pk__in=[u.pk for u in old]).exists()
+        assert User.all_objects.filter(pk=recent.pk).exists()
+
+    def test_limit(self):
+        _deleted_users(5)
+
+        _purge("--batch-size", "2", "--limit", "3")
+
+        assert User.all_objects.count() == 2
+
+    def test_dry_run(self):
+        _deleted_users(2)
+
+        output = _purge("--dry-run")
+
+        assert "2 deleted user(s) would be purged." in output
+        assert User.all_objects.count() == 2
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(CommandError, match="--batch-size"):
+            _purge("--batch-size", "0")
@@ -0,0 +1,176 @@
+"""
+Bulk sync of users from an identity provider export (sync_auth_users).
+"""
+
+import gzip
+import io
+import json
+import uuid
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+
+AUTH_IDS = [uuid.UUID(int=i) for i in range(1, 11)]
+
+
+def _jsonl(*records) -> str:
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def _sync(tmp_path, content: str, *args, name="users.jsonl"):
+    path = tmp_path / name
+    if name.endswith(".gz"):
+        path.write_bytes(gzip.compress(content.encode()))
+    else:
+        path.write_text(content)
+    out, err = io.StringIO(), io.StringIO()
+    call_command("sync_auth_users", str(path), *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db
+class TestSyncAuthUsers:
+    def test_creates_users(self, tmp_path):
+        content = _jsonl(
+            {
+                "id": str(AUTH_IDS[0]),
+                "email": "Ann@Example.com",
+                "created_at": "2025-01-02T03:04:05+00:00",
+                "raw_user_meta_data": {"first_name": "Ann", "last_name": "Lee"},
+            },
+            {"id": str(AUTH_IDS[1]), "email": "bob@example.com"},
+        )
+
+        out, _ = _sync(tmp_path, content)
+
+        assert "Created 2, updated 0, unchanged 0, conflicting 0, invalid 0" in out
+        ann = User.objects.get(auth_id=AUTH_IDS[0])
+        assert ann.email == "ann@example.com"
+        assert (ann.first_name, ann.last_name) == ("Ann", "Lee")
+        assert ann.date_joined.year == 2025
+        assert not ann.has_usable_password()
+
+    def test_updates_by_auth_id_and_skips_unchanged(self, tmp_path):
+        old = User.objects.create_user(email="old@example.com", auth_id=AUTH_IDS[0])
+        same = User.objects.create_user(email="same@example.com", auth_id=AUTH_IDS[1])
+        content = _jsonl(
+            {"id": str(AUTH_IDS[0]), "email": "new@example.com"},
+            {"id": str(AUTH_IDS[1]), "email": "same@example.com"},
+        )
+
+        out, _ = _sync(tmp_path, content)
+
+        assert "Created 0, updated 1, unchanged 1" in out
+        updated = User.objects.get(auth_id=AUTH_IDS[0])
+        assert updated.email == "new@example.com"
+        # Moved in the change feed; unchanged users stay put
+        assert updated.updated_at > old.updated_at
+        assert User.objects.get(pk=same.pk).updated_at == same.updated_at
+
+    def test_links_existing_users_by_email(self, tmp_path):
+        local = User.objects.create_user(email="ann@example.com", first_name="A")
+        content = _jsonl({"id": str(AUTH_IDS[0]), "email": "ANN@example.com"})
+
+        out, _ = _sync(tmp_path, content)
+
+        assert "Created 0, updated 1" in out
+        local.refresh_from_db()
+        assert local.auth_id == AUTH_IDS[0]
+        assert local.first_name == ""  # names follow the identity provider
+
+    def test_reports_conflicts(self, tmp_path):
+        User.objects.create_user(email="taken@example.com", auth_id=AUTH_IDS[0])
+        deleted = User.objects.create_user(
+            email="gone@example.com", auth_id=AUTH_IDS[1]
+        )
+        deleted.soft_delete()
+        content = _jsonl(
+            {"id": str(AUTH_IDS[2]), "email": "taken@example.com"},
+            {"id": str(AUTH_IDS[1]), "email": "gone@example.com"},
+            {"id": str(AUTH_IDS[3]), "email": "twice@example.com"},
+            {"id": str(AUTH_IDS[4]), "email": "twice@example.com"},
+        )
+
+        out, err = _sync(tmp_path, content)
+
+        assert "Created 1, updated 0, unchanged 0, conflicting 3" in out
+        assert (
+            f"the email belongs to user {User.objects.get(auth_id=AUTH_IDS[0]).pk}"
+            in err
+        )
+        assert "the user is deleted" in err
+        assert "the email appears twice" in err
+
+    def test_reports_invalid_records(self, tmp_path):
+        content = (
+            _jsonl({"id": "not-a-uuid", "email": "a@example.com"})
+            + "{not json\n\n"
+            + _jsonl({"id": str(AUTH_IDS[0]), "email": "not-an-email"})
+            + _jsonl({"id": str(AUTH_IDS[1]), "email": "ok@example.com"})
+        )
+
+        out, err = _sync(tmp_path, content)
+
+        assert "Created 1, updated 0, unchanged 0, conflicting 0, invalid 3" in out
+        assert "Record 1: invalid user" in err
+
+    def test_csv_with_metadata_json(self, tmp_path):
+        content = (
+            "id,email,raw_user_meta_data\n"
+            f'{AUTH_IDS[0]},ann@example.com,"{{""first_name"": ""Ann""}}"\n'
+            f"{AUTH_IDS[1]},bob@example.com,\n"
+        )
+
+        out, _ = _sync(tmp_path, content, name="users.csv.gz")
+
+        assert "Created 2" in out
+        assert User.objects.get(auth_id=AUTH_IDS[0]).first_name == "Ann"
+
+    def test_reads_stdin(self):
+        content = _jsonl({"id": str(AUTH_IDS[0]), "email": "ann@example.com"})
+        stdin = io.TextIOWrapper(io.BytesIO(content.encode()))
+        out = io.StringIO()
+
+        with mock.patch("sys.stdin", stdin):
+            call_command("sync_auth_users", "-", stdout=out)
+
+        assert "Created 1" in out.getvalue()
+
+    def test_one_select_and_one_upsert_per_batch(self, tmp_path):
+        User.objects.create_user(email="u0@example.com", auth_id=AUTH_IDS[0])
+        content = _jsonl(
+            *(
+                {"id": str(auth_id), "email": f"u{i}@example.com", "first_name": "N"}
+                for i, auth_id in enumerate(AUTH_IDS)
+            )
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            out, _ = _sync(tmp_path, content, "--batch-size", "4")
+
+        assert "Created 9, updated 1" in out
+        statements = [
+            q["sql"].split()[0]
+            for q in queries
+            if q["sql"].startswith(("SELECT", "INSERT", "UPDATE"))
+        ]
+        assert statements == ["SELECT", "INSERT"] * 3
+        assert User.objects.filter(first_name="N").count() == 10
+
+    def test_dry_run(self, tmp_path):
+        content = _jsonl({"id": str(AUTH_IDS[0]), "email": "ann@example.com"})
+
+        out, _ = _sync(tmp_path, content, "--dry-run")
+
+        assert "[dry run] Created 1" in out
+        assert not User.objects.exists()
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError, match="Can't read"):
+            call_command("sync_auth_users", str(tmp_path / "missing.jsonl"))
@@ -0,0 +1,277 @@
+"""
+Per-user throttling of the accounts endpoints, checked before the user is
+loaded from the DB.
+"""
+
+import threading
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from app.core import throttling
+from app.core.throttling import SlidingWindowCounter, parse_rate
+from app.jwt_auth import authentication
+from tests.unit.conftest import make_test_jwt
+
+ENDPOINT = "/api/accounts/"
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters():
+    throttling.counter.clear()
+    cache.clear()
+    yield
+    throttling.counter.clear()
+    cache.clear()
+
+
+@pytest.fixture
+def rates(settings):
+    def _set(**rates):
+        settings.THROTTLING = {
+            **settings.THROTTLING,
+            "SYNC_INTERVAL": 60.0,
+            "RATES": {key.replace("__", "."): rate for key, rate in rates.items()},
+        }
+
+    return _set
+
+
+def _client(email: str, user_id: str):
+    client = APIClient()
+    token = make_test_jwt(email=email, user_id=user_id)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+class TestSlidingWindowCounter:
+    def test_parse_rate(self):
+        assert parse_rate("10/s") == (10, 1)
+        assert parse_rate("100/min") == (100, 60)
+        assert parse_rate("5/hour") == (5, 3600)
+        assert parse_rate("1/d") == (1, 86400)
+
+    def test_allows_up_to_the_limit(self):
+        counter = SlidingWindowCounter()
+        with mock.patch.object(throttling.time, "time", return_value=6000.0):
+            statuses = [counter.hit("k", 3, 60) for _ in range(4)]
+
+        assert [s.allowed for s in statuses] == [True, True, True, False]
+        assert [s.remaining for s in statuses] == [2, 1, 0, 0]
+        assert statuses[-1].retry_after == 60
+        assert statuses[0].reset == 60
+
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        counter = SlidingWindowCounter()
+        with mock.patch.object(throttling.time, "time", return_value=6000.0):
+            for _ in range(10):
+                counter.hit("k", 10, 60)
+
+        # Half-way through the next window, half of the previous 10 count
+        with mock.patch.object(throttling.time, "time", return_value=6090.0):
+            statuses = [counter.hit("k", 10, 60) for _ in range(6)]
+
+        assert [s.allowed for s in statuses] == [True] * 5 + [False]
+        # 5 hits expire, and one of them frees a slot, after 6 seconds
+        assert statuses[-1].retry_after == 6
+
+    def test_processes_share_counts_through_the_cache(self, settings):
+        settings.THROTTLING = {**settings.THROTTLING, "SYNC_INTERVAL": 1.0}
+        first, second = SlidingWindowCounter(), SlidingWindowCounter()
+
+        with mock.patch.object(throttling.time, "time", return_value=6000.0):
+            assert all(first.hit("k", 4, 60).allowed for _ in range(4))
+        with mock.patch.object(throttling.time, "time", return_value=6002.0):
+            # The first process syncs its pending hits on its next check
+            assert not first.hit("k", 4, 60).allowed
+            assert not second.hit("k", 4, 60).allowed
+
+    def test_syncs_often_enough_to_bound_overshoot(self, settings):
+        settings.THROTTLING = {**settings.THROTTLING, "SYNC_INTERVAL": 60.0}
+        first, second = SlidingWindowCounter(), SlidingWindowCounter()
+
+        with mock.patch.object(throttling.time, "time", return_value=6000.0):
+            allowed = sum(
+                counter.hit("k", 40, 60).allowed
+                for _ in range(40)
+                for counter in (first, second)
+            )
+
+        # Both sync every 2 hits (5% of the limit), so neither goes far over
+        assert 40 <= allowed <= 42
+
+    def test_cache_round_trips_are_made_outside_the_lock(self):
+        counter = SlidingWindowCounter()
+        locked = []
+
+        def get_many(keys):
+            locked.append(counter._lock.locked())
+            return {}
+
+        with mock.patch.object(cache, "get_many", side_effect=get_many):
+            counter.hit("k", 10, 60)
+
+        assert locked == [False]
+
+    def test_other_threads_do_not_wait_for_a_slow_sync(self):
+        counter = SlidingWindowCounter()
+        syncing, release = threading.Event(), threading.Event()
+        get_many = cache.get_many
+
+        def slow_get_many(keys):
+            syncing.set()
+            release.wait(5)
+            return get_many(keys)
+
+        with (
+            mock.patch.object(throttling.time, "time", return_value=6000.0),
+            # Cache handles are per thread: patch them all
+            mock.patch.object(
+                type(caches["default"]), "get_many", side_effect=slow_get_many
+            ),
+        ):
+            first = threading.Thread(target=counter.hit, args=("k", 10, 60))
+            first.start()
+            assert syncing.wait(5)
+            # Answered from this process's counts, while the first one syncs
+            assert counter.hit("k", 10, 60).remaining == 9
+            release.set()
+            first.join(5)
+
+            # Neither hit is lost in the merge
+            assert counter.hit("k", 10, 60).remaining == 7
+
+    def test_cache_failures_fail_open(self, caplog):
+        counter = SlidingWindowCounter()
+
+        with (
+            mock.patch.object(throttling.time, "time", return_value=6000.0),
+            mock.patch.object(
+                type(caches["default"]),
+                "get_many",
+                side_effect=ConnectionError("cache down"),
+            ) as get_many,
+        ):
+            statuses = [counter.hit("k", 3, 60) for _ in range(4)]
+
+        # Counted locally, and not retried before the next sync interval
+        assert [s.allowed for s in statuses] == [True, True, True, False]
+        assert get_many.call_count == 1
+        assert "Rate limit sync failed" in caplog.text
+
+        # The local hits reach the cache once it is back
+        with mock.patch.object(throttling.time, "time", return_value=6030.0):
+            counter.hit("k", 3, 60)
+            assert caches["default"].get("throttle:k:100") == 3
+
+
+@pytest.mark.usefixtures("mock_es256_key")
+class TestAccountThrottling:
+    def test_rate_limit_headers(self, rates, regular_user):
+        rates(accounts="10/min")
+        client = _client(regular_user.email, str(regular_user.auth_id))
+
+        response = client.get(f"{ENDPOINT}me/")
+
+        assert response.status_code == 200
+        assert response["RateLimit-Limit"] == "10"
+        assert response["RateLimit-Remaining"] == "9"
+        assert 1 <= int(response["RateLimit-Reset"]) <= 60
+
+    def test_throttled_response_has_retry_after(self, rates, regular_user):
+        rates(accounts="2/min")
+        client = _client(regular_user.email, str(regular_user.auth_id))
+
+        assert client.get(f"{ENDPOINT}me/").status_code == 200
+        assert client.get(f"{ENDPOINT}me/").status_code == 200
+        response = client.get(f"{ENDPOINT}me/")
+
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) >= 1
+        assert response["RateLimit-Remaining"] == "0"
+
+    def test_rejected_requests_cost_no_db_work(self, rates, regular_user):
+        rates(accounts="1/min")
+        client = _client(regular_user.email, str(regular_user.auth_id))
+        client.get(f"{ENDPOINT}me/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f"{ENDPOINT}me/")
+
+        assert response.status_code == 429
+        assert len(queries) == 0
+
+    def test_jwt_is_decoded_once_per_request(self, rates, regular_user):
+        rates(accounts="10/min")
+        client = _client(regular_user.email, str(regular_user.auth_id))
+
+        with mock.patch(
+            "app.jwt_auth.authentication.decode_jwt_auth_jwt",
+            wraps=authentication.decode_jwt_auth_jwt,
+        ) as decode:
+            assert client.get(f"{ENDPOINT}me/").status_code == 200
+
+        assert decode.call_count == 1
+
+    def test_rates_per_action(self, rates, staff_user):
+        rates(accounts="10/min", accounts__list="1/min")
+        staff_user.auth_id = uuid.uuid4()
+        staff_user.save(update_fields=["auth_id"])
+        client = _client(staff_user.email, str(staff_user.auth_id))
+
+        assert client.get(ENDPOINT).status_code == 200
+        assert client.get(ENDPOINT).status_code == 429
+        response = client.get(f"{ENDPOINT}me/")
+        assert response.status_code == 200
+        assert response["RateLimit-Limit"] == "10"
+
+    def test_subjects_are_throttled_separately(self, rates, regular_user, another_user):
+        rates(accounts="1/min")
+        first = _client(regular_user.email, str(regular_user.auth_id))
+        second = _client(another_user.email, str(another_user.auth_id))
+
+        assert first.get(f"{ENDPOINT}me/").status_code == 200
+        assert first.get(f"{ENDPOINT}me/").status_code == 429
+        assert second.get(f"{ENDPOINT}me/").status_code == 200
+
+    def test_session_users_are_throttled_separately(
+        self, rates, regular_user, another_user
+    ):
+        rates(accounts="1/min")
+        first, second = APIClient(), APIClient()
+        first.force_login(regular_user)
+        second.force_login(another_user)
+
+        assert first.get(f"{ENDPOINT}me/").status_code == 200
+        assert first.get(f"{ENDPOINT}me/").status_code == 429
+        assert second.get(f"{ENDPOINT}me/").status_code == 200
+
+    def test_invalid_tokens_are_throttled_by_ip(self, rates, db):
+        rates(accounts="1/min")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer not-a-jwt")
+
+        assert client.get(f"{ENDPOINT}me/").status_code == 403
+        assert client.get(f"{ENDPOINT}me/").status_code == 429
+
+    def test_unregistered_subjects_are_throttled(self, rates, db):
+        rates(accounts="1/min")
+        client = _client("ghost@example.com", str(uuid.uuid4()))
+
+        assert client.get(f"{ENDPOINT}me/").status_code == 403
+        assert client.get(f"{ENDPOINT}me/").status_code == 429
+
+    def test_disabled(self, rates, settings, regular_user):
+        rates(accounts="1/min")
+        settings.THROTTLING = {**settings.THROTTLING, "ENABLED": False}
+        client = _client(regular_user.email, str(regular_user.auth_id))
+
+        for _ in range(3):
+            response = client.get(f"{ENDPOINT}me/")
+            assert response.status_code == 200
+        assert "RateLimit-Limit" not in response
@@ -1,5 +1,6 @@
 """
-Pytest configuration for JWT authentication tests.
+Fixtures shared by the unit tests: users, an API client, and an ES256 key
+pair standing for the auth provider's (see make_test_jwt).
 """
 
 import json
@@ -10,7 +11,13 @@ import pytest
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from jwt.algorithms import ECAlgorithm
+from rest_framework.test import APIClient
+
+from app.accounts import activity
+
+User = get_user_model()
 
 # Generate ES256 test keys for JWT authentication
 _test_private_key = ec.generate_private_key(ec.SECP256R1())
@@ -25,12 +32,10 @@ TEST_ES256_PRIVATE_KEY = _test_private_key.private_bytes(
 
 
 @pytest.fixture(autouse=True)
-def mock_es256_key(request, monkeypatch):
+def mock_es256_key(monkeypatch):
     """
     Automatically mock the ES256 public key for JWT tests.
     This allows tests to generate and verify JWTs with test keys.
-
-    Skips mocking for integration tests (marked with @pytest.mark.integration).
     """
 
     # Create JWK from public key
@@ -49,3 +54,44 @@ def make_test_jwt(email: str, user_id: str, exp_minutes: int = 60) -> str:
         "exp": datetime.now(UTC) + timedelta(minutes=exp_minutes),
     }
     return jwt.encode(payload, TEST_ES256_PRIVATE_KEY, algorithm="ES256")
+
+
+@pytest.fixture(autouse=True)
+def no_activity_tracking(monkeypatch):
+    """
+    Keep the write-behind activity thread out of tests (it writes from
+    another thread, outside the test's transaction); its tests opt in.
+    """
+    monkeypatch.setattr(activity, "record", lambda user_id, seen_at=None: None)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def staff_user(db):
+    return User.objects.create_user(
+        email="admin@example.com", password="adminpass", is_staff=True
+    )
+
+
+@pytest.fixture
+def regular_user(db):
+    return User.objects.create_user(
+        email="user@example.com",
+        password="userpass",
+        is_staff=False,
+        auth_id="550e8400-e29b-41d4-a716-446655440000",
+    )
+
+
+@pytest.fixture
+def another_user(db):
+    return User.objects.create_user(
+        email="another@example.com",
+        password="userpass",
+        is_staff=False,
+        auth_id="550e8400-e29b-41d4-a716-446655440001",
+    )
@@ -0,0 +1,163 @@
+"""
+Response compression: negotiation, thresholds and streaming.
+"""
+
+import gzip
+import json
+
+import brotli
+import pytest
+import zstandard
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+
+from app.core import compression
+from app.core.compression import GzipCompressor, negotiate
+from app.core.middleware.compression import CompressionMiddleware
+
+BODY = json.dumps([{"email": f"user{i}@example.com"} for i in range(200)]).encode()
+
+DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def _respond(response, accept="gzip, deflate, br, zstd"):
+    middleware = CompressionMiddleware(lambda request: response)
+    request = RequestFactory().get("/api/accounts/", HTTP_ACCEPT_ENCODING=accept)
+    return middleware(request)
+
+
+def _json(body=BODY, **kwargs):
+    return HttpResponse(body, content_type="application/json", **kwargs)
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("gzip, br", "br"),
+            ("gzip", "gzip"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("zstd;q=0, br;q=0, *", "gzip"),
+            ("*;q=0", None),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_picks_the_preferred_accepted_coding(self, accept, expected):
+        assert negotiate(accept, ["zstd", "br", "gzip"]) == expected
+
+
+class TestCompressionMiddleware:
+    @pytest.mark.parametrize("coding", ["gzip", "br", "zstd"])
+    def test_compresses_with_the_negotiated_coding(self, coding):
+        response = _respond(_json(), accept=coding)
+
+        assert response["Content-Encoding"] == coding
+        assert response["Vary"] == "Accept-Encoding"
+        assert int(response["Content-Length"]) == len(response.content)
+        assert len(response.content) < len(BODY) / 5
+        assert DECOMPRESS[coding](response.content) == BODY
+
+    def test_level_is_configurable(self, settings, monkeypatch):
+        levels = []
+
+        def compressor(level):
+            levels.append(level)
+            return GzipCompressor(level)
+
+        monkeypatch.setitem(compression.CODINGS, "gzip", compressor)
+        settings.COMPRESSION = {
+            **settings.COMPRESSION,
+            "LEVELS": {**settings.COMPRESSION["LEVELS"], "gzip": 9},
+        }
+
+        response = _respond(_json(), accept="gzip")
+
+        assert levels == [9]
+        assert gzip.decompress(response.content) == BODY
+
+    def test_small_bodies_are_left_alone(self):
+        response = _respond(_json(b'{"id": 1}'))
+
+        assert not response.has_header("Content-Encoding")
+        assert response["Vary"] == "Accept-Encoding"
+
+    def test_other_content_types_are_left_alone(self):
+        response = _respond(HttpResponse(BODY, content_type="text/html"))
+
+        assert not response.has_header("Content-Encoding")
+        assert not response.has_header("Vary")
+
+    def test_encoded_responses_are_left_alone(self):
+        payload = gzip.compress(BODY)
+        response = _json(payload)
+        response["Content-Encoding"] = "gzip"
+
+        response = _respond(response, accept="zstd")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response.content == payload
+
+    def test_client_without_a_supported_coding(self):
+        response = _respond(_json(), accept="identity")
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == BODY
+
+    def test_strong_etags_are_weakened(self):
+        response = _json()
+        response["ETag"] = '"abc"'
+
+        assert _respond(response)["ETag"] == 'W/"abc"'
+
+    def test_disabled(self, settings):
+        settings.COMPRESSION = {**settings.COMPRESSION, "ENABLED": False}
+
+        assert not _respond(_json()).has_header("Content-Encoding")
+
+    def test_streaming_is_compressed_as_it_is_sent(self):
+        rows_sent = 0
+
+        def rows():
+            nonlocal rows_sent
+            for i in range(20000):
+                rows_sent += 1
+                yield json.dumps({"id": i, "email": f"user{i}@example.com"}) + "\n"
+
+        response = _respond(
+            StreamingHttpResponse(rows(), content_type="application/x-ndjson"),
+            accept="gzip",
+        )
+
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        chunks = iter(response.streaming_content)
+        first = next(chunks)
+        # Not buffered: output starts long before the last row is produced
+        assert rows_sent < 20000
+        body = gzip.decompress(first + b"".join(chunks))
+        assert body.count(b"\n") == 20000
+
+    def test_async_streaming(self):
+        async def rows():
+            for i in range(1000):
+                yield f"{i}\n".encode()
+
+        async def get_response(request):
+            return StreamingHttpResponse(rows(), content_type="text/plain")
+
+        async def fetch():
+            request = AsyncRequestFactory().get("/", headers={"Accept-Encoding": "br"})
+            response = await CompressionMiddleware(get_response)(request)
+            return response, b"".join([chunk async for chunk in response])
+
+        response, body = async_to_sync(fetch)()
+
+        assert response["Content-Encoding"] == "br"
+        assert brotli.decompress(body).count(b"\n") == 1000
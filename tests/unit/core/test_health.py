@@ -0,0 +1,107 @@
+"""
+Liveness and readiness probes.
+"""
+
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, Client
+from django.test.utils import CaptureQueriesContext
+
+from app.core import health
+from app.core.middleware.health import HealthCheckMiddleware
+
+
+@pytest.fixture(autouse=True)
+def fresh_report():
+    health.clear()
+    yield
+    health.clear()
+
+
+def _async_get(path):
+    async def get_response(request):
+        return HttpResponse(status=404)
+
+    middleware = HealthCheckMiddleware(get_response)
+    return async_to_sync(middleware)(AsyncRequestFactory().get(path))
+
+
+class TestLiveness:
+    def test_answers_without_touching_the_database(self, monkeypatch):
+        def fail(self):
+            raise AssertionError("liveness must not touch the database")
+
+        monkeypatch.setattr(BaseDatabaseWrapper, "ensure_connection", fail)
+
+        response = Client().get("/healthz")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert response["Cache-Control"] == "no-store"
+
+    def test_skips_the_rest_of_the_stack(self, settings):
+        settings.ALLOWED_HOSTS = ["api.example.com"]
+
+        response = Client().get("/healthz", HTTP_HOST="10.0.0.7")
+
+        assert response.status_code == 200
+        assert "X-Request-ID" not in response
+        assert "Set-Cookie" not in response
+
+    def test_other_methods_fall_through(self):
+        assert Client().post("/healthz").status_code == 404
+
+    def test_async_mode(self):
+        response = _async_get("/healthz")
+
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestReadiness:
+    def test_ready(self):
+        response = Client().get("/readyz")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ok"
+        assert set(body["checks"]) == {"database", "cache", "jwt_key"}
+        assert all(check["ok"] for check in body["checks"].values())
+
+    def test_unavailable_when_a_check_fails(self, settings):
+        settings.JWT_AUTH = {**settings.JWT_AUTH, "ES256_PUBLIC_JWK": None}
+
+        response = Client().get("/readyz")
+
+        assert response.status_code == 503
+        body = json.loads(response.content)
+        assert body["status"] == "unavailable"
+        assert body["checks"]["jwt_key"] == {
+            "ok": False,
+            "error": "AuthenticationFailed",
+            "ms": body["checks"]["jwt_key"]["ms"],
+        }
+        assert body["checks"]["database"]["ok"]
+
+    def test_report_is_reused_within_the_ttl(self, settings, monkeypatch):
+        client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(20):
+                assert client.get("/readyz").status_code == 200
+        assert len(queries) == 1
+
+        monkeypatch.setattr(health.time, "monotonic", lambda: 1e12)
+        with CaptureQueriesContext(connection) as queries:
+            client.get("/readyz")
+        assert len(queries) == 1
+
+    def test_async_mode(self):
+        response = _async_get("/readyz")
+
+        assert response.status_code == 200
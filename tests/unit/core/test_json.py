@@ -0,0 +1,135 @@
+import datetime
+import decimal
+import io
+import uuid
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from app.accounts.serializers import UserSerializer
+from app.core import parsers, renderers
+from app.core.parsers import ORJSONParser
+from app.core.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+UTC_NOW = datetime.datetime(2026, 10, 19, 8, 30, 15, 123456, tzinfo=datetime.UTC)
+
+RENDER_CASES = {
+    "uuid": {"id": uuid.UUID("550e8400-e29b-41d4-a716-446655440000")},
+    "utc_datetime": {"at": UTC_NOW},
+    "datetime_without_micro": {"at": UTC_NOW.replace(microsecond=0)},
+    "naive_datetime": {"at": UTC_NOW.replace(tzinfo=None)},
+    "other_timezone": {"at": UTC_NOW.astimezone(ZoneInfo("America/Montevideo"))},
+    "date_time_timedelta": {
+        "date": UTC_NOW.date(),
+        "time": UTC_NOW.time(),
+        "delta": datetime.timedelta(hours=1, microseconds=5),
+    },
+    "decimal": {"price": decimal.Decimal("12.50")},
+    "lazy_string": {"message": gettext_lazy("This field is required.")},
+    "unicode": {"name": "José Ñandú 日本 🎉", "sep": "a b c"},
+    "escapes": {"text": 'quote " backslash \\ tab \t newline \n nul \x00'},
+    "bytes": {"blob": b"raw"},
+    "numbers": {"int": -(2**63), "float": 1.5, "big": 2**70, "bool": True},
+    "non_str_keys": {1: "one", None: "none"},
+    "containers": {"tuple": (1, 2), "set": {3}, "empty": [], "nested": {}},
+    "drf_containers": ReturnDict(
+        {"items": ReturnList([1, 2], serializer=None)}, serializer=None
+    ),
+    "top_level_list": [1, "two", None],
+    "scalar": "just a string",
+}
+
+
+def render_both(data, *args):
+    return JSONRenderer().render(data, *args), ORJSONRenderer().render(data, *args)
+
+
+class TestORJSONRenderer:
+    @pytest.mark.parametrize("data", RENDER_CASES.values(), ids=RENDER_CASES.keys())
+    def test_output_is_identical(self, data):
+        expected, rendered = render_both(data)
+        assert rendered == expected
+
+    def test_none_renders_empty(self):
+        assert ORJSONRenderer().render(None) == b""
+
+    def test_indented_output_is_identical(self):
+        expected, rendered = render_both(
+            RENDER_CASES["uuid"], "application/json; indent=4"
+        )
+        assert rendered == expected
+        assert b"\n" in rendered
+
+    def test_unsupported_values_raise_like_json_renderer(self):
+        data = {"at": datetime.time(8, 30, tzinfo=datetime.UTC)}
+        with pytest.raises(ValueError, match="timezone-aware times"):
+            ORJSONRenderer().render(data)
+
+    @pytest.mark.django_db
+    def test_user_list_is_identical(self):
+        for n in range(5):
+            User.objects.create_user(
+                email=f"user{n}@example.com",
+                first_name="Zoë",
+                auth_id=uuid.uuid4(),
+            )
+        data = UserSerializer(User.objects.all(), many=True).data
+        expected, rendered = render_both(data)
+        assert rendered == expected
+
+    def test_falls_back_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, "orjson", None)
+        for data in RENDER_CASES.values():
+            expected, rendered = render_both(data)
+            assert rendered == expected
+
+
+PARSE_CASES = [
+    b'{"id": "550e8400-e29b-41d4-a716-446655440000", "n": [1, 2.5, null]}',
+    '{"name": "José 🎉", "sep": " "}'.encode(),
+    b'{"big": 123456789012345678901234567890}',
+    b'{"dup": 1, "dup": 2}',
+    b'"scalar"',
+]
+
+
+def parse(parser, body: bytes, **context):
+    return parser.parse(io.BytesIO(body), "application/json", context)
+
+
+class TestORJSONParser:
+    @pytest.mark.parametrize("body", PARSE_CASES)
+    def test_result_is_identical(self, body):
+        assert parse(ORJSONParser(), body) == parse(JSONParser(), body)
+
+    @pytest.mark.parametrize("body", [b"", b"{bad", b'{"x": NaN}', b"\xff"])
+    def test_errors_are_identical(self, body):
+        with pytest.raises(ParseError) as expected:
+            parse(JSONParser(), body)
+        with pytest.raises(ParseError) as raised:
+            parse(ORJSONParser(), body)
+        assert str(raised.value) == str(expected.value)
+
+    def test_other_encodings(self):
+        body = '{"name": "José"}'.encode("latin-1")
+        assert parse(ORJSONParser(), body, encoding="latin-1") == {"name": "José"}
+
+    def test_falls_back_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(parsers, "orjson", None)
+        assert parse(ORJSONParser(), PARSE_CASES[0]) == parse(
+            JSONParser(), PARSE_CASES[0]
+        )
+
+
+def test_registered_as_defaults():
+    assert api_settings.DEFAULT_RENDERER_CLASSES[0] is ORJSONRenderer
+    assert api_settings.DEFAULT_PARSER_CLASSES[0] is ORJSONParser
@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from jwt.algorithms import ECAlgorithm
+
+
+@pytest.fixture
+def signing_key(tmp_path, monkeypatch):
+    """A key created by --init-key, trusted by the (live) server."""
+    path = tmp_path / "loadtest-key.pem"
+    call_command("loadtest", init_key=str(path), stdout=io.StringIO())
+    private_key = serialization.load_pem_private_key(path.read_bytes(), None)
+    jwk = json.loads(ECAlgorithm.to_jwk(private_key.public_key()))
+    monkeypatch.setitem(settings.JWT_AUTH, "ES256_PUBLIC_JWK", jwk)
+    return path
+
+
+def _loadtest(**options) -> dict:
+    stdout = io.StringIO()
+    call_command("loadtest", stdout=stdout, **options)
+    return json.loads(stdout.getvalue())
+
+
+def test_reports_throughput_and_latency(live_server, signing_key):
+    call_command("seed_database", users=5, stdout=io.StringIO())
+    report = _loadtest(
+        url=live_server.url,
+        key=str(signing_key),
+        concurrency=2,
+        duration=1.0,
+        warmup=0,
+        seed=1,
+    )
+    assert report["requests"] > 0
+    assert report["throughput_rps"] > 0
+    assert report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"]
+    assert report["errors"] == {}
+    assert report["exceptions"] == {}
+    assert set(report["by_request"]) <= {"me", "retrieve", "list", "update"}
+
+
+def test_errors_are_broken_down_by_status(live_server, signing_key, monkeypatch):
+    call_command("seed_database", users=2, stdout=io.StringIO())
+    # Server no longer trusts the key: every request is rejected
+    monkeypatch.setitem(settings.JWT_AUTH, "ES256_PUBLIC_JWK", None)
+    report = _loadtest(
+        url=live_server.url,
+        key=str(signing_key),
+        mix="me=1",
+        concurrency=1,
+        duration=0.5,
+        warmup=0,
+    )
+    assert report["by_request"]["me"]["errors"].keys() == {"403"}
+
+
+@pytest.mark.django_db
+def test_requires_seeded_users(signing_key):
+    with pytest.raises(CommandError, match="No users"):
+        _loadtest(key=str(signing_key), duration=1)
+
+
+@pytest.mark.parametrize("mix", ["me=x", "unknown=5", "me=0"])
+def test_rejects_invalid_mix(signing_key, mix):
+    with pytest.raises(CommandError):
+        _loadtest(key=str(signing_key), mix=mix)
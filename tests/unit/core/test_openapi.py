@@ -0,0 +1,110 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from app.core import openapi
+from app.core.views import openapi_schema_view
+
+# A dev dependency, configured by the dev settings only
+pytest.importorskip("drf_spectacular")
+
+
+@pytest.fixture(autouse=True)
+def schema_cache(settings, tmp_path, monkeypatch):
+    """Fresh in-memory and file caches, and a count of schema generations."""
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    }
+    settings.OPENAPI_SCHEMA = {"CACHE_DIR": tmp_path, "CODE_VERSION": "v1"}
+    monkeypatch.setattr(openapi, "_document", None)
+
+    calls = []
+    generate = openapi.generate_schema
+
+    def counting_generate():
+        calls.append(1)
+        return generate()
+
+    monkeypatch.setattr(openapi, "generate_schema", counting_generate)
+    return calls
+
+
+def get(**headers):
+    return openapi_schema_view(RequestFactory().get("/api/schema/", headers=headers))
+
+
+class TestOpenApiSchemaView:
+    def test_serves_the_generated_schema(self):
+        response = get()
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/vnd.oai.openapi+json"
+        assert "/api/accounts/" in json.loads(response.content)["paths"]
+
+    def test_generated_once_per_code_version(self, schema_cache, settings):
+        first, second = get(), get()
+        assert len(schema_cache) == 1
+        assert first.content == second.content
+
+        settings.OPENAPI_SCHEMA = {**settings.OPENAPI_SCHEMA, "CODE_VERSION": "v2"}
+        get()
+        assert len(schema_cache) == 2
+
+    def test_strong_etag_and_not_modified(self):
+        etag = get()["ETag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+
+        response = get(if_none_match=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    def test_not_modified_for_the_weakened_etag(self):
+        # CompressionMiddleware weakens the ETag of the responses it compresses
+        etag = get()["ETag"]
+
+        assert get(if_none_match=f'"other", W/{etag}').status_code == 304
+        assert get(if_none_match='W/"other"').status_code == 200
+
+    def test_gzip_when_accepted(self):
+        plain = get()
+        compressed = get(accept_encoding="gzip, deflate, br")
+        assert compressed["Content-Encoding"] == "gzip"
+        assert gzip.decompress(compressed.content) == plain.content
+        assert compressed["ETag"] == plain["ETag"]
+        assert "Accept-Encoding" in compressed["Vary"]
+
+    def test_rejects_unsafe_methods(self):
+        request = RequestFactory().post("/api/schema/")
+        assert openapi_schema_view(request).status_code == 405
+
+
+class TestSchemaFileCache:
+    def test_new_process_reuses_the_file(self, schema_cache, monkeypatch, tmp_path):
+        content = get().content
+        assert (tmp_path / "openapi-v1.json").read_bytes() == content
+
+        monkeypatch.setattr(openapi, "_document", None)  # as in another process
+        assert get().content == content
+        assert len(schema_cache) == 1
+
+    def test_new_version_replaces_stale_files(self, settings, tmp_path):
+        get()
+        settings.OPENAPI_SCHEMA = {**settings.OPENAPI_SCHEMA, "CODE_VERSION": "v2"}
+        get()
+        assert [p.name for p in tmp_path.iterdir()] == ["openapi-v2.json"]
+
+    def test_source_hash_is_the_default_version(self, settings):
+        settings.OPENAPI_SCHEMA = {**settings.OPENAPI_SCHEMA, "CODE_VERSION": None}
+        assert openapi.code_version() == openapi._source_hash()
+        assert len(openapi.code_version()) == 16
+
+    def test_generate_schema_command(self, schema_cache, tmp_path):
+        call_command("generate_schema", stdout=None)
+        assert (tmp_path / "openapi-v1.json").exists()
+
+        get()
+        assert len(schema_cache) == 1  # served from the prebuilt file
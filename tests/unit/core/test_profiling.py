@@ -0,0 +1,255 @@
+"""
+On-demand profiling: header-triggered request profiles and worker snapshots.
+"""
+
+import cProfile
+import os
+import tracemalloc
+from unittest.mock import MagicMock
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+
+from app.core import profiling
+from app.core.middleware.profiling import ProfilingMiddleware
+from app.jwt_auth import authentication
+from tests.unit.conftest import make_test_jwt
+
+User = get_user_model()
+
+STAFF_AUTH_ID = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+
+@pytest.fixture(autouse=True)
+def profiling_enabled(settings):
+    settings.PROFILING = {**settings.PROFILING, "ENABLED": True, "KEEP": 3}
+    profiling.clear()
+    yield settings.PROFILING
+    profiling.stop_tracing()
+    profiling.clear()
+
+
+@pytest.fixture
+def staff_user(db):
+    return User.objects.create_user(
+        email="staff@example.com", is_staff=True, auth_id=STAFF_AUTH_ID
+    )
+
+
+def _token(user) -> str:
+    return make_test_jwt(user.email, str(user.auth_id), exp_minutes=5)
+
+
+def _client(user) -> APIClient:
+    return APIClient(headers={"Authorization": f"Bearer {_token(user)}"})
+
+
+class TestRequestProfiles:
+    def test_cpu(self, staff_user, profiling_enabled):
+        profiling_enabled["TOP"] = 200
+
+        response = _client(staff_user).get(
+            "/api/accounts/me/", headers={"X-Profile": "cpu"}
+        )
+
+        assert response.status_code == 200
+        assert response["X-Profile-Worker"] == str(os.getpid())
+        (report,) = profiling.worker_status()["reports"]
+        assert report["view"] == "account-me"
+        assert report["request_id"] == response["X-Request-ID"]
+        functions = [row["function"] for row in report["top"]]
+        assert any(f.startswith("app/accounts/views.py") for f in functions)
+        assert report["top"][0]["cumtime_ms"] >= report["top"][-1]["cumtime_ms"]
+
+    def test_memory_by_action_and_authentication_phase(self, staff_user):
+        client = _client(staff_user)
+        for _ in range(2):
+            response = client.get("/api/accounts/", headers={"X-Profile": "memory"})
+            assert response.status_code == 200
+
+        report = profiling.worker_status()["reports"][0]
+        assert {"request", "accounts.list", "jwt.decode", "jwt.user"} <= set(
+            report["phases"]
+        )
+        allocations = profiling.worker_status()["allocations"]
+        assert allocations["accounts.list"]["requests"] == 2
+        assert allocations["accounts.list"]["size"] > 0
+        assert allocations["accounts.list"]["top"][0]["site"]
+        # Tracing only lasted as long as the requests
+        assert not tracemalloc.is_tracing()
+
+    @pytest.mark.parametrize("kind", profiling.KINDS)
+    @pytest.mark.parametrize(
+        "authorization", ["regular", "inactive staff", "invalid", None]
+    )
+    def test_no_profiling_work_without_a_staff_token(
+        self, staff_user, regular_user, monkeypatch, kind, authorization
+    ):
+        def activate(kind):
+            raise AssertionError("Profiled a non-staff request")
+
+        monkeypatch.setattr(profiling, "activate", activate)
+        headers = {"X-Profile": kind}
+        if authorization == "regular":
+            headers["Authorization"] = f"Bearer {_token(regular_user)}"
+        elif authorization == "inactive staff":
+            User.objects.filter(pk=staff_user.pk).update(is_active=False)
+            headers["Authorization"] = f"Bearer {_token(staff_user)}"
+        elif authorization == "invalid":
+            headers["Authorization"] = "Bearer not-a-token"
+
+        response = APIClient().get("/api/accounts/me/", headers=headers)
+
+        assert not response.has_header("X-Profile-Worker")
+        assert not tracemalloc.is_tracing()
+        assert profiling.worker_status()["reports"] == []
+
+    def test_non_staff_tokens_are_decoded_once(self, regular_user, monkeypatch):
+        decode = MagicMock(wraps=authentication.decode_jwt_auth_jwt)
+        monkeypatch.setattr(authentication, "decode_jwt_auth_jwt", decode)
+
+        response = _client(regular_user).get(
+            "/api/accounts/me/", headers={"X-Profile": "cpu"}
+        )
+
+        assert response.status_code == 200
+        decode.assert_called_once()
+
+    @pytest.mark.parametrize("header", [None, "everything"])
+    def test_only_requested_kinds_are_profiled(self, staff_user, header):
+        headers = {"X-Profile": header} if header else {}
+        response = _client(staff_user).get("/api/accounts/me/", headers=headers)
+
+        assert not response.has_header("X-Profile-Worker")
+
+    def test_disabled(self, staff_user, profiling_enabled):
+        profiling_enabled["ENABLED"] = False
+
+        response = _client(staff_user).get(
+            "/api/accounts/me/", headers={"X-Profile": "cpu"}
+        )
+
+        assert not response.has_header("X-Profile-Worker")
+        assert profiling.worker_status()["reports"] == []
+
+    def test_one_profiled_request_at_a_time(self, staff_user):
+        token = profiling.activate("cpu")
+        try:
+            response = _client(staff_user).get(
+                "/api/accounts/me/", headers={"X-Profile": "cpu"}
+            )
+        finally:
+            profiling.deactivate(token)
+
+        assert response.status_code == 200
+        assert not response.has_header("X-Profile-Worker")
+
+    def test_recent_reports_are_bounded(self, staff_user):
+        client = _client(staff_user)
+        for _ in range(5):
+            client.get("/api/accounts/me/", headers={"X-Profile": "cpu"})
+
+        assert len(profiling.worker_status()["reports"]) == 3
+
+    def test_async_cpu_profiles_cover_sync_views(self, staff_user):
+        def busy():
+            return sum(i * i for i in range(10000))
+
+        def busy_view(request):
+            with profiling.phase("view"):
+                busy()
+            return HttpResponse()
+
+        async def get_response(request):
+            return await sync_to_async(busy_view)(request)
+
+        request = AsyncRequestFactory().get(
+            "/",
+            headers={
+                "X-Profile": "cpu",
+                "Authorization": f"Bearer {_token(staff_user)}",
+            },
+        )
+        response = async_to_sync(ProfilingMiddleware(get_response))(request)
+
+        assert response.has_header("X-Profile-Worker")
+        (report,) = profiling.worker_status()["reports"]
+        assert any("(busy)" in row["function"] for row in report["top"])
+
+    def test_another_profiler_running(self, staff_user):
+        other = cProfile.Profile()
+        other.enable()
+        try:
+            response = _client(staff_user).get(
+                "/api/accounts/me/", headers={"X-Profile": "cpu"}
+            )
+        finally:
+            other.disable()
+
+        assert response.status_code == 200
+        assert response.has_header("X-Profile-Worker")
+
+
+class TestProfilingEndpoints:
+    def test_snapshots_are_diffed_with_the_previous_one(self, staff_user):
+        client = _client(staff_user)
+
+        first = client.post("/api/profiling/snapshots/")
+        assert first.status_code == 201
+        assert first.data["diff"] is None
+        assert tracemalloc.is_tracing()
+
+        leaked = [bytearray(1024) for _ in range(1000)]
+        second = client.post("/api/profiling/snapshots/")
+        assert second.data["pid"] == os.getpid()
+        top = second.data["diff"][0]
+        assert top["site"].startswith("tests/unit/core/test_profiling.py:")
+        assert top["size"] >= 1024 * 1000
+        assert len(leaked) == 1000
+
+        assert client.delete("/api/profiling/snapshots/").status_code == 204
+        assert not tracemalloc.is_tracing()
+        assert client.post("/api/profiling/snapshots/").data["diff"] is None
+
+    def test_snapshots_of_a_profiled_request(self, staff_user):
+        client = _client(staff_user)
+        headers = {"X-Profile": "memory"}
+
+        assert (
+            client.post("/api/profiling/snapshots/", headers=headers).status_code == 201
+        )
+        assert tracemalloc.is_tracing()
+        assert (
+            client.delete("/api/profiling/snapshots/", headers=headers).status_code
+            == 204
+        )
+        # Tracing went on until the end of the profile, then stopped
+        assert not tracemalloc.is_tracing()
+        assert len(profiling.worker_status()["reports"]) == 2
+
+    def test_worker_status(self, staff_user):
+        client = _client(staff_user)
+        client.get("/api/accounts/me/", headers={"X-Profile": "memory"})
+
+        response = client.get("/api/profiling/")
+
+        assert response.status_code == 200
+        assert response.data["pid"] == os.getpid()
+        assert response.data["tracing"] is False
+        assert len(response.data["reports"]) == 1
+        assert "accounts.me" in response.data["allocations"]
+
+    def test_staff_only(self, regular_user):
+        response = _client(regular_user).get("/api/profiling/")
+
+        assert response.status_code == 403
+
+    def test_not_found_when_disabled(self, staff_user, profiling_enabled):
+        profiling_enabled["ENABLED"] = False
+
+        assert _client(staff_user).get("/api/profiling/").status_code == 404
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,112 @@
+import os
+import runpy
+from pathlib import Path
+
+import pytest
+
+from app.core.server_sizing import available_cpus, cgroup_cpu_quota, pool_size
+
+GUNICORN_CONF = Path(__file__).resolve().parents[3] / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def cgroup(tmp_path):
+    def write(files: dict[str, str]) -> Path:
+        for name, content in files.items():
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return tmp_path
+
+    return write
+
+
+@pytest.fixture
+def eight_cpus(monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)))
+
+
+class TestCpuQuota:
+    def test_cgroup_v2(self, cgroup):
+        assert cgroup_cpu_quota(cgroup({"cpu.max": "150000 100000\n"})) == 1.5
+
+    def test_cgroup_v2_unlimited(self, cgroup):
+        assert cgroup_cpu_quota(cgroup({"cpu.max": "max 100000\n"})) is None
+
+    def test_cgroup_v1(self, cgroup):
+        root = cgroup(
+            {"cpu/cpu.cfs_quota_us": "200000", "cpu/cpu.cfs_period_us": "100000"}
+        )
+        assert cgroup_cpu_quota(root) == 2.0
+
+    def test_cgroup_v1_unlimited(self, cgroup):
+        root = cgroup({"cpu/cpu.cfs_quota_us": "-1", "cpu/cpu.cfs_period_us": "100000"})
+        assert cgroup_cpu_quota(root) is None
+
+    def test_no_cgroup(self, tmp_path):
+        assert cgroup_cpu_quota(tmp_path) is None
+
+    @pytest.mark.usefixtures("eight_cpus")
+    def test_quota_caps_available_cpus(self, cgroup):
+        assert available_cpus(cgroup({"cpu.max": "150000 100000"})) == 2
+        assert available_cpus(cgroup({"cpu.max": "50000 100000"})) == 1
+
+    @pytest.mark.usefixtures("eight_cpus")
+    def test_affinity_without_quota(self, tmp_path):
+        assert available_cpus(tmp_path) == 8
+
+
+class TestPoolSize:
+    @pytest.mark.parametrize(
+        ("worker_class", "expected"),
+        [("sync", (5, 1)), ("gthread", (3, 4)), ("uvicorn", (2, 1))],
+    )
+    def test_defaults_per_worker_class(self, worker_class, expected):
+        assert pool_size(worker_class, cpus=2) == expected
+
+    def test_unknown_worker_class(self):
+        with pytest.raises(ValueError, match="Unknown worker class"):
+            pool_size("eventlet", cpus=2)
+
+
+@pytest.mark.usefixtures("eight_cpus")
+class TestGunicornConf:
+    def load(self, monkeypatch, **env) -> dict:
+        monkeypatch.setattr("app.core.server_sizing.cgroup_cpu_quota", lambda root: 2.0)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(str(GUNICORN_CONF))
+
+    def test_sized_from_cpu_quota(self, monkeypatch):
+        conf = self.load(monkeypatch)
+        assert conf["worker_class"] == "gthread"
+        assert conf["wsgi_app"] == "app.core.wsgi:application"
+        assert (conf["workers"], conf["threads"]) == (3, 4)
+        assert (conf["max_requests"], conf["max_requests_jitter"]) == (1000, 100)
+        assert conf["preload_app"] is True
+
+    def test_uvicorn_serves_asgi(self, monkeypatch):
+        conf = self.load(monkeypatch, GUNICORN_WORKER_CLASS="uvicorn")
+        assert conf["worker_class"] == "uvicorn_worker.UvicornWorker"
+        assert conf["wsgi_app"] == "app.core.asgi:application"
+        assert (conf["workers"], conf["threads"]) == (2, 1)
+
+    def test_env_overrides(self, monkeypatch):
+        conf = self.load(
+            monkeypatch,
+            GUNICORN_WORKER_CLASS="sync",
+            GUNICORN_WORKERS="7",
+            GUNICORN_KEEPALIVE="75",
+            GUNICORN_MAX_REQUESTS="0",
+            GUNICORN_PRELOAD="false",
+        )
+        assert (conf["workers"], conf["threads"]) == (7, 1)
+        assert conf["keepalive"] == 75
+        assert (conf["max_requests"], conf["max_requests_jitter"]) == (0, 0)
+        assert conf["preload_app"] is False
+
+    def test_max_workers_caps_computed_pool(self, monkeypatch):
+        conf = self.load(
+            monkeypatch, GUNICORN_WORKER_CLASS="sync", GUNICORN_MAX_WORKERS="4"
+        )
+        assert conf["workers"] == 4
@@ -0,0 +1,155 @@
+import io
+import json
+import logging
+import os
+import time
+
+import pytest
+
+from app.core.structured_logging import (
+    BackgroundQueueHandler,
+    JSONFormatter,
+    RateLimitFilter,
+    request_id_var,
+)
+from tests.unit.conftest import make_test_jwt
+
+
+@pytest.fixture
+def stream_logger():
+    """A logger writing JSON lines through a BackgroundQueueHandler."""
+    stream = io.StringIO()
+    handler = BackgroundQueueHandler(stream=stream)
+    handler.setFormatter(JSONFormatter())
+    logger = logging.getLogger("tests.structured_logging")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    yield logger, handler, stream
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def _lines(stream) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestBackgroundQueueHandler:
+    def test_writes_json_lines_with_context_and_extra(self, stream_logger):
+        logger, handler, stream = stream_logger
+        token = request_id_var.set("req-1")
+        try:
+            logger.info("hello %s", "world", extra={"latency_ms": 1.5})
+        finally:
+            request_id_var.reset(token)
+        handler.flush()
+
+        [line] = _lines(stream)
+        assert line["message"] == "hello world"
+        assert line["request_id"] == "req-1"
+        assert line["latency_ms"] == 1.5
+        assert line["level"] == "INFO"
+
+    def test_exceptions_are_formatted(self, stream_logger):
+        logger, handler, stream = stream_logger
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+        handler.flush()
+        assert "RuntimeError: boom" in _lines(stream)[0]["exc_info"]
+
+    def test_close_flushes_pending_records(self):
+        stream = io.StringIO()
+        handler = BackgroundQueueHandler(stream=stream)
+        handler.setFormatter(JSONFormatter())
+        for i in range(100):
+            handler.handle(logging.makeLogRecord({"msg": f"line {i}"}))
+        handler.close()
+        assert len(stream.getvalue().splitlines()) == 100
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = BackgroundQueueHandler(stream=io.StringIO(), queue_size=1)
+        handler.listener.stop()  # nothing consumes the queue
+        handler._running = False
+        for i in range(5):
+            handler.handle(logging.makeLogRecord({"msg": f"line {i}"}))
+        assert handler.dropped == 4
+        handler.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_listener_restarts_in_forked_child(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        with open(path, "w") as stream:
+            handler = BackgroundQueueHandler(stream=stream)
+            handler.setFormatter(JSONFormatter())
+            pid = os.fork()
+            if pid == 0:  # child: its listener thread was restarted after fork
+                handler.handle(logging.makeLogRecord({"msg": "from child"}))
+                handler.close()
+                os._exit(0)
+            os.waitpid(pid, 0)
+            handler.close()
+        assert "from child" in path.read_text()
+
+
+class TestRateLimitFilter:
+    def test_samples_repeated_messages(self):
+        rate_filter = RateLimitFilter(rate=3, per=0.2)
+        records = [
+            logging.makeLogRecord({"msg": "User %s not found.", "levelno": 30})
+            for _ in range(10)
+        ]
+        assert [rate_filter.filter(r) for r in records].count(True) == 3
+
+        time.sleep(0.25)
+        record = logging.makeLogRecord({"msg": "User %s not found.", "levelno": 30})
+        assert rate_filter.filter(record)
+        assert record.suppressed == 7
+
+    def test_never_drops_errors(self):
+        rate_filter = RateLimitFilter(rate=1, per=60)
+        records = [
+            logging.makeLogRecord({"msg": "boom", "levelno": logging.ERROR})
+            for _ in range(5)
+        ]
+        assert all(rate_filter.filter(r) for r in records)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestRequestContextMiddleware:
+    def test_generates_and_echoes_request_id(self, client):
+        response = client.get("/api/accounts/")
+        assert len(response.headers["X-Request-ID"]) == 32
+
+    def test_propagates_upstream_request_id(self, client):
+        response = client.get("/api/accounts/", HTTP_X_REQUEST_ID="upstream-123")
+        assert response.headers["X-Request-ID"] == "upstream-123"
+
+    def test_access_log_has_request_user_and_latency(
+        self, client, regular_user, caplog
+    ):
+        token = make_test_jwt(
+            email=regular_user.email, user_id=str(regular_user.auth_id)
+        )
+        handler = BackgroundQueueHandler(stream=io.StringIO())
+        handler.setFormatter(JSONFormatter())
+        access_logger = logging.getLogger("app.access")
+        access_logger.addHandler(handler)
+        try:
+            client.get(
+                "/api/accounts/me/",
+                HTTP_AUTHORIZATION=f"Bearer {token}",
+                HTTP_X_REQUEST_ID="req-42",
+            )
+            handler.flush()
+        finally:
+            access_logger.removeHandler(handler)
+            handler.close()
+
+        [line] = _lines(handler.target.stream)
+        assert line["request_id"] == "req-42"
+        assert line["user_id"] == str(regular_user.id)
+        assert line["status"] == 200
+        assert line["latency_ms"] > 0
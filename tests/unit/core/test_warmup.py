@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from app.core.management.commands.boot_profile import summarize_import_times
+from app.core.warmup import warm_up
+from app.jwt_auth.authentication import _load_jwk, get_es256_public_key
+
+
+@pytest.mark.usefixtures("mock_es256_key")
+class TestWarmUp:
+    def test_runs_every_step_without_touching_the_database(self, monkeypatch):
+        def fail(self):
+            raise AssertionError("warm-up must not connect before fork")
+
+        monkeypatch.setattr(BaseDatabaseWrapper, "ensure_connection", fail)
+        durations = warm_up()
+        assert set(durations) == {"imports", "urls", "jwt_key", "translations"}
+
+    @pytest.mark.django_db
+    def test_connect_db_opens_connections(self):
+        assert "db" in warm_up(connect_db=True)
+
+    def test_failing_step_does_not_prevent_boot(self, settings, caplog):
+        settings.WARMUP = {**settings.WARMUP, "IMPORTS": ["app.does_not_exist"]}
+        durations = warm_up()
+        assert "imports" in durations
+        assert "Warm-up step 'imports' failed." in caplog.text
+
+    def test_jwt_key_is_parsed_once(self):
+        _load_jwk.cache_clear()
+        assert get_es256_public_key() is get_es256_public_key()
+        assert _load_jwk.cache_info().misses == 1
+
+
+class TestBootProfileCommand:
+    def test_summarize_import_times(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   django.utils\n"
+            "import time:       400 |        500 | django\n"
+            "import time:       300 |        300 | jwt\n"
+        )
+        summary = summarize_import_times(output, top=5)
+        assert summary["modules"] == 3
+        assert summary["total_ms"] == 0.8
+        assert summary["by_package_ms"] == {"django": 0.5, "jwt": 0.3}
+        assert summary["slowest_modules_ms"] == {"django": 0.5, "jwt": 0.3}
+
+    @pytest.mark.parametrize("preload", [False, True])
+    def test_reports_boot_and_first_request(self, preload):
+        stdout = io.StringIO()
+        args = ["--host", "localhost", "--top", "3"] + (["--preload"] * preload)
+        call_command("boot_profile", *args, stdout=stdout)
+
+        report = json.loads(stdout.getvalue())
+        assert report["preload"] is preload
+        assert report["status"] == 403  # anonymous request to /api/accounts/me/
+        assert report["first_request_ms"] > 0
+        assert set(report["warmup_steps_ms"]) >= {"imports", "urls"}
+        assert "django" in report["imports"]["by_package_ms"]
@@ -0,0 +1,402 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+
+import jwt
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.checks import run_checks
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.deprecation import MiddlewareMixin
+from prometheus_client import REGISTRY
+
+from app.core import health, metrics, timing
+from app.core.middleware.api_fast_path import LeanSessionMiddleware
+from app.core.middleware.metrics import PrometheusMetricsMiddleware
+from app.core.middleware.native_async import InlineHooksMixin, SecurityMiddleware
+from app.core.middleware.query_inspector import RepeatedQueryMiddleware
+from tests.unit.conftest import TEST_ES256_PRIVATE_KEY, make_test_jwt
+
+User = get_user_model()
+ACCESS_LOGGER = "app.access"
+
+
+def _async_middleware_warnings(*ids):
+    return [w for w in run_checks() if w.id in (ids or ("core.W001",))]
+
+
+def test_default_middleware_is_async_capable():
+    """Every middleware in MIDDLEWARE supports async, so ASGI needs no adaptation."""
+    assert _async_middleware_warnings() == []
+
+
+class SyncOnlyMiddleware:
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+
+def test_sync_only_middleware_is_reported(settings):
+    path = f"{__name__}.SyncOnlyMiddleware"
+    with override_settings(MIDDLEWARE=[*settings.MIDDLEWARE, path]):
+        warnings = _async_middleware_warnings()
+    assert [w.obj for w in warnings] == [path]
+
+
+class MixinHooksMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        return response
+
+
+class InlineHooksMiddleware(InlineHooksMixin, MixinHooksMiddleware):
+    pass
+
+
+def test_mixin_hooks_run_in_a_thread_are_reported(settings):
+    mixin = f"{__name__}.MixinHooksMiddleware"
+    inline = f"{__name__}.InlineHooksMiddleware"
+    with override_settings(MIDDLEWARE=[*settings.MIDDLEWARE, mixin, inline]):
+        warnings = _async_middleware_warnings("core.W001", "core.W002")
+    assert [(w.id, w.obj) for w in warnings] == [("core.W002", mixin)]
+    assert "process_response" in warnings[0].msg
+
+
+def test_inline_hooks_stay_on_the_event_loop():
+    threads = []
+
+    async def get_response(request):
+        threads.append(threading.get_ident())
+        return HttpResponse()
+
+    def process_request(request):
+        threads.append(threading.get_ident())
+
+    middleware = SecurityMiddleware(get_response)
+    middleware.process_request = process_request
+    response = async_to_sync(middleware)(AsyncRequestFactory().get("/"))
+
+    assert response["X-Content-Type-Options"] == "nosniff"
+    assert len(set(threads)) == 1
+
+
+class TestStandardMiddlewareDeployChecks:
+    def _ids(self):
+        return {m.id for m in run_checks(include_deployment_checks=True)}
+
+    @override_settings(
+        SECURE_HSTS_SECONDS=0, X_FRAME_OPTIONS="SAMEORIGIN", CSRF_COOKIE_SECURE=False
+    )
+    def test_settings_of_the_subclasses_are_checked(self):
+        ids = self._ids()
+        assert {"security.W004", "security.W019", "security.W016"} <= ids
+        assert "core.W003" not in ids
+
+    @override_settings(
+        SECURE_HSTS_SECONDS=3600, X_FRAME_OPTIONS="DENY", CSRF_COOKIE_SECURE=True
+    )
+    def test_settings_passing(self):
+        assert not {"security.W004", "security.W019", "security.W016"} & self._ids()
+
+    def test_missing_middleware(self, settings):
+        middleware = [
+            p
+            for p in settings.MIDDLEWARE
+            if "native_async" not in p and "Csrf" not in p
+        ]
+        with override_settings(MIDDLEWARE=middleware):
+            warnings = [
+                m
+                for m in run_checks(include_deployment_checks=True)
+                if m.id == "core.W003"
+            ]
+        assert len(warnings) == 3
+        assert "CsrfViewMiddleware" in warnings[2].msg
+
+
+# -------------------------------------------
+# API fast path middleware
+# -------------------------------------------
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestApiFastPath:
+    me_endpoint = "/api/accounts/me/"
+
+    @pytest.fixture
+    def bearer(self, regular_user):
+        token = make_test_jwt(
+            email=regular_user.email, user_id=str(regular_user.auth_id)
+        )
+        return f"Bearer {token}"
+
+    def test_bearer_api_request_skips_session_stack(self, client, bearer):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, "session")
+        assert not hasattr(response.wsgi_request, "_messages")
+        assert "Set-Cookie" not in response.headers
+        assert not any("django_session" in q["sql"] for q in ctx.captured_queries)
+
+    def test_disabled_fast_path_keeps_full_stack(self, client, bearer, settings):
+        settings.API_FAST_PATH = {**settings.API_FAST_PATH, "ENABLED": False}
+        response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        assert response.status_code == 200
+        assert hasattr(response.wsgi_request, "session")
+
+    def test_admin_keeps_full_stack(self, client, bearer):
+        response = client.get("/admin/", HTTP_AUTHORIZATION=bearer)
+        assert hasattr(response.wsgi_request, "session")
+        assert hasattr(response.wsgi_request, "user")
+
+    def test_api_request_without_bearer_keeps_full_stack(self, client, regular_user):
+        client.force_login(regular_user)
+        response = client.get(self.me_endpoint)
+        assert response.status_code == 200
+        assert hasattr(response.wsgi_request, "session")
+
+    def test_async_mode_skips_middleware(self, bearer):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = LeanSessionMiddleware(get_response)
+        request = AsyncRequestFactory().get(
+            self.me_endpoint, headers={"Authorization": bearer}
+        )
+        async_to_sync(middleware)(request)
+        assert not hasattr(request, "session")
+
+
+# -------------------------------------------
+# Server-Timing instrumentation
+# -------------------------------------------
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestServerTiming:
+    me_endpoint = "/api/accounts/me/"
+
+    @pytest.fixture
+    def bearer(self, regular_user):
+        token = make_test_jwt(
+            email=regular_user.email, user_id=str(regular_user.auth_id)
+        )
+        return f"Bearer {token}"
+
+    @staticmethod
+    def _phases(response) -> dict:
+        metrics = response.headers["Server-Timing"].split(", ")
+        return {metric.split(";")[0]: metric for metric in metrics}
+
+    def test_off_mode_sends_no_header(self, client, bearer, settings):
+        settings.SERVER_TIMING = {"MODE": "off", "LOG": True}
+        response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        assert response.status_code == 200
+        assert "Server-Timing" not in response.headers
+
+    def test_all_mode_reports_every_phase(self, client, bearer, settings):
+        settings.SERVER_TIMING = {"MODE": "all", "LOG": False}
+        response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        phases = self._phases(response)
+        assert {"auth", "user", "serialize", "render", "db", "total"} <= set(phases)
+        assert 'desc="1 queries"' in phases["db"]
+
+    def test_staff_mode_hides_header_from_regular_users(self, client, bearer, settings):
+        settings.SERVER_TIMING = {"MODE": "staff", "LOG": False}
+        response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        assert response.status_code == 200
+        assert "Server-Timing" not in response.headers
+
+    def test_staff_mode_sends_header_to_staff(self, client, bearer, settings):
+        settings.SERVER_TIMING = {"MODE": "staff", "LOG": False}
+        User.objects.filter(email="user@example.com").update(is_staff=True)
+        response = client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        assert "total" in self._phases(response)
+
+    def test_timings_logged_as_structured_fields(
+        self, client, bearer, settings, caplog
+    ):
+        settings.SERVER_TIMING = {"MODE": "all", "LOG": True}
+        with caplog.at_level(logging.INFO):
+            client.get(self.me_endpoint, HTTP_AUTHORIZATION=bearer)
+        # One record per request: the access log, with the timings merged in
+        [record] = [r for r in caplog.records if r.name == ACCESS_LOGGER]
+        assert record.status == 200
+        assert record.db_queries == 1
+        assert record.total_ms >= record.auth_ms
+        assert not [r for r in caplog.records if "server_timing" in r.name]
+
+    def test_hooks_are_noops_without_active_timing(self):
+        assert timing.current() is None
+        with timing.phase("auth"):
+            pass
+        assert timing.current() is None
+
+
+# -------------------------------------------
+# Prometheus metrics
+# -------------------------------------------
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mock_es256_key")
+class TestMetrics:
+    endpoint = "/metrics"
+
+    @pytest.fixture
+    def metrics_enabled(self, settings):
+        settings.METRICS = {"ENABLED": True, "ALLOWED_IPS": ["127.0.0.1"]}
+
+    def test_disabled_endpoint_is_not_found(self, client, settings):
+        settings.METRICS = {"ENABLED": False, "ALLOWED_IPS": []}
+        assert client.get(self.endpoint).status_code == 404
+
+    def test_client_outside_allowlist_is_forbidden(self, client, settings):
+        settings.METRICS = {"ENABLED": True, "ALLOWED_IPS": ["10.0.0.1"]}
+        assert client.get(self.endpoint).status_code == 403
+
+    @pytest.mark.parametrize("factory", [RequestFactory, AsyncRequestFactory])
+    def test_disabled_middleware_passes_requests_through(self, settings, factory):
+        settings.METRICS = {"ENABLED": False, "ALLOWED_IPS": []}
+        labels = {"route": "<unresolved>", "method": "GET", "status": "200"}
+        before = REGISTRY.get_sample_value("http_requests_total", labels)
+        seen = []
+
+        def get_response(request):
+            seen.append(timing.current())
+            return HttpResponse()
+
+        async def aget_response(request):
+            return get_response(request)
+
+        request = factory().get("/")
+        if factory is RequestFactory:
+            PrometheusMetricsMiddleware(get_response)(request)
+        else:
+            async_to_sync(PrometheusMetricsMiddleware(aget_response))(request)
+
+        # No collector for the view (which would render eagerly), no samples
+        assert seen == [None]
+        assert REGISTRY.get_sample_value("http_requests_total", labels) == before
+
+    def test_exposes_route_latency_and_db_queries(
+        self, client, regular_user, metrics_enabled
+    ):
+        client.force_login(regular_user)
+        client.get("/api/accounts/me/")
+        response = client.get(self.endpoint)
+        body = response.content.decode()
+        assert response.status_code == 200
+        assert 'http_request_duration_seconds_bucket{le="0.005",method="GET"' in body
+        assert 'route="account-me"' in body
+        assert "http_request_db_queries_bucket" in body
+
+    @pytest.mark.parametrize(
+        ("token_kwargs", "outcome"),
+        [
+            ({}, "ok"),
+            ({"exp_minutes": -5}, "expired"),
+            ({"user_id": "550e8400-e29b-41d4-a716-4466554400ff"}, "unknown_user"),
+        ],
+    )
+    def test_counts_jwt_outcomes(self, client, regular_user, token_kwargs, outcome):
+        kwargs = {
+            "email": regular_user.email,
+            "user_id": str(regular_user.auth_id),
+            **token_kwargs,
+        }
+        before = _sample("jwt_auth_outcomes_total", outcome=outcome)
+        client.get(
+            "/api/accounts/me/", HTTP_AUTHORIZATION=f"Bearer {make_test_jwt(**kwargs)}"
+        )
+        assert _sample("jwt_auth_outcomes_total", outcome=outcome) == before + 1
+
+    def test_counts_cache_hits_and_misses(self):
+        health.clear()
+        hits = _sample("cache_lookups_total", cache="readiness", result="hit")
+        misses = _sample("cache_lookups_total", cache="readiness", result="miss")
+
+        health.readiness()
+        health.readiness()
+
+        assert _sample("cache_lookups_total", cache="readiness", result="miss") == (
+            misses + 1
+        )
+        assert _sample("cache_lookups_total", cache="readiness", result="hit") == (
+            hits + 1
+        )
+
+    def test_bad_audience_outcome(self, client, regular_user):
+        token = jwt.encode(
+            {"sub": str(regular_user.auth_id), "aud": "other"},
+            TEST_ES256_PRIVATE_KEY,
+            algorithm="ES256",
+        )
+        before = _sample("jwt_auth_outcomes_total", outcome="bad_audience")
+        client.get("/api/accounts/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert _sample("jwt_auth_outcomes_total", outcome="bad_audience") == before + 1
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path, monkeypatch):
+    """Samples written by separate processes are summed in one scrape."""
+    script = (
+        "from app.core import metrics\n"
+        "metrics.record_jwt_auth('ok')\n"
+        "metrics.record_cache_lookup('test', hit=True)\n"
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    payload, _ = metrics.render_latest()
+    body = payload.decode()
+    assert 'jwt_auth_outcomes_total{outcome="ok"} 3.0' in body
+    assert 'cache_lookups_total{cache="test",result="hit"} 3.0' in body
+
+
+# -------------------------------------------
+# Repeated query (N+1) detector
+# -------------------------------------------
+REPEATED_QUERY_LOGGER = "app.core.middleware.query_inspector"
+
+
+@pytest.mark.django_db
+class TestRepeatedQueryMiddleware:
+    def _run(self, get_response, settings, caplog):
+        settings.QUERY_INSPECTOR = {"THRESHOLD": 3}
+        middleware = RepeatedQueryMiddleware(get_response)
+        with caplog.at_level(logging.WARNING, logger=REPEATED_QUERY_LOGGER):
+            middleware(RequestFactory().get("/api/accounts/"))
+        return [r for r in caplog.records if r.name == REPEATED_QUERY_LOGGER]
+
+    def test_logs_repeated_query_shape_with_stack(self, regular_user, settings, caplog):
+        def n_plus_one(request):
+            for _ in range(4):
+                User.objects.filter(pk=regular_user.pk).exists()
+            return HttpResponse()
+
+        records = self._run(n_plus_one, settings, caplog)
+        assert len(records) == 1
+        assert records[0].count == 4
+        assert "accounts_user" in records[0].sql
+        assert "Repeated query (4 times)" in records[0].getMessage()
+
+    def test_distinct_queries_are_not_reported(self, regular_user, settings, caplog):
+        def varied(request):
+            User.objects.filter(pk=regular_user.pk).exists()
+            User.objects.filter(email=regular_user.email).exists()
+            User.objects.count()
+            return HttpResponse()
+
+        assert self._run(varied, settings, caplog) == []
@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+from app.core import throttling
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters():
+    throttling.counter.clear()
+    cache.clear()
+    yield
+    throttling.counter.clear()
+    cache.clear()
@@ -0,0 +1,161 @@
+"""
+Jobs API, and the account jobs it queues.
+"""
+
+import gzip
+import json
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from app.jobs.models import Job
+from app.jobs.worker import Worker
+
+User = get_user_model()
+
+ENDPOINT = "/api/jobs/"
+
+
+@pytest.fixture(autouse=True)
+def files_dir(settings, tmp_path):
+    settings.JOBS = {**settings.JOBS, "FILES_DIR": tmp_path}
+    return tmp_path
+
+
+def _run_jobs():
+    Worker("test").run(burst=True)
+
+
+@pytest.mark.django_db
+class TestJobsAPI:
+    def test_create_queues_job(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(ENDPOINT, {"name": "accounts.export"}, format="json")
+
+        assert response.status_code == 202
+        job = Job.objects.get()
+        assert response.data["id"] == str(job.pk)
+        assert response.data["status"] == Job.Status.QUEUED
+        assert response["Location"].endswith(f"{ENDPOINT}{job.pk}/")
+        assert job.created_by == staff_user
+
+    def test_create_rejects_unknown_jobs(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(ENDPOINT, {"name": "nope"}, format="json")
+
+        assert response.status_code == 400
+        assert "name" in response.data
+        assert not Job.objects.exists()
+
+    def test_staff_only_jobs(self, api_client, regular_user):
+        api_client.force_authenticate(user=regular_user)
+
+        response = api_client.post(ENDPOINT, {"name": "accounts.export"}, format="json")
+
+        assert response.status_code == 400
+        assert "Only staff" in str(response.data["name"])
+
+    def test_payload_is_validated(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(
+            ENDPOINT,
+            {"name": "accounts.deactivate", "payload": {"ids": ["not-a-uuid"]}},
+            format="json",
+        )
+
+        assert response.status_code == 400
+        assert "payload" in response.data
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(ENDPOINT)
+
+        assert response.status_code == 403
+
+    def test_users_only_see_their_own_jobs(
+        self, api_client, staff_user, regular_user, another_user
+    ):
+        own = Job.objects.create(name="accounts.export", created_by=regular_user)
+        Job.objects.create(name="accounts.export", created_by=another_user)
+
+        api_client.force_authenticate(user=regular_user)
+        response = api_client.get(ENDPOINT)
+        assert [job["id"] for job in response.data["results"]] == [str(own.pk)]
+
+        api_client.force_authenticate(user=staff_user)
+        response = api_client.get(ENDPOINT)
+        assert len(response.data["results"]) == 2
+
+    def test_result_conflicts_until_the_job_succeeds(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+        job_id = api_client.post(
+            ENDPOINT, {"name": "accounts.export"}, format="json"
+        ).data["id"]
+
+        response = api_client.get(f"{ENDPOINT}{job_id}/result/")
+        assert response.status_code == 409
+        assert response.data["status"] == Job.Status.QUEUED
+
+        _run_jobs()
+
+        response = api_client.get(f"{ENDPOINT}{job_id}/")
+        assert response.data["status"] == Job.Status.SUCCEEDED
+        response = api_client.get(f"{ENDPOINT}{job_id}/result/")
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+
+    def test_file_rejects_paths_outside_the_files_dir(self, api_client, staff_user):
+        job = Job.objects.create(
+            name="accounts.export",
+            status=Job.Status.SUCCEEDED,
+            result={"file": "../secrets.txt"},
+        )
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.get(f"{ENDPOINT}{job.pk}/file/")
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestAccountJobs:
+    def test_export_writes_every_user(
+        self, api_client, staff_user, regular_user, files_dir
+    ):
+        api_client.force_authenticate(user=staff_user)
+        job_id = api_client.post(
+            ENDPOINT, {"name": "accounts.export"}, format="json"
+        ).data["id"]
+
+        _run_jobs()
+
+        response = api_client.get(f"{ENDPOINT}{job_id}/file/")
+        assert response.status_code == 200
+        content = gzip.decompress(b"".join(response.streaming_content))
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert {row["email"] for row in rows} == {staff_user.email, regular_user.email}
+        assert list(files_dir.iterdir()) == [files_dir / f"accounts-{job_id}.jsonl.gz"]
+
+    def test_deactivate_skips_staff(
+        self, api_client, staff_user, regular_user, another_user
+    ):
+        api_client.force_authenticate(user=staff_user)
+        ids = [str(staff_user.pk), str(regular_user.pk), str(uuid.uuid4())]
+        job_id = api_client.post(
+            ENDPOINT,
+            {"name": "accounts.deactivate", "payload": {"ids": ids}},
+            format="json",
+        ).data["id"]
+
+        _run_jobs()
+
+        assert Job.objects.get(pk=job_id).result == {"deactivated": 1}
+        active = dict(User.objects.values_list("email", "is_active"))
+        assert active == {
+            staff_user.email: True,
+            regular_user.email: False,
+            another_user.email: True,
+        }
@@ -0,0 +1,231 @@
+"""
+Job worker: claiming, retries with backoff and recovery of abandoned jobs.
+"""
+
+import datetime
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from app.jobs import registry
+from app.jobs.models import Job
+from app.jobs.registry import JobType, PermanentJobError, enqueue
+from app.jobs.worker import Worker, backoff, requeue_abandoned
+
+
+@pytest.fixture(autouse=True)
+def jobs_settings(settings):
+    settings.JOBS = {
+        **settings.JOBS,
+        "MAX_ATTEMPTS": 3,
+        "BACKOFF_BASE": 10,
+        "BACKOFF_MAX": 60,
+        "LEASE": 60,
+        "POLL_INTERVAL": 0.01,
+    }
+    return settings.JOBS
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Register `func` as the handler of "tests.job" jobs."""
+
+    def register(func, max_attempts=None):
+        monkeypatch.setitem(
+            registry._registry,
+            "tests.job",
+            JobType("tests.job", func, True, max_attempts, None),
+        )
+
+    return register
+
+
+def _failing(exc):
+    def func(job):
+        raise exc
+
+    return func
+
+
+@pytest.mark.django_db
+class TestWorker:
+    def test_runs_job_and_stores_result(self, handler):
+        handler(lambda job: {"echo": job.payload["value"]})
+        job = enqueue("tests.job", {"value": 42})
+
+        Worker("w1").run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.result == {"echo": 42}
+        assert job.attempts == 1
+        assert (job.locked_by, job.locked_at) == ("", None)
+        assert job.started_at <= job.finished_at
+
+    def test_failed_job_is_retried_with_backoff(self, handler):
+        handler(_failing(RuntimeError("boom")))
+        job = enqueue("tests.job")
+
+        Worker().run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+        assert job.attempts == 1
+        assert "RuntimeError: boom" in job.error
+        delay = (job.run_after - timezone.now()).total_seconds()
+        assert 4 < delay <= 10
+
+    def test_job_fails_after_max_attempts(self, handler):
+        handler(_failing(RuntimeError("boom")), max_attempts=2)
+        job = enqueue("tests.job")
+
+        for _ in range(2):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            Worker().run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 2
+        assert job.finished_at is not None
+
+    def test_permanent_errors_are_not_retried(self, handler):
+        handler(_failing(PermanentJobError("bad payload")))
+        job = enqueue("tests.job")
+
+        Worker().run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 1
+
+    def test_unknown_jobs_fail(self):
+        job = Job.objects.create(name="tests.unknown")
+
+        Worker().run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert "No job handler registered" in job.error
+
+    def test_jobs_wait_for_run_after(self, handler):
+        handler(lambda job: None)
+        job = enqueue(
+            "tests.job", run_after=timezone.now() + datetime.timedelta(minutes=1)
+        )
+
+        assert Worker().claim() is None
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+
+    def test_claims_in_run_after_order(self, handler):
+        handler(lambda job: None)
+        now = timezone.now()
+        later = enqueue("tests.job", run_after=now - datetime.timedelta(seconds=1))
+        first = enqueue("tests.job", run_after=now - datetime.timedelta(seconds=5))
+
+        worker = Worker("w1")
+        assert worker.claim().pk == first.pk
+        claimed = worker.claim()
+        assert claimed.pk == later.pk
+        assert (claimed.status, claimed.locked_by) == (Job.Status.RUNNING, "w1")
+        assert worker.claim() is None
+
+    def test_claim_with_skip_locked(self, handler):
+        handler(lambda job: None)
+        job = enqueue("tests.job")
+
+        with mock.patch.object(
+            connection.features, "has_select_for_update_skip_locked", True
+        ):
+            claimed = Worker("w1").claim()
+
+        assert claimed.pk == job.pk
+        assert claimed.status == Job.Status.RUNNING
+        assert claimed.attempts == 1
+
+    def test_claim_skips_jobs_taken_by_another_worker(self, handler):
+        handler(lambda job: None)
+        taken, free = enqueue("tests.job"), enqueue("tests.job")
+        worker = Worker("w1")
+        candidates = [taken.pk, free.pk]
+        Job.objects.filter(pk=taken.pk).update(status=Job.Status.RUNNING)
+
+        # The candidates were read before another worker claimed the first
+        with mock.patch(
+            "django.db.models.query.QuerySet.values_list", return_value=candidates
+        ):
+            claimed = worker.claim()
+
+        assert claimed.pk == free.pk
+
+    def test_outcome_of_a_taken_over_job_is_dropped(self, handler):
+        def taken_over(running):
+            Job.objects.filter(pk=running.pk).update(locked_by="w2")
+            return {"from": "w1"}
+
+        handler(taken_over)
+        job = enqueue("tests.job")
+        Worker("w1").run(burst=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.RUNNING
+        assert job.locked_by == "w2"
+        assert job.result is None
+
+    def test_max_jobs(self, handler):
+        handler(lambda job: None)
+        for _ in range(3):
+            enqueue("tests.job")
+
+        worker = Worker()
+        worker.run(max_jobs=2)
+
+        assert worker.processed == 2
+        assert Job.objects.filter(status=Job.Status.QUEUED).count() == 1
+
+
+@pytest.mark.django_db
+class TestRecovery:
+    def test_abandoned_jobs_are_requeued_or_failed(self, handler):
+        handler(lambda job: None)
+        stale = timezone.now() - datetime.timedelta(seconds=61)
+        retried = enqueue("tests.job")
+        exhausted = enqueue("tests.job")
+        alive = enqueue("tests.job")
+        Job.objects.filter(pk=retried.pk).update(
+            status=Job.Status.RUNNING, attempts=1, locked_by="dead", locked_at=stale
+        )
+        Job.objects.filter(pk=exhausted.pk).update(
+            status=Job.Status.RUNNING, attempts=3, locked_by="dead", locked_at=stale
+        )
+        Job.objects.filter(pk=alive.pk).update(
+            status=Job.Status.RUNNING, attempts=1, locked_at=timezone.now()
+        )
+
+        assert requeue_abandoned() == 2
+
+        statuses = dict(Job.objects.values_list("pk", "status"))
+        assert statuses == {
+            retried.pk: Job.Status.QUEUED,
+            exhausted.pk: Job.Status.FAILED,
+            alive.pk: Job.Status.RUNNING,
+        }
+
+    def test_backoff_is_exponential_and_capped(self):
+        with mock.patch("app.jobs.worker.random.uniform", return_value=1.0):
+            assert [backoff(n) for n in range(1, 6)] == [10, 20, 40, 60, 60]
+
+
+@pytest.mark.django_db
+def test_run_worker_command(handler):
+    handler(lambda job: "done")
+    enqueue("tests.job")
+    out = StringIO()
+
+    call_command("run_worker", "--burst", "--name", "cmd", stdout=out)
+
+    assert "✓ Worker cmd stopped after 1 job(s)" in out.getvalue()
@@ -9,7 +9,7 @@ from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 
 from app.jwt_auth.authentication import JWTAuthentication
-from tests.unit.jwt_auth.conftest import make_test_jwt
+from tests.unit.conftest import make_test_jwt
 
 logger = logging.getLogger(__name__)
 User = get_user_model()